@@ -0,0 +1,120 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..models.AdminUser import AdminUser
+from ..models.BikeModel import Bike
+from ..models.BookingModel import Booking
+from ..models.GalleryModel import Gallery
+from ..models.HeroModel import HeroSlide
+from ..models.OutboxModel import OutboxMessage
+from ..models.StatsModel import StatCounter, ActivityRollup
+from ..models.UploadModel import UploadLedger
+from .upsert import increment
+
+# Dashboard numbers maintained by the writes themselves.
+# An after_flush hook sees every ORM insert/delete made by a process that has
+# imported this module (the app and manage.py), so adding/removing a bike,
+# gallery image or hero slide moves the matching stat_counters row in the same
+# transaction. Admins are counted live instead: the table is tiny and
+# create_superuser.py / setup_admin.py write it without loading this hook. It also rolls new
+# bookings and contact inquiries into activity_rollup (per metric per day).
+# Uploads (new files, not ledger hits) are recorded explicitly by core/uploads.py.
+# `python manage.py recount` rebuilds everything from the source tables.
+
+COUNTERS = {
+    Bike: "total_bikes",
+    Gallery: "gallery_images",
+    HeroSlide: "hero_slides",
+}
+LIVE_COUNTS = {AdminUser: "total_admins"}
+METRICS = ("bookings", "inquiries", "uploads")
+
+def _metric_for(obj):
+    if isinstance(obj, Booking):
+        return "bookings"
+    if isinstance(obj, OutboxMessage) and obj.kind == "contact":
+        return "inquiries"
+    return None
+
+def record(db, metric: str, n: int = 1, day: date = None):
+    """Adds n to today's (UTC) bucket for metric. db: Session or Connection; doesn't commit."""
+    increment(db, ActivityRollup, {"metric": metric, "day": day or datetime.utcnow().date()}, "count", n)
+
+@event.listens_for(Session, "after_flush")
+def _track_writes(session: Session, flush_context):
+    deltas, metrics = Counter(), Counter()
+    for obj in session.new:
+        name = COUNTERS.get(type(obj))
+        if name:
+            deltas[name] += 1
+        metric = _metric_for(obj)
+        if metric:
+            metrics[metric] += 1
+    for obj in session.deleted:
+        name = COUNTERS.get(type(obj))
+        if name:
+            deltas[name] -= 1
+    if not deltas and not metrics:
+        return
+
+    conn = session.connection()
+    for name, delta in deltas.items():
+        if delta:
+            increment(conn, StatCounter, {"name": name}, "value", delta)
+    for metric, n in metrics.items():
+        record(conn, metric, n)
+
+
+def _day(value) -> date:
+    # func.date() comes back as a string on SQLite and a date on Postgres
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+def recount(bind: Engine):
+    """Resets counters and rollups from the source tables."""
+    with bind.begin() as conn:
+        for model, name in COUNTERS.items():
+            total = conn.execute(select(func.count()).select_from(model)).scalar_one()
+            conn.execute(delete(StatCounter).where(StatCounter.name == name))
+            conn.execute(StatCounter.__table__.insert().values(name=name, value=total))
+
+        sources = {
+            "bookings": select(func.date(Booking.created_at), func.count()).group_by(func.date(Booking.created_at)),
+            "inquiries": select(func.date(OutboxMessage.created_at), func.count())
+                .where(OutboxMessage.kind == "contact").group_by(func.date(OutboxMessage.created_at)),
+            # New files only; re-uploads answered from the ledger show up as upload_ledger.hits instead
+            "uploads": select(func.date(UploadLedger.created_at), func.count()).group_by(func.date(UploadLedger.created_at)),
+        }
+        for metric, query in sources.items():
+            conn.execute(delete(ActivityRollup).where(ActivityRollup.metric == metric))
+            rows = [{"metric": metric, "day": _day(d), "count": n} for d, n in conn.execute(query) if d is not None]
+            if rows:
+                conn.execute(ActivityRollup.__table__.insert(), rows)
+
+def counters(db: Session) -> dict:
+    values = {name: 0 for name in COUNTERS.values()}
+    values.update({name: value for name, value in db.execute(select(StatCounter.name, StatCounter.value))
+                   if name in values})
+    for model, name in LIVE_COUNTS.items():
+        values[name] = db.execute(select(func.count()).select_from(model)).scalar_one()
+    return values
+
+def series(db: Session, metrics, days: int, bucket: str = "day") -> dict:
+    """{metric: [{"start": date, "count": n}, ...]} for the last `days` days, zero-filled, oldest first.
+    bucket="week" sums days into ISO weeks (Monday start)."""
+    today = datetime.utcnow().date()
+    since = today - timedelta(days=days - 1)
+    rows = db.execute(
+        select(ActivityRollup.metric, ActivityRollup.day, ActivityRollup.count)
+        .where(ActivityRollup.metric.in_(metrics), ActivityRollup.day >= since)
+    ).all()
+
+    def start_of(d: date) -> date:
+        return d - timedelta(days=d.weekday()) if bucket == "week" else d
+
+    starts = sorted({start_of(since + timedelta(days=i)) for i in range(days)})
+    result = {m: dict.fromkeys(starts, 0) for m in metrics}
+    for metric, day, n in rows:
+        result[metric][start_of(_day(day))] += n
+    return {m: [{"start": s, "count": n} for s, n in buckets.items()] for m, buckets in result.items()}
@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from .events import subscribe
+
+# Process-local cache for public GET handlers.
+# Entries are keyed (resource, key): key=None is the resource's list view,
+# anything else is a detail view (a slug, a page_key, ...).
+# Values must be plain JSON-able data (already dumped through the Out schemas),
+# never ORM objects, since the session that loaded them is closed afterwards.
+
+READ_CACHE_TTL_SECONDS = float(os.getenv("READ_CACHE_TTL_SECONDS", "300"))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", "1024"))
+READ_CACHE_MAX_BYTES = int(os.getenv("READ_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+class ReadCache:
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _drop(self, cache_key):
+        _, size, _ = self._entries.pop(cache_key)
+        self._bytes -= size
+
+    def get(self, resource: str, key: Optional[Hashable] = None):
+        cache_key = (resource, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(cache_key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[2]
+
+    def get_or_load(self, resource: str, key: Optional[Hashable], loader: Callable[[], Any]):
+        value = self.get(resource, key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            generation = self._generation
+        value = loader()
+        # Only store if nothing was invalidated while we were loading
+        self._store((resource, key), value, generation)
+        return value
+
+    async def aget_or_load(self, resource: str, key: Optional[Hashable], loader: Callable[[], Awaitable[Any]]):
+        # Same as get_or_load() for async def handlers
+        value = self.get(resource, key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            generation = self._generation
+        value = await loader()
+        self._store((resource, key), value, generation)
+        return value
+
+    def _store(self, cache_key, value, generation):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if cache_key in self._entries:
+                self._drop(cache_key)
+            self._entries[cache_key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            # LRU eviction until we're back under both limits
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, resource: str, key: Optional[Hashable] = None):
+        # A write to one item also changes the resource's list view
+        with self._lock:
+            self._generation += 1
+            for cache_key in {(resource, key), (resource, None)}:
+                if cache_key in self._entries:
+                    self._drop(cache_key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+read_cache = ReadCache(READ_CACHE_TTL_SECONDS, READ_CACHE_MAX_ENTRIES, READ_CACHE_MAX_BYTES)
+
+@subscribe
+def _on_write(resource: str, key: Optional[str] = None):
+    read_cache.invalidate(resource, key)
@@ -0,0 +1,198 @@
+import os
+import re
+import math
+import time
+import threading
+from collections import Counter
+from typing import Optional
+from ..database import SessionLocal
+from ..models.BikeModel import Bike
+from ..models.IncludeModel import Feature, Policy
+from .events import subscribe
+from .settings_store import settings_store
+
+# In-memory BM25 index for answering typed chatbot questions.
+# Documents come from "sources": the chat options (always), plus bikes,
+# policies and features (CHATBOT_INDEX_SOURCES). Postings are kept per
+# document, so replacing one source only touches that source's documents.
+# Chat options are re-indexed straight from the settings store when
+# update_chatbot_options commits; the other sources are marked stale on write
+# and reloaded (one query) by the next question. Everything else is answered
+# from memory.
+
+CHATBOT_INDEX_SOURCES = [s.strip() for s in os.getenv("CHATBOT_INDEX_SOURCES", "options,bikes,policies,features").split(",") if s.strip()]
+CHATBOT_INDEX_TTL_SECONDS = float(os.getenv("CHATBOT_INDEX_TTL_SECONDS", "300"))  # picks up other workers' writes
+CHATBOT_MIN_SCORE = float(os.getenv("CHATBOT_MIN_SCORE", "1.0"))
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "have", "how", "i",
+    "in", "is", "it", "me", "my", "of", "on", "or", "our", "the", "to", "we", "what", "when", "where", "which",
+    "with", "you", "your", "any", "there", "this", "that", "much", "get", "need", "want", "please",
+}
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in re.findall(r"\w+", (text or "").lower()) if t not in STOPWORDS]
+
+
+# --- Documents per source: (doc id, title, body text, answer) ---
+# Every column here is nullable, so NULLs become "" (or are left out of the
+# answer) rather than reaching ChatMatchOut's str fields or the text as "None".
+def _text(*parts) -> str:
+    return " ".join(p for p in parts if p)
+
+def _titled(title, body) -> str:
+    return ": ".join(p for p in (title, body) if p)
+
+def _option_docs(options):
+    # The label is short, so repeat it to make it count as much as the reply
+    return [
+        (f"option:{o['id']}", o["label"] or "", _text(o["label"], o["label"], o["reply_text"]), o["reply_text"] or "")
+        for o in options
+    ]
+
+def _bike_docs(db):
+    docs = []
+    for b in db.query(Bike).all():
+        name = b.name or b.slug or ""
+        details = ", ".join(x for x in [b.type, b.transmission, b.cc, b.color] if x)
+        answer = f"The {name}" + (f" ({details})" if details else "") + (f" is available from {b.price}." if b.price else " is available.")
+        text = _text(b.name, b.name, b.type, b.transmission, b.color, b.fuel_use, b.description)
+        docs.append((f"bike:{b.slug}", name, text, answer))
+    return docs
+
+def _policy_docs(db):
+    return [
+        (f"policy:{p.id}", p.title or "", _text(p.title, p.title, p.points), _titled(p.title, p.points))
+        for p in db.query(Policy).all()
+    ]
+
+def _feature_docs(db):
+    return [
+        (f"feature:{f.id}", f.title or "", _text(f.title, f.title, f.subtitle), _titled(f.title, f.subtitle))
+        for f in db.query(Feature).all()
+    ]
+
+DB_SOURCES = {"bikes": _bike_docs, "policies": _policy_docs, "features": _feature_docs}
+
+
+class BM25Index:
+    def __init__(self):
+        self._postings: dict[str, dict[str, int]] = {}   # term -> {doc id: term frequency}
+        self._docs: dict[str, tuple] = {}                 # doc id -> (source, title, answer, length, terms)
+        self._by_source: dict[str, list[str]] = {}
+        self._total_length = 0
+
+    def replace_source(self, source: str, docs):
+        for doc_id in self._by_source.pop(source, []):
+            self._remove(doc_id)
+        ids = []
+        for doc_id, title, text, answer in docs:
+            tokens = tokenize(text)
+            counts = Counter(tokens)
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._docs[doc_id] = (source, title, answer, len(tokens), tuple(counts))
+            self._total_length += len(tokens)
+            ids.append(doc_id)
+        self._by_source[source] = ids
+
+    def _remove(self, doc_id: str):
+        _, _, _, length, terms = self._docs.pop(doc_id)
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, question: str, limit: int = 3):
+        n = len(self._docs)
+        if not n:
+            return []
+        avg_length = self._total_length / n or 1
+        scores: dict[str, float] = {}
+        for term in set(tokenize(question)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self._docs[doc_id][3]
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (
+                    tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                )
+        best = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+        return [
+            {"kind": self._docs[d][0], "ref": d.split(":", 1)[1], "title": self._docs[d][1], "answer": self._docs[d][2], "score": round(s, 4)}
+            for d, s in best
+        ]
+
+
+class ChatAnswerer:
+    def __init__(self, sources: list[str]):
+        self.sources = sources
+        self._lock = threading.Lock()
+        self._index = BM25Index()
+        self._options = None                 # the settings_store list last indexed
+        self._stale: set[str] = set(s for s in sources if s in DB_SOURCES)
+        self._loaded_at = 0.0
+
+    def build(self):
+        """Full build; called at startup."""
+        with self._lock:
+            self._stale = set(s for s in self.sources if s in DB_SOURCES)
+        self._refresh()
+
+    def mark_stale(self, source: str):
+        if source in self.sources:
+            with self._lock:
+                self._stale.add(source)
+
+    def _refresh(self):
+        if "options" in self.sources:
+            options = settings_store.get("chatbot")
+            if options is not self._options:
+                with self._lock:
+                    self._index.replace_source("options", _option_docs(options))
+                    self._options = options
+
+        if time.monotonic() - self._loaded_at > CHATBOT_INDEX_TTL_SECONDS:
+            with self._lock:
+                self._stale |= set(s for s in self.sources if s in DB_SOURCES)
+        with self._lock:
+            stale, self._stale = self._stale, set()
+        if not stale:
+            return
+        db = SessionLocal()
+        try:
+            loaded = {source: DB_SOURCES[source](db) for source in stale}
+        except Exception:
+            with self._lock:
+                self._stale |= stale  # try again on the next question
+            raise
+        finally:
+            db.close()
+        with self._lock:
+            for source, docs in loaded.items():
+                self._index.replace_source(source, docs)
+            self._loaded_at = time.monotonic()
+
+    def answer(self, question: str, limit: int = 3) -> dict:
+        self._refresh()
+        with self._lock:
+            matches = self._index.search(question, limit)
+        matches = [m for m in matches if m["score"] >= CHATBOT_MIN_SCORE]
+        if not matches:
+            return {"answer": None, "match": None, "alternatives": []}
+        return {"answer": matches[0]["answer"], "match": matches[0], "alternatives": matches[1:]}
+
+
+chat_answerer = ChatAnswerer(CHATBOT_INDEX_SOURCES)
+
+@subscribe
+def _on_write(resource: str, key: Optional[str] = None):
+    # "chatbot" needs nothing here: the options list is swapped in the settings store
+    if resource in DB_SOURCES:
+        chat_answerer.mark_stale(resource)
@@ -0,0 +1,195 @@
+import os
+import json
+import gzip
+import time
+import threading
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from .conditional import resource_version
+from .events import subscribe
+
+# Response compression for JSON.
+# - CompressionMiddleware gzips/brotlis any JSON response over COMPRESS_MIN_BYTES
+#   on the fly.
+# - json_bodies keeps the serialized body of hot list endpoints (get_bikes,
+#   get_gallery) and its compressed forms per resource version, so repeat
+#   requests replay ready-made bytes with no serialization or compression.
+# Brotli is optional (pip install brotli); without it clients get gzip.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))            # on-the-fly
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))     # on-the-fly
+JSON_BODY_TTL_SECONDS = float(os.getenv("JSON_BODY_TTL_SECONDS", os.getenv("READ_CACHE_TTL_SECONDS", "300")))
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+def pick_encoding(accept_encoding: str) -> Optional[str]:
+    if brotli is not None and accepts_encoding(accept_encoding, "br"):
+        return "br"
+    if accepts_encoding(accept_encoding, "gzip"):
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+
+def _encoded_headers(headers: MutableHeaders, encoding: str, length: int):
+    headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(length)
+    # Same content, different bytes: the strong ETag from conditional_get becomes weak
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+def _add_vary(headers: MutableHeaders):
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """Compresses complete (single-message) 200 JSON responses. Streams, ranges,
+    files and anything already encoded pass through untouched."""
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = pick_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start = None
+
+        async def wrapped_send(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message  # held until we've seen the body
+                return
+            if start is None:
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                # e.g. http.response.pathsend (FileResponse): nothing to compress, but the held start goes first
+                response_start, start = start, None
+                await send(response_start)
+                await send(message)
+                return
+
+            response_start, start = start, None
+            headers = MutableHeaders(raw=response_start["headers"])
+            body = message.get("body", b"")
+            is_json = headers.get("content-type", "").startswith("application/json")
+            if is_json and response_start["status"] == 200 and "content-encoding" not in headers:
+                _add_vary(headers)
+                if encoding and not message.get("more_body") and len(body) >= self.minimum_size:
+                    body = compress(body, encoding)
+                    _encoded_headers(headers, encoding, len(body))
+                    message = {"type": "http.response.body", "body": body}
+            await send(response_start)
+            await send(message)
+
+        await self.app(scope, receive, wrapped_send)
+
+
+class _Bodies:
+    def __init__(self, version: int, body: bytes):
+        self.version = version
+        self.expires = time.monotonic() + JSON_BODY_TTL_SECONDS
+        self.encoded = {"identity": body}
+
+    def get(self, encoding: str) -> bytes:
+        body = self.encoded.get(encoding)
+        if body is None:
+            # Compressed once per version, so it's worth the slowest/best level
+            body = self.encoded[encoding] = compress(self.encoded["identity"], encoding, best=True)
+        return body
+
+
+class JSONBodyCache:
+    """Serialized + compressed JSON bodies per (resource, key), valid for one resource version."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, _Bodies] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, resource: str, key: Optional[Hashable] = None):
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == resource]:
+                del self._entries[cache_key]
+
+    async def aresponse(
+        self, request: Request, response: Response, resource: str, key: Optional[Hashable],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """Replays the cached bytes for (resource, key), or awaits loader() (plain JSON-able data) to build them.
+        Headers already set on `response` (ETag etc. from conditional_get) are carried over."""
+        version = resource_version(resource)
+        with self._lock:
+            entry = self._entries.get((resource, key))
+        if entry is not None and (entry.version != version or entry.expires < time.monotonic()):
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            data = await loader()
+            # Same separators/escaping as FastAPI's JSONResponse
+            body = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=str).encode("utf-8")
+            entry = _Bodies(version, body)
+            if resource_version(resource) == version:  # nothing was written while we loaded
+                with self._lock:
+                    self._entries[(resource, key)] = entry
+        else:
+            self.hits += 1
+
+        encoding = pick_encoding(request.headers.get("accept-encoding", "")) or "identity"
+        if len(entry.encoded["identity"]) < COMPRESS_MIN_BYTES:
+            encoding = "identity"
+        body = entry.encoded.get(encoding)
+        if body is None:
+            body = await run_in_threadpool(entry.get, encoding)  # max-level compression is CPU-heavy
+        raw = Response(content=body, media_type="application/json")
+        for name, value in response.headers.items():
+            if name != "content-length":
+                raw.headers[name] = value
+        _add_vary(raw.headers)
+        if encoding != "identity":
+            _encoded_headers(raw.headers, encoding, len(body))
+        return raw
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = list(self._entries.items())
+        return {
+            "entries": len(entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": {f"{r}:{k}" if k is not None else r: {enc: len(b) for enc, b in e.encoded.items()} for (r, k), e in entries},
+        }
+
+
+json_bodies = JSONBodyCache()
+
+@subscribe
+def _on_write(resource: str, key: Optional[str] = None):
+    json_bodies.invalidate(resource, key)
@@ -0,0 +1,63 @@
+import time
+import hashlib
+from email.utils import formatdate
+from fastapi import HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from .versions import version_sync
+
+# ETag / conditional GET from the shared resource versions (core/versions.py).
+# Every notify_write() bumps the resource's version in the database, so a
+# client's ETag stays valid exactly until the next write from any worker
+# (picked up by the others within VERSION_POLL_SECONDS).
+
+_started = time.time()
+_refreshers = {}   # resource -> object with due() / refresh(), see refresh_before_check()
+
+def refresh_before_check(resources, store):
+    """Lets an in-memory store that reloads on its own schedule (settings_store)
+    catch up before the 304 check, so If-None-Match clients still reach that reload."""
+    for r in resources:
+        _refreshers[r] = store
+
+def resource_version(resource: str) -> int:
+    return version_sync.version(resource)
+
+def _make_etag(resources, request: Request) -> str:
+    # Path + query are part of the tag so /bikes and /bikes/{slug} (or different
+    # filters) never share a validator
+    parts = [request.url.path, request.url.query]
+    parts += [f"{r}:{version_sync.version(r)}" for r in sorted(resources)]
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+def conditional_get(*resources: str):
+    """Route dependency: answers 304 before the handler (and the ORM) runs
+    when the client's If-None-Match still matches, otherwise tags the response."""
+    # async so it runs on the event loop instead of taking a threadpool slot
+    async def dependency(request: Request, response: Response):
+        for store in {_refreshers[r] for r in resources if r in _refreshers}:
+            if store.due():
+                await run_in_threadpool(store.refresh)
+        etag = _make_etag(resources, request)
+        last_modified = max((version_sync.modified(r) or _started for r in resources), default=_started)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(last_modified, usegmt=True),
+            # Always revalidate: content can change at any time from the admin panel
+            "Cache-Control": "no-cache",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+
+    return dependency
@@ -0,0 +1,23 @@
+from typing import Callable, Optional
+
+# Write notifications.
+# Routers call notify_write() right after a successful commit so that anything
+# caching read results (site snapshot, etc.) can drop what depends on it.
+# resource is a short name like "hero" or "meta"; key narrows it down (e.g. a page_key).
+# notify_write() also bumps the resource's shared version (core/versions.py);
+# other processes see the bump on their next poll and call notify_local().
+
+_listeners: list[Callable[[str, Optional[str]], None]] = []
+
+def subscribe(listener: Callable[[str, Optional[str]], None]):
+    _listeners.append(listener)
+    return listener
+
+def notify_local(resource: str, key: Optional[str] = None):
+    for listener in _listeners:
+        listener(resource, key)
+
+def notify_write(resource: str, key: Optional[str] = None):
+    from .versions import version_sync  # imports the engine; keep this module dependency-free
+    version_sync.record_write(resource)
+    notify_local(resource, key)
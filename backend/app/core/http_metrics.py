@@ -0,0 +1,170 @@
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+# Request metrics in Prometheus text format (served at /metrics).
+# Everything is recorded on the event loop with a few dict/list operations per
+# request, so it stays on in production. Routes are labelled by their path
+# template ("/admin/bikes/{slug}"), never the raw URL, to keep label sets small.
+# Counters are per process: with several workers, scrape each one (or sum them).
+
+LATENCY_BUCKETS = tuple(float(b) for b in os.getenv(
+    "METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+).split(","))
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}  # anything else is labelled "other"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class HttpMetrics:
+    def __init__(self):
+        self.latency = defaultdict(lambda: _Histogram(LATENCY_BUCKETS))   # (method, route)
+        self.size = defaultdict(lambda: _Histogram(SIZE_BUCKETS))         # (method, route)
+        self.responses = defaultdict(int)                                 # (method, route, status)
+        self.exceptions = defaultdict(int)                                # (method, route, exception class)
+        self.in_flight = defaultdict(int)                                 # method
+        self.started = time.time()
+
+    def render(self) -> str:
+        lines = []
+
+        def histogram(name, help_text, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), h in sorted(series.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"{name}_sum{{{labels}}} {h.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+        histogram("http_request_duration_seconds", "Request latency by route.", self.latency)
+        histogram("http_response_size_bytes", "Response body size by route.", self.size)
+
+        lines.append("# HELP http_responses_total Responses by route and status code.")
+        lines.append("# TYPE http_responses_total counter")
+        for (method, route, status), n in sorted(self.responses.items()):
+            lines.append(f'http_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {n}')
+
+        lines.append("# HELP http_exceptions_total Unhandled exceptions by route.")
+        lines.append("# TYPE http_exceptions_total counter")
+        for (method, route, exc), n in sorted(self.exceptions.items()):
+            lines.append(f'http_exceptions_total{{method="{method}",route="{_escape(route)}",exception="{exc}"}} {n}')
+
+        lines.append("# HELP http_requests_in_flight Requests currently being handled.")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        for method, n in sorted(self.in_flight.items()):
+            lines.append(f'http_requests_in_flight{{method="{method}"}} {n}')
+
+        lines.append("# HELP process_start_time_seconds Start time of the process since unix epoch.")
+        lines.append("# TYPE process_start_time_seconds gauge")
+        lines.append(f"process_start_time_seconds {self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope.get("endpoint") is not None:
+        # A Mount (e.g. /static): label the whole mount, not each file
+        app_root = scope.get("app_root_path", "")
+        return f"{scope.get('root_path', '')[len(app_root):]}/{{path}}"
+    return "unmatched"
+
+
+http_metrics = HttpMetrics()
+
+def render_metrics() -> str:
+    """HTTP metrics plus the DB pool, per-route SQL and read-cache numbers already tracked elsewhere."""
+    from .cache import read_cache
+    from .pool_metrics import pool_stats
+    from .query_stats import query_totals
+
+    lines = [http_metrics.render().rstrip("\n")]
+    lines += query_totals.render()
+    pools = pool_stats()
+    for key in ("checked_out", "idle", "overflow", "checkout_timeouts", "checkout_wait_max_ms"):
+        kind = "counter" if key == "checkout_timeouts" else "gauge"
+        name = f"db_pool_{key}_total" if kind == "counter" else f"db_pool_{key}"
+        lines.append(f"# TYPE {name} {kind}")
+        lines += [f'{name}{{engine="{engine}"}} {stats[key]}' for engine, stats in sorted(pools.items()) if key in stats]
+
+    cache = read_cache.stats()
+    for key in ("hits", "misses", "evictions"):
+        lines.append(f"# TYPE read_cache_{key}_total counter")
+        lines.append(f"read_cache_{key}_total {cache[key]}")
+    lines.append("# TYPE read_cache_bytes gauge")
+    lines.append(f"read_cache_bytes {cache['bytes']}")
+    return "\n".join(lines) + "\n"
+
+
+def _content_length(start_message) -> int:
+    for name, value in start_message.get("headers", []):
+        if name.lower() == b"content-length":
+            return int(value) if value.isdigit() else 0
+    return 0
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics: HttpMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        method = scope["method"] if scope["method"] in METHODS else "other"
+        status = 500
+        size = 0
+        start = time.perf_counter()
+        metrics.in_flight[method] += 1
+        body_seen = False
+
+        async def wrapped_send(message):
+            nonlocal status, size, body_seen
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Used as is when no body messages follow (http.response.pathsend file responses)
+                size = _content_length(message)
+            elif message["type"] == "http.response.body":
+                if not body_seen:
+                    size, body_seen = 0, True
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        except Exception as exc:
+            metrics.exceptions[(method, route_label(scope), type(exc).__name__)] += 1
+            raise
+        finally:
+            metrics.in_flight[method] -= 1
+            route = route_label(scope)
+            metrics.latency[(method, route)].observe(time.perf_counter() - start)
+            metrics.size[(method, route)].observe(size)
+            metrics.responses[(method, route, status)] += 1
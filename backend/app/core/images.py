@@ -0,0 +1,137 @@
+import os
+import hashlib
+import threading
+from typing import Optional
+from urllib.parse import parse_qsl
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import PlainTextResponse
+from .static import CachedStaticFiles, cache_control
+
+# Responsive variants of the images in static/uploads.
+#   /static/uploads/bike.png?w=480&format=webp
+# resizes to the nearest configured width (never upscaling) and re-encodes.
+# format=auto picks AVIF/WebP from the Accept header. Variants are generated
+# on first request and kept on disk as
+#   static/derived/<name>-<source hash>-<width>.<format>
+# so an edited original never serves a stale variant.
+#
+# Pillow is required (requirements.txt); importing this module without it
+# fails at startup rather than silently serving originals for every ?w=.
+try:
+    from PIL import Image, features as _pil_features
+except ImportError as e:
+    raise ImportError("Pillow is required for /static image variants: pip install -r requirements.txt") from e
+
+IMAGE_DIR = os.getenv("IMAGE_DERIVATIVE_DIR", "static/derived")
+IMAGE_WIDTHS = sorted(int(w) for w in os.getenv("IMAGE_WIDTHS", "160,320,480,640,960,1280,1920").split(","))
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "75"))
+SOURCE_PREFIX = "uploads/"  # only derive from uploaded media
+
+FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+MEDIA_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+_lock = threading.Lock()
+_building: dict[str, threading.Lock] = {}
+_hashes: dict[tuple, str] = {}  # (path, mtime_ns, size) -> content hash
+
+
+def supported_formats() -> list[str]:
+    return [f for f in ("avif", "webp") if _pil_features.check(f)]
+
+def snap_width(requested: int) -> int:
+    # A fixed set of widths keeps the disk cache from growing per distinct ?w=
+    for w in IMAGE_WIDTHS:
+        if w >= requested:
+            return w
+    return IMAGE_WIDTHS[-1]
+
+def negotiate(accept: str) -> Optional[str]:
+    available = supported_formats()
+    for fmt in ("avif", "webp"):
+        if fmt in available and MEDIA_TYPES[fmt] in accept:
+            return fmt
+    return None
+
+def source_hash(path: str) -> str:
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    digest = _hashes.get(key)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=8)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with _lock:
+            if len(_hashes) > 4096:
+                _hashes.clear()
+            _hashes[key] = digest
+    return digest
+
+def derivative(source: str, width: Optional[int], fmt: Optional[str]) -> str:
+    """Returns the path of the (width, fmt) variant of source, building it if needed.
+    fmt=None keeps the original format; width=None keeps the original size."""
+    stem, ext = os.path.splitext(os.path.basename(source))
+    ext = f".{fmt}" if fmt else ext.lower()
+    name = f"{stem}-{source_hash(source)}-{width or 'full'}{ext}"
+    target = os.path.join(IMAGE_DIR, name)
+    if os.path.exists(target):
+        return target
+
+    # One builder per variant; concurrent requests for it wait and reuse the file
+    with _lock:
+        building = _building.setdefault(name, threading.Lock())
+    with building:
+        if not os.path.exists(target):
+            _render(source, target, width, fmt)
+    with _lock:
+        _building.pop(name, None)
+    return target
+
+def _render(source: str, target: str, width: Optional[int], fmt: Optional[str]):
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    with Image.open(source) as img:
+        out_format = FORMATS[fmt] if fmt else img.format
+        if width and width < img.width:
+            img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        tmp = f"{target}.{threading.get_ident()}.tmp"
+        img.save(tmp, format=out_format, quality=IMAGE_QUALITY, optimize=True)
+    os.replace(tmp, target)  # atomic: readers never see a half-written file
+
+
+class ResponsiveStaticFiles(CachedStaticFiles):
+    """StaticFiles that serves resized/re-encoded variants of uploads when asked via ?w= / ?format=."""
+
+    async def get_response(self, path: str, scope):
+        params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        if not path.startswith(SOURCE_PREFIX) or not ({"w", "format"} & params.keys()):
+            return await super().get_response(path, scope)
+
+        full_path, stat_result = await run_in_threadpool(self.lookup_path, path)
+        if stat_result is None:
+            return await super().get_response(path, scope)  # 404 as usual
+
+        width = None
+        if "w" in params:
+            if not params["w"].isdigit() or int(params["w"]) == 0:
+                return PlainTextResponse("w must be a positive integer", status_code=400)
+            width = snap_width(int(params["w"]))
+
+        fmt = params.get("format", "original")
+        # The variant's file name is hashed but the URL isn't: cache it like the original
+        headers = {"Cache-Control": cache_control(full_path)}
+        if fmt == "auto":
+            accept = dict(scope["headers"]).get(b"accept", b"").decode("latin-1")
+            fmt = negotiate(accept)
+            headers["Vary"] = "Accept"
+        elif fmt == "original":
+            fmt = None
+        elif fmt not in supported_formats():
+            return PlainTextResponse(f"format must be one of: auto, original, {', '.join(supported_formats())}", status_code=400)
+
+        try:
+            variant = await run_in_threadpool(derivative, full_path, width, fmt)
+        except OSError:
+            # Not an image Pillow can read; hand back the file untouched
+            return await super().get_response(path, scope)
+        return self.serve(variant, await run_in_threadpool(os.stat, variant), scope, headers=headers, media_type=MEDIA_TYPES.get(fmt))
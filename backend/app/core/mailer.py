@@ -0,0 +1,250 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Iterable, Optional
+import aiosmtplib
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..models.OutboxModel import OutboxMessage, OutboxAttachment
+
+# Durable email outbox.
+# Request handlers only insert into email_outbox and return. A background task
+# drains due messages over one reused SMTP connection, retrying failures with
+# exponential backoff and dead-lettering after OUTBOX_MAX_ATTEMPTS.
+#
+# To try it locally without Gmail, run a stand-in SMTP server:
+#   python -m aiosmtpd -n -l localhost:8025
+# and set MAIL_SERVER=localhost MAIL_PORT=8025 MAIL_STARTTLS=false MAIL_USE_CREDENTIALS=false
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+# --- SMTP settings (no defaults for accounts or secrets: set them in the environment / .env) ---
+MAIL_USERNAME = os.getenv("MAIL_USERNAME", "")
+MAIL_PASSWORD = os.getenv("MAIL_PASSWORD", "")
+MAIL_FROM = os.getenv("MAIL_FROM", MAIL_USERNAME)
+MAIL_TO = [addr.strip() for addr in os.getenv("MAIL_TO", "").split(",") if addr.strip()]
+MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
+MAIL_PORT = int(os.getenv("MAIL_PORT", "587"))
+MAIL_STARTTLS = _env_bool("MAIL_STARTTLS", True)
+MAIL_SSL_TLS = _env_bool("MAIL_SSL_TLS", False)
+MAIL_USE_CREDENTIALS = _env_bool("MAIL_USE_CREDENTIALS", True)
+MAIL_TIMEOUT = float(os.getenv("MAIL_TIMEOUT", "30"))
+
+# --- Outbox behaviour ---
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "15"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "30"))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "3600"))
+OUTBOX_CLAIM_TIMEOUT_SECONDS = float(os.getenv("OUTBOX_CLAIM_TIMEOUT_SECONDS", "600"))
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", "60"))
+
+
+def enqueue_email(
+    db: Session,
+    kind: str,
+    subject: str,
+    html: str,
+    recipients: Optional[list[str]] = None,
+    attachments: Iterable[tuple[str, str, bytes]] = (),
+) -> int:
+    """Stores a message for the background sender. attachments: (filename, content_type, data).
+    Without explicit recipients it goes to MAIL_TO as configured when it's sent, not as it is now."""
+    message = OutboxMessage(kind=kind, subject=subject, html=html, recipients=recipients or None)
+    for filename, content_type, data in attachments:
+        message.attachments.append(OutboxAttachment(
+            filename=filename, content_type=content_type or "application/octet-stream", data=data
+        ))
+    db.add(message)
+    db.commit()
+    return message.id
+
+def missing_settings() -> list[str]:
+    """The mail settings the sender can't do without that are unset."""
+    required = {"MAIL_FROM": MAIL_FROM, "MAIL_TO": MAIL_TO}
+    if MAIL_USE_CREDENTIALS:
+        required.update({"MAIL_USERNAME": MAIL_USERNAME, "MAIL_PASSWORD": MAIL_PASSWORD})
+    return [name for name, value in required.items() if not value]
+
+def backoff_seconds(attempts: int) -> float:
+    return min(OUTBOX_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), OUTBOX_BACKOFF_MAX_SECONDS)
+
+def _to_mime(message: OutboxMessage) -> EmailMessage:
+    mime = EmailMessage()
+    mime["Subject"] = message.subject
+    mime["From"] = MAIL_FROM
+    mime["To"] = ", ".join(message.recipients or MAIL_TO)
+    mime.set_content(message.html, subtype="html")
+    for attachment in message.attachments:
+        maintype, _, subtype = attachment.content_type.partition("/")
+        mime.add_attachment(
+            attachment.data, maintype=maintype, subtype=subtype or "octet-stream", filename=attachment.filename
+        )
+    return mime
+
+
+class SMTPSender:
+    """One long-lived SMTP connection, reconnected on demand and closed when idle."""
+
+    def __init__(self):
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+
+    async def _connect(self):
+        await self.close()
+        client = aiosmtplib.SMTP(
+            hostname=MAIL_SERVER,
+            port=MAIL_PORT,
+            use_tls=MAIL_SSL_TLS,
+            start_tls=MAIL_STARTTLS,
+            timeout=MAIL_TIMEOUT,
+        )
+        await client.connect()
+        if MAIL_USE_CREDENTIALS:
+            await client.login(MAIL_USERNAME, MAIL_PASSWORD)
+        self._client = client
+
+    async def send(self, message: EmailMessage):
+        if self._client is None or not self._client.is_connected:
+            await self._connect()
+        try:
+            await self._client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # The server dropped our idle connection; one fresh attempt
+            await self._connect()
+            await self._client.send_message(message)
+        self._last_used = time.monotonic()
+
+    async def close_if_idle(self):
+        if self._client is not None and time.monotonic() - self._last_used > SMTP_IDLE_SECONDS:
+            await self.close()
+
+    async def close(self):
+        client, self._client = self._client, None
+        if client is not None and client.is_connected:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
+class OutboxWorker:
+    def __init__(self):
+        self.sender = SMTPSender()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    # --- DB side (runs in a worker thread) ---
+    def _claim(self) -> list[tuple[int, EmailMessage]]:
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=OUTBOX_CLAIM_TIMEOUT_SECONDS)
+        with SessionLocal() as db:
+            messages = (
+                db.query(OutboxMessage)
+                .filter(or_(
+                    and_(OutboxMessage.status == "pending", OutboxMessage.next_attempt_at <= now),
+                    # A worker died mid-send: hand the message out again
+                    and_(OutboxMessage.status == "sending", OutboxMessage.claimed_at < stale),
+                ))
+                .order_by(OutboxMessage.next_attempt_at, OutboxMessage.id)
+                .limit(OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)  # several workers/processes can drain safely
+                .all()
+            )
+            claimed = []
+            for message in messages:
+                message.status = "sending"
+                message.claimed_at = now
+                claimed.append((message.id, _to_mime(message)))
+            db.commit()
+            return claimed
+
+    def _finish(self, results: list[tuple[int, Optional[str]]]):
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            for message_id, error in results:
+                message = db.get(OutboxMessage, message_id)
+                if message is None:
+                    continue
+                message.attempts += 1
+                message.claimed_at = None
+                if error is None:
+                    message.status = "sent"
+                    message.sent_at = now
+                    message.last_error = None
+                elif message.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    message.status = "dead"
+                    message.last_error = error
+                else:
+                    message.status = "pending"
+                    message.last_error = error
+                    message.next_attempt_at = now + timedelta(seconds=backoff_seconds(message.attempts))
+            db.commit()
+
+    # --- Async side ---
+    async def drain_once(self) -> int:
+        claimed = await asyncio.to_thread(self._claim)
+        results = []
+        for message_id, mime in claimed:
+            try:
+                await self.sender.send(mime)
+                results.append((message_id, None))
+            except Exception as e:
+                print(f"MAIL ERROR (outbox #{message_id}): {e}")
+                results.append((message_id, str(e)))
+                await self.sender.close()
+        if results:
+            await asyncio.to_thread(self._finish, results)
+        return len(claimed)
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.drain_once()
+                if processed >= OUTBOX_BATCH_SIZE:
+                    continue  # more work is probably waiting
+                await self.sender.close_if_idle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"OUTBOX ERROR: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def wake(self):
+        """Called after enqueue_email() so new mail goes out without waiting for the next poll."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> bool:
+        """Starts the sender, unless mail isn't configured: then messages stay queued
+        in email_outbox until a process with the settings starts."""
+        missing = missing_settings()
+        if missing:
+            print(f"OUTBOX DISABLED: set {', '.join(missing)} to send mail (messages stay queued)")
+            return False
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.sender.close()
+
+
+outbox = OutboxWorker()
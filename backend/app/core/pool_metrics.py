@@ -0,0 +1,108 @@
+import time
+import threading
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Live connection-pool instrumentation.
+# Pool events keep connect/checkout/checkin/invalidate counters, and the pool
+# classes below time how long each checkout waited for a free connection.
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self):
+        pool = self.pool
+        stats = {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "checkout_timeouts": self.timeouts,
+            "checkout_wait_avg_ms": round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+            "checkout_wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        return stats
+
+
+_metrics: dict[str, PoolMetrics] = {}
+
+def metrics_for(name: str) -> PoolMetrics:
+    if name not in _metrics:
+        _metrics[name] = PoolMetrics(name)
+    return _metrics[name]
+
+def _timed_do_get(pool, do_get):
+    # QueuePool._do_get blocks (up to pool_timeout) while every connection is checked out
+    metrics = metrics_for(pool.metrics_name)
+    start = time.perf_counter()
+    try:
+        connection = do_get()
+    except Exception:
+        metrics.record_wait(time.perf_counter() - start, timed_out=True)
+        raise
+    metrics.record_wait(time.perf_counter() - start)
+    return connection
+
+class TimedQueuePool(QueuePool):
+    metrics_name = "sync"
+
+    def _do_get(self):
+        return _timed_do_get(self, super()._do_get)
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+    def _do_get(self):
+        return _timed_do_get(self, super()._do_get)
+
+def watch(name: str, engine):
+    """Attaches counters to an engine's pool (sync engine, or async_engine.sync_engine)."""
+    metrics = metrics_for(name)
+    metrics.pool = engine.pool
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, record):
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, record, proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, record):
+        metrics.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, record, exception):
+        # e.g. pool_pre_ping found a connection Neon had already closed
+        metrics.invalidations += 1
+
+def pool_stats():
+    return {name: metrics.snapshot() for name, metrics in _metrics.items()}
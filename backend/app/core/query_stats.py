@@ -0,0 +1,149 @@
+import os
+import time
+import logging
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from .http_metrics import METHODS, _escape, route_label
+
+# Per-request SQL accounting.
+# Cursor events on both engines count every statement and its time into the
+# current request (a ContextVar set by QueryStatsMiddleware; it follows the
+# request into the threadpool and the async engine's greenlets). Statements
+# outside a request (outbox worker, manage.py) are only checked for slowness.
+# - SQL_DEBUG=true adds X-DB-Queries / X-DB-Time-ms / Server-Timing headers
+# - statements over SLOW_QUERY_MS are logged to "app.sql.slow"
+# - the same statement run N_PLUS_ONE_THRESHOLD+ times in one request is
+#   logged to "app.sql.n_plus_one" (the usual lazy-load-in-a-loop smell)
+# Per-route totals are also exported at /metrics.
+
+SQL_DEBUG = os.getenv("SQL_DEBUG", "false").lower() in ("1", "true", "yes", "on")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+MAX_LOGGED_SQL = 1000
+
+slow_log = logging.getLogger("app.sql.slow")
+n_plus_one_log = logging.getLogger("app.sql.n_plus_one")
+
+
+class RequestQueries:
+    __slots__ = ("scope", "count", "seconds", "statements")
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()   # SQL text (parameters stay bound) -> executions
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= MAX_LOGGED_SQL else statement[:MAX_LOGGED_SQL] + "..."
+
+def _where(queries: Optional[RequestQueries]) -> str:
+    if queries is None or queries.scope is None:
+        return "-"
+    return f"{queries.scope['method']} {route_label(queries.scope)}"
+
+def watch(engine):
+    """Attaches the statement hooks to an engine (sync engine, or async_engine.sync_engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        queries = _current.get()
+        if queries is not None:
+            queries.record(statement, elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            # Parameters are left out on purpose: they can hold emails and password hashes
+            slow_log.warning(
+                "%.1f ms%s [%s] %s", elapsed * 1000, " (executemany)" if executemany else "",
+                _where(queries), _shorten(statement),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # after_cursor_execute doesn't fire for a failed statement
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+class QueryTotals:
+    """Per-route totals for /metrics."""
+
+    def __init__(self):
+        self.queries = defaultdict(int)       # (method, route)
+        self.seconds = defaultdict(float)
+        self.n_plus_one = defaultdict(int)
+
+    def render(self) -> list[str]:
+        lines = []
+        for name, help_text, series in (
+            ("db_queries_total", "SQL statements issued by requests, by route.", self.queries),
+            ("db_query_seconds_total", "Time spent in SQL statements, by route.", self.seconds),
+            ("db_n_plus_one_requests_total", "Requests that repeated one statement N_PLUS_ONE_THRESHOLD+ times.", self.n_plus_one),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (method, route), value in sorted(series.items()):
+                lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {value:g}')
+        return lines
+
+
+query_totals = QueryTotals()
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app, debug_headers: bool = SQL_DEBUG):
+        self.app = app
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current.set(queries)
+
+        async def wrapped_send(message):
+            if message["type"] == "http.response.start" and self.debug_headers:
+                # Whatever a streaming body runs after this point only shows up in the logs
+                db_ms = queries.seconds * 1000
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-queries", str(queries.count).encode()),
+                    (b"x-db-time-ms", f"{db_ms:.1f}".encode()),
+                    (b"server-timing", f'db;dur={db_ms:.1f};desc="{queries.count} queries"'.encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            _current.reset(token)
+            key = (scope["method"] if scope["method"] in METHODS else "other", route_label(scope))
+            query_totals.queries[key] += queries.count
+            query_totals.seconds[key] += queries.seconds
+            repeated = queries.repeated()
+            if repeated:
+                query_totals.n_plus_one[key] += 1
+                for statement, n in repeated:
+                    n_plus_one_log.warning("possible N+1: %dx in one request [%s] %s", n, _where(queries), _shorten(statement))
@@ -0,0 +1,146 @@
+import math
+import threading
+from typing import Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from ..models.BikeModel import Bike
+from .events import subscribe
+
+# Fleet-wide rental pricing.
+# Every bike's pre-parsed rental_tiers are packed into (bikes x tiers) arrays
+# once, and kept until the next bike write. A quote is a dynamic programme
+# over the number of days, vectorised across the whole fleet:
+#   cost[d] = min over tiers t of cost[max(0, d - days_t)] + weight_t
+# i.e. the cheapest combination of tier blocks covering at least d days.
+# Mileage over the combined allowance is billed at the extra rate of the
+# longest tier in the combination, which isn't additive, so with a km figure
+# the programme is also run with each block's allowance credited at each of
+# the bike's extra rates (weight_t = charge_t - rate * min(max_km_t, km)),
+# and every resulting plan is priced in full, overage included. The cheapest
+# plan wins.
+
+
+class FleetTiers:
+    def __init__(self, rows):
+        self.ids = [r.id for r in rows]
+        self.slugs = [r.slug for r in rows]
+        self.names = [r.name for r in rows]
+        self.labels = [[] for _ in rows]
+
+        width = max((len(r.rental_tiers or []) for r in rows), default=0) or 1
+        shape = (len(rows), width)
+        # Padding tiers can never win: 1 day at infinite cost
+        self.days = np.ones(shape, dtype=np.int64)
+        self.charge = np.full(shape, np.inf)
+        self.max_km = np.full(shape, np.inf)
+        self.extra = np.zeros(shape)
+
+        for i, row in enumerate(rows):
+            for j, (days, charge, max_km, extra, label) in enumerate(row.rental_tiers or []):
+                self.days[i, j] = days
+                self.charge[i, j] = charge
+                self.max_km[i, j] = np.inf if max_km is None else max_km
+                self.extra[i, j] = extra
+                self.labels[i].append(label)
+
+
+_lock = threading.Lock()
+_fleet: Optional[FleetTiers] = None
+_generation = 0   # bumped on every bike write
+
+@subscribe
+def _on_write(resource: str, key: Optional[str] = None):
+    global _fleet, _generation
+    if resource == "bikes":
+        with _lock:
+            _fleet = None
+            _generation += 1
+
+def get_fleet(db: Session) -> FleetTiers:
+    global _fleet
+    with _lock:
+        fleet, generation = _fleet, _generation
+    if fleet is None:
+        rows = db.query(Bike.id, Bike.slug, Bike.name, Bike.rental_tiers).order_by(Bike.id).all()
+        fleet = FleetTiers(rows)
+        with _lock:
+            # A write landed while we were reading: use what we got, but don't keep it
+            if _generation == generation:
+                _fleet = fleet
+    return fleet
+
+
+def _cover(days, weight, rental_days: int):
+    """Cheapest (by weight) blocks covering rental_days, per bike. Returns the
+    last block chosen at each day count, for walking back the plan."""
+    count = weight.shape[0]
+    rows = np.arange(count)
+    cost = np.full((count, rental_days + 1), np.inf)
+    cost[:, 0] = 0.0
+    choice = np.full((count, rental_days + 1), -1, dtype=np.int64)
+    for d in range(1, rental_days + 1):
+        candidates = cost[rows[:, None], np.maximum(d - days, 0)] + weight   # (bikes, tiers)
+        best = candidates.argmin(axis=1)
+        cost[:, d] = candidates[rows, best]
+        choice[:, d] = best
+    return choice
+
+def _plan(choice, days, local: int, rental_days: int) -> dict:
+    blocks, d = {}, rental_days
+    while d > 0:
+        t = int(choice[local, d])
+        blocks[t] = blocks.get(t, 0) + 1
+        d = max(0, d - int(days[local, t]))
+    return blocks
+
+def _price(blocks: dict, local: int, charge, max_km, extra, days, km: Optional[float]) -> dict:
+    rental_total = sum(float(charge[local, t]) * n for t, n in blocks.items())
+    included_km = sum(float(max_km[local, t]) * n for t, n in blocks.items())
+    longest = max(blocks, key=lambda t: days[local, t])
+    over = 0.0 if not km or math.isinf(included_km) else max(km - included_km, 0.0)
+    extra_total = over * float(extra[local, longest])
+    return {"total": rental_total + extra_total, "rental_total": rental_total, "included_km": included_km,
+            "extra_km": over, "extra_km_charge": extra_total}
+
+
+def quote_fleet(fleet: FleetTiers, rental_days: int, km: Optional[float] = None, slugs: Optional[list[str]] = None):
+    selected = [i for i, slug in enumerate(fleet.slugs) if not slugs or slug in slugs]
+    if not selected:
+        return []
+
+    days, charge = fleet.days[selected], fleet.charge[selected]
+    max_km, extra = fleet.max_km[selected], fleet.extra[selected]
+
+    weights = [charge]
+    if km:
+        credit = np.minimum(max_km, km)
+        for j in range(charge.shape[1]):
+            weights.append(charge - extra[:, j:j + 1] * credit)
+    choices = [_cover(days, weight, rental_days) for weight in weights]
+
+    quotes = []
+    for local, i in enumerate(selected):
+        if not np.isfinite(charge[local]).any():
+            # Bike has no usable rental_charges
+            quotes.append({"slug": fleet.slugs[i], "name": fleet.names[i], "total": None})
+            continue
+
+        plans = [_plan(choice, days, local, rental_days) for choice in choices]
+        priced = [(_price(blocks, local, charge, max_km, extra, days, km), blocks) for blocks in plans]
+        price, blocks = min(priced, key=lambda p: p[0]["total"])
+
+        quotes.append({
+            "slug": fleet.slugs[i],
+            "name": fleet.names[i],
+            "total": round(price["total"], 2),
+            "rental_total": round(price["rental_total"], 2),
+            "extra_km": float(price["extra_km"]),
+            "extra_km_charge": round(price["extra_km_charge"], 2),
+            "included_km": None if math.isinf(price["included_km"]) else float(price["included_km"]),
+            "breakdown": [
+                {"tier": fleet.labels[i][t], "days": int(days[local, t]), "count": n, "charge": float(charge[local, t])}
+                for t, n in sorted(blocks.items(), key=lambda item: -days[local, item[0]])
+            ],
+        })
+
+    return sorted(quotes, key=lambda q: (q["total"] is None, q["total"] or 0))
@@ -0,0 +1,104 @@
+import re
+from sqlalchemy import func, literal, literal_column, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..models.BikeModel import Bike
+
+# Full-text search over the bike catalogue.
+# Postgres: a generated tsvector column on bikes + GIN index.
+# SQLite:   an FTS5 external-content table kept in sync by triggers.
+# Either way the index is maintained by the database itself, so every commit
+# from the bike CRUD routes (or anywhere else) is searchable immediately.
+# Both use plain word tokens (no stemming) so prefix typeahead matches what's typed.
+
+SEARCH_COLUMNS = ("name", "description", "type", "color", "fuel_use", "transmission")
+MAX_TERMS = 8
+
+# name weighs most, then the short attribute columns, then the description
+_PG_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(type, '') || ' ' || coalesce(color, '') || ' ' || "
+    "coalesce(fuel_use, '') || ' ' || coalesce(transmission, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+_FTS_COLUMNS = ", ".join(SEARCH_COLUMNS)
+_FTS_NEW = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+_FTS_OLD = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+BM25_WEIGHTS = (10.0, 1.0, 4.0, 4.0, 4.0, 4.0)  # same order as SEARCH_COLUMNS
+
+SEARCH_DDL = {
+    "postgresql": [
+        f"ALTER TABLE bikes ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({_PG_VECTOR}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_bikes_search_vector ON bikes USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS bikes_fts USING fts5({_FTS_COLUMNS}, "
+        "content='bikes', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS bikes_fts_ai AFTER INSERT ON bikes BEGIN "
+        f"INSERT INTO bikes_fts(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW}); END",
+        f"CREATE TRIGGER IF NOT EXISTS bikes_fts_ad AFTER DELETE ON bikes BEGIN "
+        f"INSERT INTO bikes_fts(bikes_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD}); END",
+        f"CREATE TRIGGER IF NOT EXISTS bikes_fts_au AFTER UPDATE ON bikes BEGIN "
+        f"INSERT INTO bikes_fts(bikes_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD}); "
+        f"INSERT INTO bikes_fts(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW}); END",
+    ],
+}
+
+def ensure_search_index(bind: Engine):
+    """Idempotent; called from migrations.upgrade()."""
+    dialect = bind.dialect.name
+    if dialect not in SEARCH_DDL:
+        return
+    with bind.begin() as conn:
+        fresh = dialect == "sqlite" and conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'bikes_fts'")
+        ).first() is None
+        for statement in SEARCH_DDL[dialect]:
+            conn.execute(text(statement))
+        if fresh:
+            # Index the rows that existed before the triggers did
+            conn.execute(text("INSERT INTO bikes_fts(bikes_fts) VALUES ('rebuild')"))
+
+def terms(q: str) -> list[str]:
+    # Word characters only: nothing from the user reaches the query syntax
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+def _fts5_query(words: list[str], prefix: bool) -> str:
+    return " AND ".join(f'"{w}"*' if prefix else f'"{w}"' for w in words)
+
+def _tsquery(words: list[str], prefix: bool) -> str:
+    return " & ".join(f"{w}:*" if prefix else w for w in words)
+
+def _search_sqlite(db: Session, words: list[str], prefix: bool, limit: int, offset: int):
+    params = {"q": _fts5_query(words, prefix), "limit": limit, "offset": offset}
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    total = db.execute(text("SELECT count(*) FROM bikes_fts WHERE bikes_fts MATCH :q"), params).scalar_one()
+    # bm25() only works inside the FTS query itself, so rank + page there and load the rows after
+    page_ids = db.execute(
+        text(
+            f"SELECT rowid FROM bikes_fts WHERE bikes_fts MATCH :q "
+            f"ORDER BY bm25(bikes_fts, {weights}), rowid LIMIT :limit OFFSET :offset"
+        ),
+        params,
+    ).scalars().all()
+    by_id = {b.id: b for b in db.query(Bike).filter(Bike.id.in_(page_ids)).all()} if page_ids else {}
+    return [by_id[i] for i in page_ids if i in by_id], total
+
+def _search_postgres(db: Session, words: list[str], prefix: bool, limit: int, offset: int):
+    query = func.to_tsquery(literal("simple"), _tsquery(words, prefix))
+    vector = literal_column("bikes.search_vector")
+    where = vector.op("@@")(query)
+    total = db.execute(select(func.count()).select_from(Bike).where(where)).scalar_one()
+    bikes = db.execute(
+        select(Bike).where(where).order_by(func.ts_rank_cd(vector, query).desc(), Bike.id).offset(offset).limit(limit)
+    ).scalars().all()
+    return bikes, total
+
+def search_bikes(db: Session, q: str, prefix: bool = False, limit: int = 20, offset: int = 0):
+    """Ranked bikes matching every term of q (as prefixes when prefix=True). Returns (bikes, total)."""
+    words = terms(q)
+    if not words:
+        return [], 0
+    # Other databases never get this far: database.require_supported_dialect() refuses them at startup
+    search = {"postgresql": _search_postgres, "sqlite": _search_sqlite}[db.get_bind().dialect.name]
+    return search(db, words, prefix, limit, offset)
@@ -0,0 +1,191 @@
+import os
+import time
+import threading
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..models.AboutModel import About
+from ..models.ChatBotModel import ChatOption
+from ..models.ContactModel import ContactInfo
+from ..models.ContentModel import PageMeta
+from ..models.FooterModel import Footer
+from ..schemas import AdminSchemas as schemas
+from .conditional import refresh_before_check
+from .events import notify_write, subscribe
+
+# In-memory store for the site's singleton/settings records:
+# about, footer, contact info, page meta and chatbot options.
+# Defaults are written once by migrations.upgrade() (seed() below); loading
+# never writes. GETs are served from memory. Update routes upsert and then
+# put() the new value; a write notification (local, or another worker's seen
+# through the shared versions) marks the store stale so the next read reloads.
+# Every SETTINGS_STORE_TTL_SECONDS it also reloads on its own, and announces
+# anything that changed behind its back (e.g. an edit made straight in the DB).
+
+SETTINGS_STORE_TTL_SECONDS = float(os.getenv("SETTINGS_STORE_TTL_SECONDS", "60"))
+
+# name -> (model, Out schema, default row)
+SINGLETONS = {
+    "about": (About, schemas.AboutOut, {
+        "description": "Welcome to Rental Motors. Our journey started with a passion for the open road...",
+        "hero_image": "https://res.cloudinary.com/demo/image/upload/v1312461204/sample.jpg",  # A placeholder cloud URL
+    }),
+    "footer": (Footer, schemas.FooterSettingsRead, {"site_title": "ARP MOTORS"}),
+    "contact_info": (ContactInfo, schemas.ContactInfoOut, {
+        "address": "Set Your Address", "phone": "000", "email": "admin@site.com", "latitude": 0.0, "longitude": 0.0,
+    }),
+}
+DEFAULT_CHAT_OPTION = {
+    "label": "Pricing",
+    "icon_name": "PoundSterling",
+    "reply_text": "Our rentals start from £40 per day. Long-term deals available!",
+}
+
+def default_meta(page_key: str) -> dict:
+    # What an untouched page shows; not written to the DB until an admin saves it
+    return {
+        "page_key": page_key,
+        "header_title": f"{page_key.capitalize()} Title",
+        "header_image": "",
+        "header_description": "",
+        "page_title": "",
+        "page_subtitle": "",
+    }
+
+
+RESOURCES = ("about", "footer", "contact_info", "chatbot", "meta")
+
+def seed(bind: Engine, chat_options_created: bool = False):
+    """Writes the default singleton rows where a table is empty, and the default
+    chatbot option when chat_options was just created. An admin emptying the
+    chatbot list leaves it empty. Called from migrations.upgrade()."""
+    with Session(bind=bind) as db:
+        if bind.dialect.name == "postgresql":
+            # Held until commit; serialises the check-then-insert below across workers
+            db.execute(text("SELECT pg_advisory_xact_lock(hashtext('settings_store_seed'))"))
+        for model, _, defaults in SINGLETONS.values():
+            if db.query(model.id).first() is None:
+                db.add(model(**defaults))
+        if chat_options_created and db.query(ChatOption.id).first() is None:
+            db.add(ChatOption(**DEFAULT_CHAT_OPTION))
+        db.commit()
+
+
+class SettingsStore:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()   # one reload at a time; other readers keep the current values
+        self._loaded_at: Optional[float] = None
+        self._generation = 0                   # bumped by write notifications
+        self._loaded_generation = -1
+        self._announcing = threading.local()
+        self._values: dict = {}
+        self._ids: dict[str, int] = {}
+        self._meta: dict[str, dict] = {}
+
+    def _read(self, db: Session):
+        values, ids = {}, {}
+        for name, (model, schema, defaults) in SINGLETONS.items():
+            row = db.query(model).order_by(model.id.asc()).first()
+            if row is None:
+                # Not seeded (e.g. DB_AUTO_MIGRATE=false before `manage.py migrate`); the first save creates id 1
+                ids[name] = 1
+                values[name] = schema.model_validate({"id": 1, **defaults}).model_dump()
+                continue
+            ids[name] = row.id
+            values[name] = schema.model_validate(row).model_dump()
+        values["chatbot"] = [
+            schemas.ChatOptionOut.model_validate(o).model_dump()
+            for o in db.query(ChatOption).order_by(ChatOption.position.asc(), ChatOption.id.asc()).all()
+        ]
+        meta = {m.page_key: schemas.PageMetaOut.model_validate(m).model_dump() for m in db.query(PageMeta).all()}
+        return values, ids, meta
+
+    def load(self, db: Optional[Session] = None) -> list[str]:
+        """(Re)reads every settings record into memory. Read-only.
+        Returns the resources whose content differs from what was held before."""
+        generation = self._generation
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            values, ids, meta = self._read(db)
+        finally:
+            if own_session:
+                db.close()
+
+        with self._lock:
+            first = self._loaded_at is None
+            changed = [] if first else [name for name in SINGLETONS if values[name] != self._values.get(name)]
+            if not first and values["chatbot"] != self._values.get("chatbot"):
+                changed.append("chatbot")
+            if not first and meta != self._meta:
+                changed.append("meta")
+            self._values, self._ids, self._meta = values, ids, meta
+            self._loaded_at = time.monotonic()
+            self._loaded_generation = generation
+        return changed
+
+    def mark_stale(self, resource: str):
+        if resource in RESOURCES and not getattr(self._announcing, "active", False):
+            self._generation += 1
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def due(self) -> bool:
+        return self._loaded_generation != self._generation or self._expired()
+
+    def refresh(self):
+        stale = self._loaded_generation != self._generation
+        if not (stale or self._expired()):
+            return
+        # Single flight: only the first reader reloads, the rest serve what's
+        # held (the very first load is waited for, there's nothing to serve yet)
+        if not self._reload_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if not self.due():
+                return   # someone else reloaded while we waited
+            changed = self.load()
+            if not stale:
+                # A TTL reload found edits nobody announced: let the caches and ETags know
+                self._announcing.active = True
+                try:
+                    for resource in changed:
+                        notify_write(resource)
+                finally:
+                    self._announcing.active = False
+        finally:
+            self._reload_lock.release()
+
+    def get(self, name: str):
+        self.refresh()
+        return self._values[name]
+
+    def singleton_id(self, name: str) -> int:
+        self.refresh()
+        return self._ids[name]
+
+    def get_meta(self, page_key: str) -> dict:
+        self.refresh()
+        return self._meta.get(page_key) or default_meta(page_key)
+
+    def put(self, name: str, value):
+        with self._lock:
+            self._values[name] = value
+
+    def put_meta(self, page_key: str, value: dict):
+        with self._lock:
+            self._meta[page_key] = value
+
+
+settings_store = SettingsStore(SETTINGS_STORE_TTL_SECONDS)
+refresh_before_check(RESOURCES, settings_store)
+
+
+@subscribe
+def _on_write(resource: str, key: Optional[str] = None):
+    settings_store.mark_stale(resource)
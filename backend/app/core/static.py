@@ -0,0 +1,109 @@
+import os
+import re
+import gzip
+from mimetypes import guess_type
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+from .compression import accepts_encoding
+
+# Static serving for /static:
+# - file names carrying a content hash (e.g. "32f2648abac815a3507d331c3b92c2e9.png",
+#   "bike-3ef16b282f33bb22-480.webp") never change, so they're sent as immutable
+# - everything else is revalidated (ETag / Last-Modified -> 304)
+# - "name.br" / "name.gz" siblings are sent instead of "name" when the client accepts
+#   them (build them with `python manage.py compress-static`)
+# Range requests come from Starlette's FileResponse. It also hands the path to the
+# server ("http.response.pathsend") for a zero-copy send when the server supports it;
+# otherwise files are streamed in STATIC_CHUNK_SIZE chunks.
+try:
+    import brotli  # optional (pip install brotli), only needed to build .br siblings
+except ImportError:
+    brotli = None
+
+STATIC_CHUNK_SIZE = int(os.getenv("STATIC_CHUNK_SIZE", str(256 * 1024)))
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "0"))  # for files without a hash in the name
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+HASHED_NAME = re.compile(r"(^|[-_.])[0-9a-f]{16,}([-_.]|$)")
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSIBLE = {".svg", ".css", ".js", ".json", ".txt", ".html", ".xml", ".map", ".ico"}
+
+
+class StaticFileResponse(FileResponse):
+    chunk_size = STATIC_CHUNK_SIZE
+
+
+def is_hashed(path: str) -> bool:
+    return bool(HASHED_NAME.search(os.path.splitext(os.path.basename(path))[0]))
+
+def cache_control(path: str) -> str:
+    if is_hashed(path):
+        return IMMUTABLE
+    return f"public, max-age={STATIC_MAX_AGE}, must-revalidate" if STATIC_MAX_AGE else "no-cache"
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with cache headers and precompressed (br/gzip) siblings."""
+
+    def serve(self, full_path, stat_result, scope, status_code: int = 200, headers: dict = None, media_type: str = None):
+        request_headers = Headers(scope=scope)
+        headers = {"Cache-Control": cache_control(str(full_path)), **(headers or {})}
+
+        # Ranges are byte offsets into what we send; keep them on the plain file
+        if "range" not in request_headers:
+            accept_encoding = request_headers.get("accept-encoding", "")
+            for coding, suffix in ENCODINGS:
+                sibling = f"{full_path}{suffix}"
+                try:
+                    sibling_stat = os.stat(sibling)
+                except OSError:
+                    continue
+                headers["Vary"] = "Accept-Encoding"
+                if accepts_encoding(accept_encoding, coding):
+                    response = StaticFileResponse(
+                        sibling, status_code=status_code, stat_result=sibling_stat,
+                        media_type=media_type or self._media_type(full_path),
+                        headers={**headers, "Content-Encoding": coding},
+                    )
+                    return self._conditional(response, request_headers)
+
+        response = StaticFileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, media_type=media_type, headers=headers
+        )
+        return self._conditional(response, request_headers)
+
+    def _conditional(self, response, request_headers):
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _media_type(full_path) -> str:
+        # The sibling's own name would say application/gzip; keep the original's type
+        return guess_type(str(full_path))[0] or "text/plain"
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        # Called by StaticFiles.get_response (also for html=True 404 pages)
+        return self.serve(full_path, stat_result, scope, status_code)
+
+
+def precompress(path: str, min_saving: float = 0.1) -> list[str]:
+    """Writes .gz (and .br if brotli is installed) next to path when it saves at least min_saving."""
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE:
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    candidates = [(".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.append((".br", lambda d: brotli.compress(d, quality=11)))
+
+    written = []
+    for suffix, compress in candidates:
+        body = compress(data)
+        if len(body) <= len(data) * (1 - min_saving):
+            tmp = f"{path}{suffix}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, f"{path}{suffix}")
+            written.append(f"{path}{suffix}")
+    return written
@@ -0,0 +1,207 @@
+import os
+import time
+import uuid
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from ..models.BikeModel import Bike, parse_number, parse_rental_tiers
+from ..models.BookingModel import Booking
+from ..models.GalleryModel import Gallery
+from ..models.HeroModel import HeroSlide
+from ..models.IncludeModel import Feature, Policy
+from .activity import recount
+from .events import notify_write
+
+# Synthetic catalogue for scale testing (`python manage.py generate`).
+# Rows are built as plain dicts and written with Core executemany, one
+# transaction per batch, so nothing goes through the ORM unit of work. That
+# also means the Bike validators and the after_flush stat counters don't run:
+# the numeric/tier columns are filled in here, and the counters are rebuilt
+# with recount() at the end, and the touched resources' versions are bumped
+# so running workers refresh. Bookings never overlap per bike (the Postgres
+# exclusion constraint would reject them), including ones from earlier runs,
+# and start a year back so the activity charts have something to show.
+
+MODELS = {  # brand -> [(model, type, cc, top speed km/h, transmission)]
+    "Honda": [("PCX 125", "Scooter", 125, 105, "Automatic"), ("CB125F", "Commuter", 125, 100, "Manual"),
+              ("CB500X", "Adventure", 471, 180, "Manual"), ("Forza 350", "Scooter", 330, 135, "Automatic")],
+    "Yamaha": [("NMAX 125", "Scooter", 125, 100, "Automatic"), ("MT-07", "Sport", 689, 210, "Manual"),
+               ("Tracer 7", "Adventure", 689, 200, "Manual"), ("XSR125", "Commuter", 125, 110, "Manual")],
+    "Suzuki": [("Burgman 125", "Scooter", 125, 100, "Automatic"), ("V-Strom 650", "Adventure", 645, 190, "Manual"),
+               ("GSX-8S", "Sport", 776, 220, "Manual")],
+    "Kawasaki": [("Z650", "Sport", 649, 200, "Manual"), ("Versys 650", "Adventure", 649, 200, "Manual")],
+    "Vespa": [("Primavera 125", "Scooter", 125, 95, "Automatic"), ("GTS 300", "Scooter", 278, 130, "Automatic")],
+    "Royal Enfield": [("Himalayan", "Adventure", 452, 160, "Manual"), ("Classic 350", "Commuter", 349, 115, "Manual")],
+    "Lexmoto": [("Echo 50", "Scooter", 50, 45, "Automatic"), ("LXR 125", "Commuter", 125, 100, "Manual")],
+    "NIU": [("MQi GT", "Scooter", 0, 70, "Automatic")],
+}
+COLORS = ["Black", "White", "Red", "Blue", "Grey", "Matt Green", "Silver", "Orange"]
+TIERS = [("1 Day", 1, 1.0), ("3 Days", 3, 0.95), ("1 Week", 7, 0.85), ("2 Weeks", 14, 0.78), ("1 Month", 30, 0.65)]
+FIRST_NAMES = ["Aisha", "Ben", "Chloe", "Daniel", "Emma", "Farhan", "Grace", "Harry", "Isla", "Jack", "Maya", "Oliver", "Priya", "Sam", "Zara"]
+LAST_NAMES = ["Ahmed", "Brown", "Clarke", "Davies", "Evans", "Khan", "Patel", "Smith", "Taylor", "Walker", "Wilson", "Wright"]
+FEATURES = [("FaHelmetSafety", "Helmet included"), ("FaLock", "Disc lock"), ("FaShieldAlt", "Insurance"), ("FaRoad", "Breakdown cover"),
+            ("FaBoxOpen", "Top box"), ("FaMobileAlt", "Phone mount"), ("FaGasPump", "Full tank"), ("FaUserShield", "CBT support")]
+POLICIES = [("Deposit", "£200 held on card, Released within 5 days"), ("Licence", "Full or CBT, Photo ID, Proof of address"),
+            ("Fuel", "Return with the same level, Refuelling charged at cost"), ("Damage", "Excess £500, Report within 24 hours"),
+            ("Cancellation", "Free up to 48 hours before, 50% after that")]
+STATUS_WEIGHTS = (("confirmed", 6), ("pending", 3), ("cancelled", 1))
+
+
+def _images(image_base: str) -> list[str]:
+    # Point at the PNGs/JPGs in static/uploads, so /static resizing gets exercised too
+    folder = os.path.join("static", "uploads")
+    names = sorted(n for n in os.listdir(folder) if os.path.isfile(os.path.join(folder, n))) if os.path.isdir(folder) else []
+    return [f"{image_base.rstrip('/')}/static/uploads/{n}" for n in names] or [f"{image_base.rstrip('/')}/static/uploads/bike.png"]
+
+def _rental_charges(rng: random.Random, daily: int) -> list[dict]:
+    charges = []
+    for label, days, factor in TIERS[:rng.randint(3, len(TIERS))]:
+        charges.append({
+            "duration": label,
+            "charge": f"£{round(daily * days * factor)}",
+            "max_km": "-" if days >= 30 else str(150 * days),
+            "extra_charge": f"£{rng.choice(['0.15', '0.20', '0.25', '0.30'])}",
+        })
+    return charges
+
+def _bike_row(rng: random.Random, run: str, i: int, images: list[str]) -> dict:
+    brand = rng.choice(list(MODELS))
+    model, kind, cc, speed, transmission = rng.choice(MODELS[brand])
+    year = rng.randint(2014, 2025)
+    daily = max(25, round(cc / 12 + rng.randint(15, 40)))
+    electric = cc == 0
+    row = {
+        "slug": f"{brand}-{model}".lower().replace(" ", "-") + f"-{run}-{i}",
+        "name": f"{brand} {model}",
+        "price": f"£{daily}",
+        "image": images[i % len(images)],
+        "cc": "Electric" if electric else f"{cc}cc",
+        "fuel": "2.3 kWh" if electric else f"{rng.choice([5.5, 7, 8, 10, 14, 17])}L",
+        "topSpeed": f"{speed} km/h",
+        "description": f"{year} {brand} {model} in {rng.choice(COLORS).lower()}. " + rng.choice([
+            "Easy to ride in town and cheap on fuel.", "Comfortable for two up touring with luggage.",
+            "Great for commuting and weekend trips.", "Plenty of power for motorway riding.",
+        ]),
+        "year_mf": str(year),
+        "fuel_use": "Electric" if electric else "Petrol",
+        "color": rng.choice(COLORS),
+        "max_passengers": 1 if cc <= 50 else 2,
+        "transmission": transmission,
+        "type": kind,
+        "rental_charges": _rental_charges(rng, daily),
+    }
+    # What Bike's @validates hooks would have set
+    price, cc_value, top, year_value = (parse_number(row[k]) for k in ("price", "cc", "topSpeed", "year_mf"))
+    row.update({
+        "price_value": price,
+        "cc_value": int(cc_value) if cc_value is not None else None,
+        "top_speed_value": top,
+        "year_value": int(year_value) if year_value is not None else None,
+        "rental_tiers": parse_rental_tiers(row["rental_charges"]),
+    })
+    return row
+
+
+def _insert(bind: Engine, model, rows_iter, total: int, batch_size: int, label: str):
+    """Writes rows from rows_iter in batches, one transaction each, with a progress line."""
+    if total <= 0:
+        return
+    table = model.__table__
+    started = time.perf_counter()
+    done = 0
+    while done < total:
+        batch = [next(rows_iter) for _ in range(min(batch_size, total - done))]
+        with bind.begin() as conn:
+            conn.execute(table.insert(), batch)
+        done += len(batch)
+        rate = done / max(time.perf_counter() - started, 1e-9)
+        print(f"\r{label:<9} {done:>10,}/{total:,}  {rate:,.0f} rows/s", end="", flush=True)
+    print()
+
+def generate(
+    bind: Engine, bikes: int = 0, gallery: int = 0, hero: int = 0, features: int = 0, policies: int = 0,
+    bookings: int = 0, batch_size: int = 5000, seed: int = None, image_base: str = "http://localhost:8000",
+):
+    """Appends the given numbers of synthetic rows; bookings go to the bikes created here (or existing ones)."""
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:6]   # fresh every run so slugs never collide; everything else follows `seed`
+    images = _images(image_base)
+
+    def bike_rows():
+        for i in range(bikes):
+            yield _bike_row(rng, run, i, images)
+
+    def gallery_rows():
+        for i in range(gallery):
+            yield {"image": images[i % len(images)], "description": f"{rng.choice(list(MODELS))} ride #{i}"}
+
+    def hero_rows():
+        for i in range(hero):
+            brand = rng.choice(list(MODELS))
+            yield {"image_url": images[i % len(images)], "title": f"Ride a {brand} this weekend", "subtitle": "Daily and weekly rentals", "order": i}
+
+    def feature_rows():
+        for i in range(features):
+            icon, title = FEATURES[i % len(FEATURES)]
+            yield {"icon_name": icon, "title": title if i < len(FEATURES) else f"{title} {i}", "subtitle": "Included with every rental"}
+
+    def policy_rows():
+        for i in range(policies):
+            title, points = POLICIES[i % len(POLICIES)]
+            yield {"title": title if i < len(POLICIES) else f"{title} {i}", "points": points, "color_type": ("orange", "dark")[i % 2]}
+
+    _insert(bind, Bike, bike_rows(), bikes, batch_size, "bikes")
+    _insert(bind, Gallery, gallery_rows(), gallery, batch_size, "gallery")
+    _insert(bind, HeroSlide, hero_rows(), hero, batch_size, "hero")
+    _insert(bind, Feature, feature_rows(), features, batch_size, "features")
+    _insert(bind, Policy, policy_rows(), policies, batch_size, "policies")
+
+    if bookings:
+        with bind.connect() as conn:
+            query = select(Bike.id).order_by(Bike.id)
+            if bikes:
+                query = query.where(Bike.slug.like(f"%-{run}-%"))
+            bike_ids = conn.execute(query).scalars().all()
+            # Append after each bike's existing bookings, so a second run can't overlap the first
+            booked_until = dict(conn.execute(select(Booking.bike_id, func.max(Booking.end_date)).group_by(Booking.bike_id)).all())
+        if not bike_ids:
+            raise ValueError("bookings need bikes: pass --bikes or generate into a database that has some")
+        _insert(bind, Booking, _booking_rows(rng, bike_ids, bookings, booked_until), bookings, batch_size, "bookings")
+
+    print("Rebuilding dashboard counters...")
+    recount(bind)
+    # Running workers drop their caches and ETags on their next version poll
+    for resource, n in (("bikes", bikes), ("gallery", gallery), ("hero", hero), ("features", features),
+                        ("policies", policies), ("bookings", bookings)):
+        if n:
+            notify_write(resource)
+
+def _booking_rows(rng: random.Random, bike_ids: list[int], total: int, booked_until: dict = None):
+    # Each bike gets back-to-back windows starting a year ago, or the day after
+    # its last existing booking (booked_until: bike id -> max end_date), so no two overlap
+    today = datetime.utcnow().date()
+    year_ago = today - timedelta(days=365)
+    cursor = {bike_id: max(year_ago, end + timedelta(days=1)) for bike_id, end in (booked_until or {}).items()}
+    statuses = [s for s, _ in STATUS_WEIGHTS]
+    weights = [w for _, w in STATUS_WEIGHTS]
+    for i in range(total):
+        bike_id = bike_ids[i % len(bike_ids)]
+        start = cursor.get(bike_id, year_ago) + timedelta(days=rng.randint(0, 3))
+        end = start + timedelta(days=rng.choice([0, 1, 2, 3, 6, 13]))
+        cursor[bike_id] = end + timedelta(days=1)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        created = datetime.combine(min(start, today), datetime.min.time()) - timedelta(days=rng.randint(1, 30), minutes=rng.randint(0, 1439))
+        yield {
+            "bike_id": bike_id,
+            "start_date": start,
+            "end_date": end,
+            "status": rng.choices(statuses, weights)[0],
+            "customer_name": f"{first} {last}",
+            "email": f"{first}.{last}{i}@example.com".lower(),
+            "phone": f"07{rng.randint(100000000, 999999999)}",
+            "license_type": rng.choice(["Full", "A2", "CBT"]),
+            "has_cbt": rng.choice(["Yes", "No"]),
+            "notes": None,
+            "created_at": created,
+        }
@@ -0,0 +1,104 @@
+import os
+import asyncio
+import contextvars
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from sqlalchemy import update
+from ..database import SessionLocal
+from ..models.UploadModel import UploadLedger
+from ..utils import upload_image_to_cloud
+from .upsert import upsert
+from .activity import record
+
+# Cloudinary's SDK is blocking, so uploads run on their own small thread pool
+# instead of on the event loop (or in Starlette's shared threadpool, where a
+# burst of big uploads would starve ordinary sync routes).
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "4"))
+UPLOAD_BATCH_CONCURRENCY = int(os.getenv("UPLOAD_BATCH_CONCURRENCY", "3"))  # per batch request
+UPLOAD_BATCH_MAX_FILES = int(os.getenv("UPLOAD_BATCH_MAX_FILES", "20"))
+
+_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="upload")
+
+# Dedup: every upload is hashed first and looked up in upload_ledger, so the
+# same photo re-uploaded through gallery/about/footer reuses the existing URL.
+_lock = threading.Lock()
+_inflight: dict[str, threading.Lock] = {}  # content hash -> lock, so identical files in one batch upload once
+
+def hash_stream(file) -> tuple[str, int]:
+    """sha256 + size of a file object, read in chunks; rewinds it for the uploader."""
+    h, size = hashlib.sha256(), 0
+    for chunk in iter(lambda: file.read(1 << 20), b""):
+        h.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return h.hexdigest(), size
+
+def _ledger_lookup(content_hash: str) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        url = db.query(UploadLedger.url).filter(UploadLedger.content_hash == content_hash).scalar()
+        if url:
+            db.execute(
+                update(UploadLedger).where(UploadLedger.content_hash == content_hash).values(hits=UploadLedger.hits + 1)
+            )
+            # Not an "uploads" activity: that counts new files only, the way recount() rebuilds it
+            db.commit()
+        return url
+    finally:
+        db.close()
+
+def _ledger_record(content_hash: str, url: str, size: int):
+    db = SessionLocal()
+    try:
+        # ON CONFLICT DO NOTHING: another worker may have recorded the same bytes meanwhile
+        upsert(db, UploadLedger, {"content_hash": content_hash, "url": url, "size": size, "hits": 0}, ["content_hash"], update={})
+        record(db, "uploads")
+        db.commit()
+    finally:
+        db.close()
+
+def upload_deduped(file) -> Optional[str]:
+    """Blocking: ledger hit -> existing URL, otherwise upload_image_to_cloud and record it."""
+    content_hash, size = hash_stream(file)
+    with _lock:
+        gate = _inflight.setdefault(content_hash, threading.Lock())
+    try:
+        with gate:
+            try:
+                url = _ledger_lookup(content_hash)
+                if url:
+                    return url
+            except Exception as e:
+                # The ledger is an optimisation; never fail an upload because of it
+                print(f"Upload ledger lookup failed: {e}")
+
+            url = upload_image_to_cloud(file)
+            if url:
+                try:
+                    _ledger_record(content_hash, url, size)
+                except Exception as e:
+                    print(f"Upload ledger write failed: {e}")
+            return url
+    finally:
+        with _lock:
+            _inflight.pop(content_hash, None)
+
+async def upload_to_cloud(file) -> Optional[str]:
+    """Non-blocking, deduplicated upload_image_to_cloud: returns the secure URL, or None on failure."""
+    loop = asyncio.get_running_loop()
+    # run_in_executor doesn't carry contextvars over (unlike to_thread); copy them so
+    # the ledger queries are counted against the request (core/query_stats.py)
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, context.run, upload_deduped, file)
+
+async def upload_many(files, concurrency: int = UPLOAD_BATCH_CONCURRENCY) -> list[Optional[str]]:
+    """Uploads file objects concurrently (at most `concurrency` in flight). URLs come back in input order."""
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(f):
+        async with gate:
+            return await upload_to_cloud(f)
+
+    return await asyncio.gather(*(one(f) for f in files))
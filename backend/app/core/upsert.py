@@ -0,0 +1,33 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# INSERT ... ON CONFLICT for the two databases we run on (Neon Postgres, local SQLite).
+# Any other dialect is refused at startup (database.require_supported_dialect).
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def _insert(db, model):
+    # db: a Session or a Connection
+    dialect = db.dialect.name if hasattr(db, "dialect") else db.get_bind().dialect.name
+    return _INSERTS[dialect](model)
+
+def upsert(db: Session, model, values: dict, conflict_columns: list[str], update: dict = None):
+    """Atomic insert-or-update of one row, keyed by a unique/PK constraint. Returns the row as a dict.
+    update defaults to every non-key value; does not commit."""
+    update = {k: v for k, v in (update if update is not None else values).items() if k not in conflict_columns}
+    stmt = _insert(db, model).values(**values)
+    if update:
+        stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=update)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+    row = db.execute(stmt.returning(*model.__table__.columns)).mappings().first()
+    return dict(row) if row is not None else None
+
+def increment(db, model, keys: dict, column: str, delta: int, **also):
+    """column += delta (and column=value for each of `also`) on the row identified by keys,
+    creating it (with delta) if missing. Returns the new value; does not commit."""
+    stmt = _insert(db, model).values(**keys, **{column: delta}, **also)
+    return db.execute(stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={column: getattr(model, column) + stmt.excluded[column], **{k: stmt.excluded[k] for k in also}},
+    ).returning(getattr(model, column))).scalar_one()
@@ -0,0 +1,103 @@
+import os
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select
+from ..database import engine
+from ..models.VersionModel import ResourceVersion
+from .events import notify_local
+from .upsert import increment
+
+# Shared resource versions, so every worker (and manage.py scripts) agree on
+# what "changed" means.
+# notify_write() bumps the resource's row in resource_versions after the
+# write commits. ETags are built from these numbers. Each process also polls
+# the table every VERSION_POLL_SECONDS and fires the local listeners (read
+# cache, JSON bodies, site snapshot, settings store, chat index, fleet) for
+# anything another process bumped, so their caches and 304s follow within
+# one poll interval.
+
+VERSION_POLL_SECONDS = float(os.getenv("VERSION_POLL_SECONDS", "2"))
+
+
+class VersionSync:
+    def __init__(self, bind=engine):
+        self.bind = bind
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+        self._modified: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def version(self, resource: str) -> int:
+        return self._versions.get(resource, 0)
+
+    def modified(self, resource: str) -> Optional[float]:
+        return self._modified.get(resource)
+
+    def _advance(self, resource: str, version: int, updated_at: datetime) -> bool:
+        # Versions only move forward, so a poll that read the table just before our own bump can't undo it
+        with self._lock:
+            if version <= self._versions.get(resource, 0):
+                return False
+            self._versions[resource] = version
+            self._modified[resource] = updated_at.replace(tzinfo=timezone.utc).timestamp()
+            return True
+
+    def record_write(self, resource: str):
+        """Bumps the shared version of resource. Call after the write has committed."""
+        now = datetime.utcnow()
+        try:
+            with self.bind.begin() as conn:
+                version = increment(conn, ResourceVersion, {"resource": resource}, "version", 1, updated_at=now)
+        except Exception as e:
+            # The write itself is committed; other workers catch up on their TTLs
+            print(f"VERSION BUMP FAILED ({resource}): {e}")
+            return
+        self._advance(resource, version, now)
+
+    def poll(self) -> list[str]:
+        """Reads every version; returns the resources that moved since the last look."""
+        with self.bind.connect() as conn:
+            rows = conn.execute(select(ResourceVersion.resource, ResourceVersion.version, ResourceVersion.updated_at)).all()
+        return [resource for resource, version, updated_at in rows if self._advance(resource, version, updated_at)]
+
+    def sync(self) -> list[str]:
+        """poll() + notify the local listeners about what other processes wrote."""
+        changed = self.poll()
+        for resource in changed:
+            notify_local(resource)
+        return changed
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(VERSION_POLL_SECONDS)
+            try:
+                changed = await asyncio.to_thread(self.poll)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"VERSION POLL ERROR: {e}")
+                continue
+            for resource in changed:
+                notify_local(resource)
+
+    def start(self) -> bool:
+        """Polls in the background. Call poll() once first (nothing is cached yet, so no notifications).
+        False if it's already running (e.g. a second app lifespan in the same process)."""
+        if self._task is not None:
+            return False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+version_sync = VersionSync()
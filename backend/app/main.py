@@ -1,15 +1,53 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from app.database import engine, Base # 🔹 Import engine and Base
-from app.routes import admin, about, bikes, include, meta, gallery, contact, hero, stats, booking, contact_message, footer, chatbot
+from fastapi.responses import PlainTextResponse
+from app.database import engine, require_supported_dialect # 🔹 Schema is created in lifespan() / manage.py, not at import
+from app.migrations import upgrade
+from app.routes import admin, about, bikes, include, meta, gallery, contact, hero, stats, booking, contact_message, footer, chatbot, site, quotes
 # Import all models here so Base knows about them
-from app.models import BikeModel, ContentModel, AboutModel, IncludeModel, GalleryModel, ContactModel, HeroModel, FooterModel, ChatBotModel
+from app.models import BikeModel, ContentModel, AboutModel, IncludeModel, GalleryModel, ContactModel, HeroModel, FooterModel, ChatBotModel, BookingModel, OutboxModel, UploadModel, StatsModel, VersionModel
+from app.core.mailer import outbox
+from app.core.settings_store import settings_store
+from app.core.chat_index import chat_answerer
+from app.core.versions import version_sync
+from app.core.images import ResponsiveStaticFiles
+from app.core.compression import CompressionMiddleware
+from app.core.http_metrics import MetricsMiddleware, render_metrics
+from app.core.query_stats import QueryStatsMiddleware
 
-app = FastAPI(title="ARP Motors API")
+def _env_flag(name: str, default: str = "true") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
 
-# 🔹 Add this line: It creates tables if they don't exist
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema upgrade on boot. Deploys that run `python manage.py migrate` as a
+    # release step can set DB_AUTO_MIGRATE=false and skip the catalog round trips.
+    require_supported_dialect(engine)
+    if _env_flag("DB_AUTO_MIGRATE"):
+        await run_in_threadpool(upgrade, engine)
+
+    # Current shared resource versions (ETags), then follow other workers' writes
+    await run_in_threadpool(version_sync.poll)
+    run_versions = version_sync.start()
+
+    # Preload about/footer/contact/meta/chatbot so their GETs skip the DB
+    await run_in_threadpool(settings_store.load)
+    # ...and index them (plus bikes/policies/features) for typed chatbot questions
+    await run_in_threadpool(chat_answerer.build)
+
+    # Background email sender (set OUTBOX_WORKER_ENABLED=false on processes that shouldn't send;
+    # it also stays off, with a warning, while the MAIL_* settings are missing)
+    run_outbox = _env_flag("OUTBOX_WORKER_ENABLED") and outbox.start()
+    yield
+    if run_outbox:
+        await outbox.stop()
+    if run_versions:
+        await version_sync.stop()
+
+app = FastAPI(title="ARP Motors API", lifespan=lifespan)
 
 # Add your Vercel URL to this list
 origins = [
@@ -17,17 +55,29 @@ origins = [
     "https://rental-motors-website.vercel.app", # Paste your actual Vercel URL here
 ]
 
+# gzip/brotli for JSON responses (see core/compression.py)
+app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-DB-Queries", "X-DB-Time-ms", "Server-Timing"],
 )
 
+# SQL statement count/time per request, slow-query and N+1 logs (see core/query_stats.py)
+app.add_middleware(QueryStatsMiddleware)
+
+# Outermost, so latency/size cover everything above (sizes are on-the-wire, after compression)
+app.add_middleware(MetricsMiddleware)
+
 # 1. Mount the static folder so uploaded images are viewable in the browser
 # This makes http://localhost:8000/static/uploads/image.jpg work
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# (and /static/uploads/image.jpg?w=480&format=auto for a resized WebP/AVIF, see core/images.py;
+# cache headers and .br/.gz siblings are handled in core/static.py)
+app.mount("/static", ResponsiveStaticFiles(directory="static"), name="static")
 
 # 2. Include your routers
 app.include_router(admin.router)
@@ -43,7 +93,14 @@ app.include_router(booking.router)
 app.include_router(contact_message.router)
 app.include_router(footer.router)
 app.include_router(chatbot.router)
+app.include_router(site.router)
+app.include_router(quotes.router)
 
 @app.get("/main")
 def root():
-    return {"status": "API running"}
\ No newline at end of file
+    return {"status": "API running"}
+
+# Prometheus scrape target (per-route latency, sizes, status codes, in-flight, DB pool, cache)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
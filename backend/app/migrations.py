@@ -0,0 +1,131 @@
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Engine
+from .database import Base, require_supported_dialect
+from .core.search import ensure_search_index
+
+# Base.metadata.create_all() only creates tables that are missing. Anything
+# declared later on an existing table (new columns, new indexes) is applied
+# here so that production databases pick it up too, followed by the data
+# backfills those columns need and their NOT NULL constraints.
+#
+# Nothing runs this at import time: it's called from main.lifespan() (unless
+# DB_AUTO_MIGRATE=false) or explicitly with `python manage.py migrate`.
+
+def import_models():
+    # Every model module has to be imported for Base.metadata to know its table
+    from .models import (  # noqa: F401
+        AboutModel, AdminUser, BikeModel, BookingModel, ChatBotModel, ContactModel,
+        ContentModel, FooterModel, GalleryModel, HeroModel, IncludeModel, OutboxModel, StatsModel, UploadModel, VersionModel,
+    )
+
+def _add_missing_columns(conn, table, existing_columns) -> dict:
+    """ALTER TABLE ... ADD COLUMN for every declared column the table lacks.
+    Returns {name: {"nullable", "default"}} as added, in the shape inspector.get_columns() uses.
+    A column with a server default is added as NOT NULL DEFAULT x right away. One that is
+    NOT NULL without a default goes in nullable and gets the constraint after its backfill."""
+    dialect = conn.dialect
+    preparer = dialect.identifier_preparer
+    ddl = dialect.ddl_compiler(dialect, None)
+    added = {}
+    for column in table.columns:
+        if column.name in existing_columns:
+            continue
+        spec = f"{preparer.format_column(column)} {column.type.compile(dialect=dialect)}"
+        default = ddl.get_column_default_string(column)
+        if default is not None:
+            spec += f" DEFAULT {default}" + ("" if column.nullable else " NOT NULL")
+        conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {spec}"))
+        added[column.name] = {"nullable": default is None or column.nullable, "default": default}
+    return added
+
+def _require_not_null(conn, table, existing_columns: dict):
+    """Brings NOT NULL / server defaults of existing columns in line with the model.
+    Postgres only: SQLite can't alter a column without rebuilding the table, so
+    there these stay nullable and the ORM-side default fills them."""
+    if conn.dialect.name != "postgresql":
+        return
+    preparer = conn.dialect.identifier_preparer
+    ddl = conn.dialect.ddl_compiler(conn.dialect, None)
+    for column in table.columns:
+        current = existing_columns.get(column.name)
+        if current is None or column.primary_key:
+            continue
+        alter = f"ALTER TABLE {preparer.format_table(table)} ALTER COLUMN {preparer.format_column(column)}"
+        default = ddl.get_column_default_string(column)
+        if default is not None and current.get("default") is None:
+            conn.execute(text(f"{alter} SET DEFAULT {default}"))
+        if not column.nullable and current.get("nullable"):
+            conn.execute(text(f"{alter} SET NOT NULL"))
+
+def _backfill_bike_numbers(conn, added: set):
+    # Only right after the columns were added: rows whose text doesn't parse stay
+    # NULL, and re-scanning them on every boot would never get anywhere
+    from .models.BikeModel import Bike, parse_number, parse_rental_tiers
+
+    if added & {"price_value", "cc_value", "top_speed_value", "year_value"}:
+        rows = conn.execute(select(Bike.id, Bike.price, Bike.cc, Bike.topSpeed, Bike.year_mf)).mappings().all()
+        for row in rows:
+            cc, year = parse_number(row["cc"]), parse_number(row["year_mf"])
+            conn.execute(
+                Bike.__table__.update().where(Bike.id == row["id"]).values(
+                    price_value=parse_number(row["price"]),
+                    cc_value=int(cc) if cc is not None else None,
+                    top_speed_value=parse_number(row["topSpeed"]),
+                    year_value=int(year) if year is not None else None,
+                )
+            )
+
+    if "rental_tiers" in added:
+        rows = conn.execute(select(Bike.id, Bike.rental_charges).where(Bike.rental_charges.isnot(None))).mappings().all()
+        for row in rows:
+            conn.execute(
+                Bike.__table__.update().where(Bike.id == row["id"]).values(
+                    rental_tiers=parse_rental_tiers(row["rental_charges"])
+                )
+            )
+
+def _backfill_chat_positions(conn, added: set):
+    # Options used to be shown in id order; keep that order for rows from before `position`
+    from .models.ChatBotModel import ChatOption
+
+    if "position" in added:
+        conn.execute(ChatOption.__table__.update().values(position=ChatOption.id))
+
+# table -> backfill(conn, added column names), run in the same transaction as the ADD COLUMNs
+BACKFILLS = {
+    "bikes": _backfill_bike_numbers,
+    "chat_options": _backfill_chat_positions,
+}
+
+def upgrade(bind: Engine):
+    require_supported_dialect(bind)
+    import_models()
+    inspector = inspect(bind)
+    existing = set(inspector.get_table_names())
+    Base.metadata.create_all(bind=bind)
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        columns = {c["name"]: c for c in inspector.get_columns(table.name)}
+        # Columns, their backfill and then their constraints commit together,
+        # so a failed boot can't leave half-filled columns behind
+        with bind.begin() as conn:
+            added = _add_missing_columns(conn, table, columns)
+            if table.name in BACKFILLS:
+                BACKFILLS[table.name](conn, set(added))
+            _require_not_null(conn, table, {**columns, **added})
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+    # Default about/footer/contact rows, and the starter chatbot option for a brand-new table
+    from .core.settings_store import seed
+    seed(bind, chat_options_created="chat_options" not in existing)
+
+    # Dashboard counters/rollups start from the real row counts, then writes keep them current
+    if "stat_counters" not in existing:
+        from .core.activity import recount
+        recount(bind)
+
+    # Full-text index over bikes (generated tsvector / FTS5 + triggers)
+    ensure_search_index(bind)
@@ -1,8 +1,53 @@
-from sqlalchemy import Column, Integer, String, Text, JSON
+import re
+from sqlalchemy import Column, Integer, String, Text, JSON, Float, Index
+from sqlalchemy.orm import validates
 from app.database import Base
 
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+def parse_number(text):
+    """First number in a display string: '£1,200' -> 1200.0, '155cc' -> 155.0, '140 km/h' -> 140.0"""
+    if text is None:
+        return None
+    match = _NUMBER.search(str(text).replace(",", ""))
+    return float(match.group()) if match else None
+
+# Longest unit first: "2 Weeks" must not match "day"
+_DURATION_UNITS = [("month", 30), ("fortnight", 14), ("week", 7), ("daily", 1), ("day", 1)]
+
+def parse_duration_days(text):
+    """'1 Day' -> 1, '7 Days' -> 7, '2 Weeks' -> 14, '1 Month' -> 30, 'Weekly' -> 7"""
+    if not text:
+        return None
+    lower = str(text).lower()
+    for unit, days in _DURATION_UNITS:
+        if unit in lower:
+            count = parse_number(lower) or 1
+            return int(count * days)
+    return None
+
+def parse_rental_tiers(charges):
+    """rental_charges rows -> [[days, charge, max_km, extra_charge_per_km, label], ...]
+    max_km is None when the tier has no mileage cap ("-")."""
+    tiers = []
+    for row in charges or []:
+        days = parse_duration_days(row.get("duration"))
+        charge = parse_number(row.get("charge"))
+        if not days or charge is None:
+            continue
+        max_km, extra = parse_number(row.get("max_km")), parse_number(row.get("extra_charge")) or 0.0
+        tiers.append([days, charge, max_km, extra, row.get("duration")])
+    return tiers
+
 class Bike(Base):
     __tablename__ = "bikes"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY <sort column>, id
+        Index("ix_bikes_name_id", "name", "id"),
+        Index("ix_bikes_price_value_id", "price_value", "id"),
+        Index("ix_bikes_cc_value_id", "cc_value", "id"),
+        Index("ix_bikes_year_value_id", "year_value", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     slug = Column(String, unique=True, index=True)
@@ -16,12 +61,39 @@ class Bike(Base):
     
     # New Sketch Fields
     year_mf = Column(String)       # e.g., 2018
-    fuel_use = Column(String)      # e.g., Octane
-    color = Column(String)         # e.g., Deep Blue
-    max_passengers = Column(Integer, default=2)
-    transmission = Column(String)   # e.g., Automatic
-    type = Column(String)           # e.g., Scooter
+    fuel_use = Column(String, index=True)      # e.g., Octane
+    color = Column(String, index=True)         # e.g., Deep Blue
+    max_passengers = Column(Integer, default=2, index=True)
+    transmission = Column(String, index=True)   # e.g., Automatic
+    type = Column(String, index=True)           # e.g., Scooter
+
+    # Numeric copies of the display strings above, for range filters and sorting in SQL.
+    # Kept in sync by the validators below, never written directly.
+    price_value = Column(Float, nullable=True)
+    cc_value = Column(Integer, nullable=True)
+    top_speed_value = Column(Float, nullable=True)
+    year_value = Column(Integer, nullable=True)
     
     # Dynamic Rental Charges (Stores the table data as a list of dicts)
     # [{"duration": "Daily", "charge": "100", "max_km": "-", "extra_charge": "-"}, ...]
-    rental_charges = Column(JSON, nullable=True)
\ No newline at end of file
+    rental_charges = Column(JSON, nullable=True)
+    # rental_charges pre-parsed into numbers for the quote engine (see parse_rental_tiers)
+    rental_tiers = Column(JSON, nullable=True)
+
+    @validates("price", "cc", "topSpeed", "year_mf")
+    def _sync_numeric(self, key, value):
+        number = parse_number(value)
+        if key == "price":
+            self.price_value = number
+        elif key == "cc":
+            self.cc_value = int(number) if number is not None else None
+        elif key == "topSpeed":
+            self.top_speed_value = number
+        else:
+            self.year_value = int(number) if number is not None else None
+        return value
+
+    @validates("rental_charges")
+    def _sync_tiers(self, key, value):
+        self.rental_tiers = parse_rental_tiers(value)
+        return value
@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Index, CheckConstraint, DDL, event
+from app.database import Base
+
+class Booking(Base):
+    __tablename__ = "bookings"
+    __table_args__ = (
+        # Availability probes per bike only walk bookings that end on/after the requested start
+        Index("ix_bookings_bike_end_start", "bike_id", "end_date", "start_date"),
+        CheckConstraint("end_date >= start_date", name="ck_bookings_dates"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    bike_id = Column(Integer, ForeignKey("bikes.id", ondelete="CASCADE"), nullable=False)
+
+    # Both dates inclusive: pick-up day through return day
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending / confirmed / cancelled
+
+    customer_name = Column(String, nullable=False)
+    email = Column(String, nullable=False)
+    phone = Column(String, nullable=True)
+    license_type = Column(String, nullable=True)
+    has_cbt = Column(String, nullable=True)
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# On Postgres the database itself refuses overlapping active bookings for a bike
+# (GiST exclusion constraint over the date range), which also indexes the ranges.
+event.listen(
+    Booking.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Booking.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_no_overlap "
+        "EXCLUDE USING gist (bike_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+        "WHERE (status <> 'cancelled')"
+    ).execute_if(dialect="postgresql"),
+)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index
 from ..database import Base
 
 class ChatOption(Base):
     __tablename__ = "chat_options"
+    __table_args__ = (
+        Index("ix_chat_options_position_id", "position", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     label = Column(String)         # The button text (e.g., "Price")
     icon_name = Column(String)     # The Lucide icon key (e.g., "PoundSterling")
-    reply_text = Column(String)    # What the bot says back
\ No newline at end of file
+    reply_text = Column(String)    # What the bot says back
+    position = Column(Integer, nullable=False, default=0, server_default="0")  # display order (0 first), set by the bulk PUT
@@ -0,0 +1,38 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, LargeBinary, JSON, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class OutboxMessage(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # The sender only ever looks for due work: status + next_attempt_at
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)            # e.g. "booking", "contact"
+    subject = Column(String, nullable=False)
+    recipients = Column(JSON, nullable=False)        # ["someone@example.com", ...]; JSON null = MAIL_TO at send time
+    html = Column(Text, nullable=False)
+
+    # pending -> sending -> sent, or back to pending with a later next_attempt_at,
+    # or "dead" once OUTBOX_MAX_ATTEMPTS is reached (kept for inspection / manual retry)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    attachments = relationship("OutboxAttachment", cascade="all, delete-orphan", lazy="selectin")
+
+class OutboxAttachment(Base):
+    __tablename__ = "email_outbox_attachments"
+
+    id = Column(Integer, primary_key=True)
+    message_id = Column(Integer, ForeignKey("email_outbox.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=False, default="application/octet-stream")
+    data = Column(LargeBinary, nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Date, BigInteger
+from app.database import Base
+
+class StatCounter(Base):
+    __tablename__ = "stat_counters"
+
+    # Row counts kept up to date by the writes themselves (see core/activity.py),
+    # so the dashboard never has to COUNT(*) the big tables
+    name = Column(String, primary_key=True)        # e.g. "bikes", "gallery_images"
+    value = Column(BigInteger, nullable=False, default=0)
+
+class ActivityRollup(Base):
+    __tablename__ = "activity_rollup"
+
+    # One row per metric per UTC day; weeks are summed from days when read
+    metric = Column(String, primary_key=True)      # "bookings", "inquiries", "uploads"
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
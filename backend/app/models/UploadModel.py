@@ -0,0 +1,13 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database import Base
+
+class UploadLedger(Base):
+    __tablename__ = "upload_ledger"
+
+    # sha256 of the uploaded bytes -> where Cloudinary put them
+    content_hash = Column(String(64), primary_key=True)
+    url = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)   # re-uploads answered from the ledger
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
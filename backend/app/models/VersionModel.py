@@ -0,0 +1,13 @@
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, DateTime
+from app.database import Base
+
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+
+    # One row per cached resource ("bikes", "about", ...), bumped after every
+    # committed write by any worker or script (see core/versions.py). ETags and
+    # the per-process caches follow this number, not a local counter.
+    resource = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
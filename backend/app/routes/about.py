@@ -2,71 +2,49 @@ import os
 import shutil
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
 from sqlalchemy.orm import Session
-from ..database import get_db, engine
+from ..database import get_db
 from ..models.AboutModel import About
-from ..utils import upload_image_to_cloud
+from ..core.uploads import upload_to_cloud
+from ..core.events import notify_write
+from ..core.settings_store import settings_store
+from ..core.upsert import upsert
+from ..core.conditional import conditional_get
 from ..schemas.AdminSchemas import AboutUpdate, AboutOut
 
 router = APIRouter(prefix="/admin", tags=["About"])
 
-# Create table if it doesn't exist
-About.metadata.create_all(bind=engine)
-
-@router.get("/about", response_model=AboutOut)
-def get_about(db: Session = Depends(get_db)):
-    # 1. Look for the brand story in Neon
-    about_data = db.query(About).first()
-    
-    # 2. If nothing exists yet, create a default "Starter" record
-    if not about_data:
-        about_data = About(
-            description="Welcome to Rental Motors. Our journey started with a passion for the open road...",
-            hero_image="https://res.cloudinary.com/demo/image/upload/v1312461204/sample.jpg" # A placeholder cloud URL
-        )
-        db.add(about_data)
-        db.commit()
-        db.refresh(about_data)
-        
-    # 3. Return the data (including the Cloudinary URL) to the frontend
-    return about_data
+@router.get("/about", response_model=AboutOut, dependencies=[Depends(conditional_get("about"))])
+def get_about():
+    # Served from the settings store (default record is seeded at startup)
+    return settings_store.get("about")
 
 @router.put("/about")
 def update_about(data: AboutUpdate, db: Session = Depends(get_db)):
-    # 1. Try to find the existing record
-    about_record = db.query(About).first()
-
-    # 2. If it doesn't exist (first time setup), create it
-    if not about_record:
-        about_record = About(
-            description=data.description,
-            hero_image=data.hero_image
-        )
-        db.add(about_record)
-    else:
-        # 3. Update the existing record with new data (Cloudinary URLs + Text)
-        about_record.description = data.description
-        about_record.hero_image = data.hero_image
-
     try:
+        # 1. One atomic INSERT ... ON CONFLICT on the singleton row
+        row = upsert(db, About, {"id": settings_store.singleton_id("about"), **data.model_dump()}, ["id"])
         db.commit()
-        db.refresh(about_record) # Syncs the object with the database
-        return {
-            "message": "About section updated successfully",
-            "data": {
-                "description": about_record.description,
-                "hero_image": about_record.hero_image
-            }
-        }
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+    # 2. Refresh the in-memory copy
+    settings_store.put("about", AboutOut.model_validate(row).model_dump())
+    notify_write("about")
+    return {
+        "message": "About section updated successfully",
+        "data": {
+            "description": row["description"],
+            "hero_image": row["hero_image"]
+        }
+    }
+
 @router.post("/about/upload-image")
 async def upload_image(file: UploadFile = File(...)):
     try:
         # 1. Send the file directly to Cloudinary
         # We pass image.file (the actual data stream) to our utility
-        cloud_url = upload_image_to_cloud(file.file)
+        cloud_url = await upload_to_cloud(file.file)  # runs on the upload pool, not the event loop
         
         # 2. Check if the upload was successful
         if not cloud_url:
@@ -1,22 +1,231 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import base64
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import String, and_, case, cast, func, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..models.BikeModel import Bike  
 from ..schemas import AdminSchemas as schemas
 from ..utils import get_current_admin  # 🛡️ Your JWT guard
+from ..core.cache import read_cache
+from ..core.compression import json_bodies
+from ..core.conditional import conditional_get
+from ..core.events import notify_write
+from ..core.search import search_bikes
 
 router = APIRouter(prefix="/admin", tags=["Bikes"])
 
-@router.get("/bikes", response_model=list[schemas.BikeOut])
-def get_bikes(db: Session = Depends(get_db)):
-    return db.query(Bike).all()
+# Sort keys exposed to the client -> indexed columns (see BikeModel __table_args__)
+SORT_COLUMNS = {
+    "id": Bike.id,
+    "name": Bike.name,
+    "price": Bike.price_value,
+    "cc": Bike.cc_value,
+    "year": Bike.year_value,
+}
+DEFAULT_PAGE_SIZE = 20
+# Slugs that would be shadowed by a fixed /bikes/... route
+RESERVED_SLUGS = {"search"}
 
-@router.get("/bikes/{slug}", response_model=schemas.BikeOut)
-def get_bike_by_slug(slug: str, db: Session = Depends(get_db)):
-    db_bike = db.query(Bike).filter(Bike.slug == slug).first()
-    if not db_bike:
-        raise HTTPException(status_code=404, detail="Vehicle not found")
-    return db_bike
+# Facet buckets: (label, lower bound inclusive, upper bound exclusive)
+CC_BUCKETS = [("<125", None, 125), ("125-299", 125, 300), ("300-599", 300, 600), ("600+", 600, None)]
+PRICE_BUCKETS = [("<50", None, 50), ("50-99", 50, 100), ("100-199", 100, 200), ("200+", 200, None)]
+
+def _to_out(bikes):
+    return [schemas.BikeOut.model_validate(b).model_dump() for b in bikes]
+
+def _encode_cursor(value, bike_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, bike_id]).encode()).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        value, bike_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, int(bike_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _after_cursor(column, value, bike_id: int, descending: bool):
+    # Keyset condition for ORDER BY column [DESC] NULLS LAST, id [DESC]
+    id_after = Bike.id < bike_id if descending else Bike.id > bike_id
+    if column is Bike.id:
+        return id_after
+    if value is None:
+        return and_(column.is_(None), id_after)
+    value_after = column < value if descending else column > value
+    return or_(value_after, and_(column == value, id_after), column.is_(None))
+
+def _page_statement(stmt, sort: str, order: str, cursor: Optional[str], page_size: Optional[int]):
+    """Orders a select(Bike) by the sort key and limits it to one keyset page (+1 look-ahead row)."""
+    column = SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    if cursor:
+        value, bike_id = _decode_cursor(cursor)
+        stmt = stmt.where(_after_cursor(column, value, bike_id, descending))
+
+    if column is Bike.id:
+        stmt = stmt.order_by(Bike.id.desc() if descending else Bike.id.asc())
+    elif descending:
+        stmt = stmt.order_by(column.desc().nulls_last(), Bike.id.desc())
+    else:
+        stmt = stmt.order_by(column.asc().nulls_last(), Bike.id.asc())
+
+    # Fetch one extra row to know whether there is a next page
+    return stmt if page_size is None else stmt.limit(page_size + 1)
+
+def _cut_page(bikes, sort: str, page_size: Optional[int]):
+    """Drops the look-ahead row. Returns (bikes, next_cursor)."""
+    if page_size is None or len(bikes) <= page_size:
+        return bikes, None
+    bikes = bikes[:page_size]
+    last = bikes[-1]
+    return bikes, _encode_cursor(getattr(last, SORT_COLUMNS[sort].key), last.id)
+
+def _bucket_case(column, buckets):
+    whens = []
+    for label, low, high in buckets:
+        bounds = []
+        if low is not None:
+            bounds.append(column >= low)
+        if high is not None:
+            bounds.append(column < high)
+        whens.append((and_(*bounds), label))
+    return case(*whens, else_="unknown")
+
+def _facet_counts(db: Session, conditions):
+    """All facet counts in one round trip: one GROUP BY per facet, glued with UNION ALL."""
+    groups = {
+        "type": Bike.type,
+        "transmission": Bike.transmission,
+        "fuel_use": Bike.fuel_use,
+        "cc": _bucket_case(Bike.cc_value, CC_BUCKETS),
+        "price": _bucket_case(Bike.price_value, PRICE_BUCKETS),
+    }
+    selects = [
+        select(literal(name).label("facet"), cast(expr, String).label("value"), func.count().label("n"))
+        .where(*conditions)
+        .group_by(expr)
+        for name, expr in groups.items()
+    ]
+
+    facets = {name: {} for name in groups}
+    for facet, value, n in db.execute(union_all(*selects)):
+        facets[facet][value if value is not None else "unknown"] = n
+    return facets
+
+@router.get("/bikes", response_model=list[schemas.BikeOut], dependencies=[Depends(conditional_get("bikes"))])
+async def get_bikes(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query("id", pattern="^(id|name|price|cc|year)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    type: Optional[str] = None,
+    transmission: Optional[str] = None,
+    fuel: Optional[str] = None,
+    color: Optional[str] = None,
+    max_passengers: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    filters = {
+        Bike.type: type,
+        Bike.transmission: transmission,
+        Bike.fuel_use: fuel,  # "fuel" as in fuel type (Octane, Diesel...), not the tank size column
+        Bike.color: color,
+        Bike.max_passengers: max_passengers,
+    }
+    conditions = [col == value for col, value in filters.items() if value is not None]
+
+    # 1. No paging/filtering asked for: the full list the site has always used
+    #    (cached, and replayed as ready-made JSON/gzip/br bytes until the next write)
+    if limit is None and cursor is None and not conditions and sort == "id" and order == "asc":
+        async def load_all():
+            return _to_out((await db.execute(select(Bike))).scalars().all())
+        return await json_bodies.aresponse(
+            request, response, "bikes", None, lambda: read_cache.aget_or_load("bikes", None, load_all)
+        )
+
+    # 2. Filtered / sorted / paged query, served straight from the indexes
+    page_size = limit or (DEFAULT_PAGE_SIZE if cursor else None)
+    stmt = _page_statement(select(Bike).where(*conditions), sort, order, cursor, page_size)
+    bikes, next_cursor = _cut_page((await db.execute(stmt)).scalars().all(), sort, page_size)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return _to_out(bikes)
+
+@router.get("/fleet/search", dependencies=[Depends(conditional_get("bikes"))])
+def search_fleet(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: str = Query("id", pattern="^(id|name|price|cc|year)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    type: Optional[str] = None,
+    transmission: Optional[str] = None,
+    fuel_use: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_cc: Optional[int] = None,
+    max_cc: Optional[int] = None,
+    min_year: Optional[int] = None,
+    max_year: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    conditions = []
+    for column, value in ((Bike.type, type), (Bike.transmission, transmission), (Bike.fuel_use, fuel_use)):
+        if value is not None:
+            conditions.append(column == value)
+    for column, low, high in (
+        (Bike.price_value, min_price, max_price),
+        (Bike.cc_value, min_cc, max_cc),
+        (Bike.year_value, min_year, max_year),
+    ):
+        if low is not None:
+            conditions.append(column >= low)
+        if high is not None:
+            conditions.append(column <= high)
+
+    stmt = _page_statement(select(Bike).where(*conditions), sort, order, cursor, limit)
+    bikes, next_cursor = _cut_page(db.execute(stmt).scalars().all(), sort, limit)
+    facets = _facet_counts(db, conditions)
+    return {
+        "items": _to_out(bikes),
+        "next_cursor": next_cursor,
+        "total": sum(facets["type"].values()),
+        "facets": facets,
+    }
+
+# Registered before /bikes/{slug}, so "search" can't be a slug (RESERVED_SLUGS)
+@router.get("/bikes/search", dependencies=[Depends(conditional_get("bikes"))])
+def search_bikes_text(
+    q: str = Query(..., min_length=1, max_length=200),
+    mode: str = Query("full", pattern="^(full|prefix)$"),   # prefix = typeahead, every word matched as a prefix
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db),
+):
+    bikes, total = search_bikes(db, q, prefix=(mode == "prefix"), limit=limit, offset=offset)
+    next_offset = offset + len(bikes) if offset + len(bikes) < total else None
+
+    if mode == "prefix":
+        # Just enough for a suggestion dropdown
+        items = [{"slug": b.slug, "name": b.name, "image": b.image, "type": b.type} for b in bikes]
+    else:
+        items = _to_out(bikes)
+    return {"items": items, "total": total, "next_offset": next_offset}
+
+@router.get("/bikes/{slug}", response_model=schemas.BikeOut, dependencies=[Depends(conditional_get("bikes"))])
+async def get_bike_by_slug(slug: str, db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        db_bike = (await db.execute(select(Bike).where(Bike.slug == slug))).scalars().first()
+        if not db_bike:
+            raise HTTPException(status_code=404, detail="Vehicle not found")
+        return schemas.BikeOut.model_validate(db_bike).model_dump()
+
+    # 404s raise out of the loader, so misses are never cached
+    return await read_cache.aget_or_load("bikes", slug, load)
 
 # PROTECTED: CREATE
 @router.post("/bikes", response_model=schemas.BikeOut, status_code=status.HTTP_201_CREATED)
@@ -25,6 +234,8 @@ def add_bike(
     db: Session = Depends(get_db), 
     admin: dict = Depends(get_current_admin)
 ):
+    if bike.slug in RESERVED_SLUGS:
+        raise HTTPException(status_code=400, detail=f"Vehicle slug '{bike.slug}' is reserved")
     # Ensure slug uniqueness
     if db.query(Bike).filter(Bike.slug == bike.slug).first():
         raise HTTPException(status_code=400, detail="Vehicle slug already exists")
@@ -34,6 +245,7 @@ def add_bike(
         db.add(new_bike)
         db.commit()
         db.refresh(new_bike)
+        notify_write("bikes", new_bike.slug)
         return new_bike
     except Exception as e:
         db.rollback()
@@ -50,6 +262,8 @@ def update_bike(
     db_bike = db.query(Bike).filter(Bike.slug == slug).first()
     if not db_bike:
         raise HTTPException(status_code=404, detail="Vehicle not found")
+    if bike_data.slug in RESERVED_SLUGS:
+        raise HTTPException(status_code=400, detail=f"Vehicle slug '{bike_data.slug}' is reserved")
 
     for key, value in bike_data.model_dump().items():
         setattr(db_bike, key, value)
@@ -57,6 +271,9 @@ def update_bike(
     try:
         db.commit()
         db.refresh(db_bike)
+        notify_write("bikes", slug)
+        if db_bike.slug != slug:
+            notify_write("bikes", db_bike.slug)
         return db_bike
     except Exception as e:
         db.rollback()
@@ -75,4 +292,5 @@ def delete_bike(
     
     db.delete(db_bike)
     db.commit()
+    notify_write("bikes", slug)
     return {"status": "success", "message": f"Deleted {slug}"}
\ No newline at end of file
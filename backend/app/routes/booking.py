@@ -1,20 +1,143 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import get_db
+from ..models.BikeModel import Bike
+from ..models.BookingModel import Booking
+from ..schemas import AdminSchemas as schemas
+from ..utils import get_current_admin
+from ..core.conditional import conditional_get
+from ..core.events import notify_write
+from ..core.mailer import enqueue_email, outbox
 
 router = APIRouter()
 
-# SMTP Configuration
-conf = ConnectionConfig(
-    MAIL_USERNAME = "sadakatulshakil94@gmail.com", 
-    MAIL_PASSWORD = "eqhpqqcbgqfzrsms",
-    MAIL_FROM = "sadakatulshakil94@gmail.com", # Setup for a verified sender email
-    MAIL_PORT = 587,
-    MAIL_SERVER = "smtp.gmail.com",
-    MAIL_STARTTLS = True,  # Use True here
-    MAIL_SSL_TLS = False,  # Use False here
-    USE_CREDENTIALS = True
+# SMTP settings live in core/mailer.py; mail goes out through the outbox
+# --- AVAILABILITY ENGINE ---
+def _active_overlapping(start_date: date, end_date: date, bike_id=Bike.id):
+    # Inclusive ranges overlap when each starts on/before the other ends.
+    # bike_id is either a plain id or Bike.id (correlated, for fleet-wide searches).
+    # Driven by ix_bookings_bike_end_start (or the GiST constraint index on Postgres).
+    return select(Booking.id).where(
+        Booking.bike_id == bike_id,
+        Booking.status != "cancelled",
+        Booking.end_date >= start_date,
+        Booking.start_date <= end_date,
+    )
+
+def _check_dates(start_date: date, end_date: date):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+
+def reserve_bike(db: Session, bike: Bike, data: dict) -> Booking:
+    """Inserts a booking unless it overlaps an active one for the same bike (409)."""
+    _check_dates(data["start_date"], data["end_date"])
+
+    # 1. Lock the bike row so concurrent requests for the same bike queue up here
+    db.query(Bike.id).filter(Bike.id == bike.id).with_for_update().first()
+
+    # 2. Overlap check + insert in the same transaction
+    clash = db.execute(_active_overlapping(data["start_date"], data["end_date"], bike.id)).first()
+    if clash:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Vehicle is already booked for those dates")
+
+    booking = Booking(bike_id=bike.id, **data)
+    db.add(booking)
+    try:
+        db.commit()
+    except IntegrityError:
+        # ex_bookings_no_overlap on Postgres caught a race the lock didn't
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Vehicle is already booked for those dates")
+    db.refresh(booking)
+    notify_write("bookings", str(bike.id))
+    return booking
+
+def reserve_first_free(db: Session, bikes: List[Bike], data: dict) -> Optional[Booking]:
+    """reserve_bike on each candidate in turn; None if every one is taken for those dates."""
+    for bike in bikes:
+        try:
+            return reserve_bike(db, bike, data)
+        except HTTPException as e:
+            if e.status_code != 409:
+                raise
+    return None
+
+@router.get(
+    "/admin/bookings/availability",
+    response_model=List[schemas.BikeOut],
+    dependencies=[Depends(conditional_get("bikes", "bookings"))],
 )
+def get_available_bikes(start_date: date, end_date: date, db: Session = Depends(get_db)):
+    _check_dates(start_date, end_date)
+    busy = _active_overlapping(start_date, end_date).exists()
+    return db.query(Bike).filter(~busy).order_by(Bike.id).all()
+
+@router.post("/admin/bookings", response_model=schemas.BookingOut, status_code=status.HTTP_201_CREATED)
+def create_booking(data: schemas.BookingCreate, db: Session = Depends(get_db)):
+    bike = db.query(Bike).filter(Bike.slug == data.bike_slug).first()
+    if not bike:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return reserve_bike(db, bike, data.model_dump(exclude={"bike_slug"}))
+
+# PROTECTED: LIST
+@router.get("/admin/bookings", response_model=List[schemas.BookingOut])
+def get_bookings(
+    bike_slug: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_cancelled: bool = False,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin)
+):
+    query = db.query(Booking)
+    if bike_slug:
+        query = query.join(Bike, Bike.id == Booking.bike_id).filter(Bike.slug == bike_slug)
+    if start_date:
+        query = query.filter(Booking.end_date >= start_date)
+    if end_date:
+        query = query.filter(Booking.start_date <= end_date)
+    if not include_cancelled:
+        query = query.filter(Booking.status != "cancelled")
+    return query.order_by(Booking.start_date.asc(), Booking.id.asc()).limit(limit).all()
+
+# PROTECTED: CONFIRM / CANCEL
+@router.put("/admin/bookings/{booking_id}/status", response_model=schemas.BookingOut)
+def update_booking_status(
+    booking_id: int,
+    new_status: str = Query(..., alias="status", pattern="^(pending|confirmed|cancelled)$"),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin)
+):
+    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    if booking.status == "cancelled" and new_status != "cancelled":
+        # Re-activating must go through the same overlap rules as a new booking
+        db.query(Bike.id).filter(Bike.id == booking.bike_id).with_for_update().first()
+        clash = db.execute(
+            _active_overlapping(booking.start_date, booking.end_date, booking.bike_id).where(Booking.id != booking.id)
+        ).first()
+        if clash:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Vehicle is already booked for those dates")
+
+    booking.status = new_status
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Vehicle is already booked for those dates")
+    db.refresh(booking)
+    notify_write("bookings", str(booking.bike_id))
+    return booking
 
 @router.post("/admin/bookings/send-mail")
 async def send_booking_mail(
@@ -28,12 +151,41 @@ async def send_booking_mail(
     hasCBT: str = Form(...),
     additionalInfo: Optional[str] = Form(None),
     license_front: Optional[UploadFile] = File(None),
-    license_back: Optional[UploadFile] = File(None)
+    license_back: Optional[UploadFile] = File(None),
+    db: Session = Depends(get_db)
 ):
+    # Persist the request against a bike first. The form sends the display name,
+    # which several bikes can share: the first free one gets the booking. If they're
+    # all taken (or the name is unknown) the lead is still emailed, clash flagged.
+    bikes = await run_in_threadpool(
+        lambda: db.query(Bike).filter(or_(Bike.name == motorcycle, Bike.slug == motorcycle)).order_by(Bike.id).all()
+    )
+    booking = None
+    if bikes:
+        try:
+            dates = {"start_date": date.fromisoformat(startDate), "end_date": date.fromisoformat(endDate)}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+        booking = await run_in_threadpool(reserve_first_free, db, bikes, {
+            **dates,
+            "customer_name": name,
+            "email": email,
+            "phone": phone,
+            "license_type": licenseType,
+            "has_cbt": hasCBT,
+            "notes": additionalInfo,
+        })
+    clash = bool(bikes) and booking is None
+    clash_note = (
+        '<p style="color: #dc2626;"><b>Already booked:</b> every matching vehicle is taken for these dates. '
+        "The request was not reserved.</p>" if clash else ""
+    )
+
     html = f"""
     <div style="font-family: Arial; padding: 20px; border: 1px solid #eee;">
         <h2 style="color: #2563eb;">New ARP Motors Booking Request</h2>
         <hr/>
+        {clash_note}
         <p><b>Vehicle:</b> {motorcycle}</p>
         <p><b>Dates:</b> {startDate} to {endDate}</p>
         <p><b>Customer:</b> {name} ({email})</p>
@@ -43,21 +195,16 @@ async def send_booking_mail(
     </div>
     """
 
-    # Prepare attachments
+    # Prepare attachments (stored with the message so retries can resend them)
     attachments = []
     for f in [license_front, license_back]:
         if f:
-            # We must read content for fastapi-mail
-            attachments.append(f)
-
-    message = MessageSchema(
-        subject=f"RENTAL REQUEST: {motorcycle} - {name}",
-        recipients=["arperves@gmail.com"], # Set up for recipients email
-        body=html,
-        subtype="html",
-        attachments=attachments
-    )
+            attachments.append((f.filename or "attachment", f.content_type, await f.read()))
 
-    fm = FastMail(conf)
-    await fm.send_message(message)
-    return {"status": "Email Sent"}
\ No newline at end of file
+    # Queue it; the outbox worker does the SMTP part in the background
+    await run_in_threadpool(
+        enqueue_email, db, "booking", f"{'CLASH - ' if clash else ''}RENTAL REQUEST: {motorcycle} - {name}", html,
+        attachments=attachments,
+    )
+    outbox.wake()
+    return {"status": "Email Queued", "booking_id": booking.id if booking else None, "clash": clash}
\ No newline at end of file
@@ -1,48 +1,80 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 from typing import List
-from ..database import get_db, engine
+from ..database import get_db
 from ..models.ChatBotModel import ChatOption
-from ..schemas.AdminSchemas import ChatOptionOut, ChatOptionCreate
+from ..schemas.AdminSchemas import ChatOptionOut, ChatOptionCreate, ChatAnswerOut
+from ..core.events import notify_write
+from ..core.settings_store import settings_store
+from ..core.chat_index import chat_answerer
+from ..core.conditional import conditional_get
 
 router = APIRouter(prefix="/admin/chatbot", tags=["Chatbot"])
 
-# Create table if it doesn't exist
-ChatOption.metadata.create_all(bind=engine)
-
-@router.get("/options", response_model=List[ChatOptionOut])
-def get_chat_options(db: Session = Depends(get_db)):
-    options = db.query(ChatOption).all()
-    if not options:
-        # Create a default option if none exist
-        default_opt = ChatOption(
-            label="Pricing",
-            icon_name="PoundSterling",
-            reply_text="Our rentals start from £40 per day. Long-term deals available!"
-        )
-        db.add(default_opt)
-        db.commit()
-        db.refresh(default_opt)
-        return [default_opt]
-    return options
+@router.get("/options", response_model=List[ChatOptionOut], dependencies=[Depends(conditional_get("chatbot"))])
+def get_chat_options():
+    # Served from the settings store (the starter "Pricing" option is only seeded into a new table)
+    return settings_store.get("chatbot")
+
+@router.get("/answer", response_model=ChatAnswerOut)
+def answer_question(q: str = Query(..., min_length=1, max_length=500)):
+    # Typed questions: best match from the in-memory BM25 index (core/chat_index.py)
+    return chat_answerer.answer(q)
+
+def _diff_options(existing: List[ChatOption], data: List[ChatOptionCreate]):
+    """Matches the submitted list against the current rows (by id, then by label).
+    Returns (inserts, updates, delete_ids); list order becomes `position`."""
+    by_id = {o.id: o for o in existing}
+    by_label = {}
+    for o in existing:
+        by_label.setdefault(o.label, []).append(o)
+
+    matched, inserts, updates = set(), [], []
+    for position, item in enumerate(data):
+        values = {"label": item.label, "icon_name": item.icon_name, "reply_text": item.reply_text, "position": position}
+        row = by_id.get(item.id) if item.id is not None else None
+        if row is None or row.id in matched:
+            row = next((o for o in by_label.get(item.label, []) if o.id not in matched), None)
+        if row is None:
+            inserts.append(values)
+            continue
+        matched.add(row.id)
+        if any(getattr(row, k) != v for k, v in values.items()):
+            updates.append({"id": row.id, **values})
+
+    delete_ids = [o.id for o in existing if o.id not in matched]
+    return inserts, updates, delete_ids
 
 @router.put("/options/bulk")
 def update_chatbot_options(data: List[ChatOptionCreate], db: Session = Depends(get_db)):
     try:
-        # 1. Clear the current options
-        db.query(ChatOption).delete()
-        
-        # 2. Add the new ones from the list
-        for item in data:
-            new_opt = ChatOption(
-                label=item.label,
-                icon_name=item.icon_name,
-                reply_text=item.reply_text
-            )
-            db.add(new_opt)
-        
+        # 1. Diff against what's there (rows locked so two saves can't interleave)
+        existing = db.query(ChatOption).with_for_update().all()
+        inserts, updates, delete_ids = _diff_options(existing, data)
+
+        # 2. Apply as three batched statements in one transaction; ids of kept options don't change
+        if delete_ids:
+            db.execute(delete(ChatOption).where(ChatOption.id.in_(delete_ids)))
+        if updates:
+            db.execute(update(ChatOption), updates)
+        if inserts:
+            db.execute(insert(ChatOption), inserts)
         db.commit()
-        return {"message": "Chatbot options updated successfully"}
+
+        options = [
+            ChatOptionOut.model_validate(o).model_dump()
+            for o in db.query(ChatOption).order_by(ChatOption.position.asc(), ChatOption.id.asc()).all()
+        ]
+        settings_store.put("chatbot", options)
+        notify_write("chatbot")
+        return {
+            "message": "Chatbot options updated successfully",
+            "inserted": len(inserts),
+            "updated": len(updates),
+            "deleted": len(delete_ids),
+            "options": options,
+        }
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=f"Failed to update chatbot: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to update chatbot: {str(e)}")
@@ -1,28 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..models.ContactModel import ContactInfo, ContactField
 from ..schemas.AdminSchemas import (
     ContactInfoBase, ContactFieldCreate, ContactFieldOut, ContactInfoOut
 )
 from ..utils import get_current_admin  # 🛡️ Protection
+from ..core.cache import read_cache
+from ..core.conditional import conditional_get
+from ..core.events import notify_write
+from ..core.settings_store import settings_store
+from ..core.upsert import upsert
 
 router = APIRouter(prefix="/admin/contact", tags=["Contact Management"])
 
 # --- CONTACT INFO ---
-@router.get("/info", response_model=ContactInfoOut)
-def get_contact_info(db: Session = Depends(get_db)):
-    info = db.query(ContactInfo).first()
-    if not info:
-        info = ContactInfo(
-            address="Set Your Address", phone="000", email="admin@site.com", 
-            latitude=0.0, longitude=0.0
-        )
-        db.add(info)
-        db.commit()
-        db.refresh(info)
-    return info
+@router.get("/info", response_model=ContactInfoOut, dependencies=[Depends(conditional_get("contact_info"))])
+def get_contact_info():
+    # Served from the settings store (placeholder record is seeded at startup)
+    return settings_store.get("contact_info")
 
 @router.put("/info", response_model=ContactInfoOut)
 def update_contact_info(
@@ -30,29 +29,32 @@ def update_contact_info(
     db: Session = Depends(get_db),
     admin: dict = Depends(get_current_admin)
 ):
-    info = db.query(ContactInfo).first()
-    if not info:
-        raise HTTPException(status_code=404, detail="Info record missing")
-    
     update_data = data.model_dump() # Pydantic v2
-    for key, value in update_data.items():
-        if (key in ["latitude", "longitude"]) and (value is None or value == ""):
-            value = 0.0
-        setattr(info, key, value)
+    for key in ["latitude", "longitude"]:
+        if update_data[key] is None or update_data[key] == "":
+            update_data[key] = 0.0
     
     try:
+        row = upsert(db, ContactInfo, {"id": settings_store.singleton_id("contact_info"), **update_data}, ["id"])
         db.commit()
-        db.refresh(info)
-        return info
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database update failed")
 
+    info = ContactInfoOut.model_validate(row).model_dump()
+    settings_store.put("contact_info", info)
+    notify_write("contact_info")
+    return info
+
 # --- FORM FIELDS ---
 
-@router.get("/fields", response_model=List[ContactFieldOut])
-def get_fields(db: Session = Depends(get_db)):
-    return db.query(ContactField).order_by(ContactField.id.asc()).all()
+@router.get("/fields", response_model=List[ContactFieldOut], dependencies=[Depends(conditional_get("contact_fields"))])
+async def get_fields(db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        rows = (await db.execute(select(ContactField).order_by(ContactField.id.asc()))).scalars().all()
+        return [ContactFieldOut.model_validate(f).model_dump() for f in rows]
+
+    return await read_cache.aget_or_load("contact_fields", None, load)
 
 @router.post("/fields", response_model=ContactFieldOut, status_code=status.HTTP_201_CREATED)
 def add_field(
@@ -64,6 +66,7 @@ def add_field(
     db.add(new_field)
     db.commit()
     db.refresh(new_field)
+    notify_write("contact_fields")
     return new_field
 
 @router.put("/fields/{field_id}", response_model=ContactFieldOut)
@@ -82,6 +85,7 @@ def update_field(
         
     db.commit()
     db.refresh(field)
+    notify_write("contact_fields")
     return field
 
 @router.delete("/fields/{field_id}")
@@ -95,4 +99,5 @@ def delete_field(
         raise HTTPException(status_code=404, detail="Field not found")
     db.delete(field)
     db.commit()
+    notify_write("contact_fields")
     return {"message": "Field deleted"}
\ No newline at end of file
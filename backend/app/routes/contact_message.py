@@ -1,24 +1,15 @@
-from fastapi import APIRouter, Request, HTTPException
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-from pydantic import EmailStr
-import os
+from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..core.mailer import enqueue_email, outbox
 
 router = APIRouter()
 
-# SMTP Configuration
-contact_conf= ConnectionConfig(
-    MAIL_USERNAME = "sadakatulshakil94@gmail.com", 
-    MAIL_PASSWORD = "eqhpqqcbgqfzrsms",
-    MAIL_FROM = "sadakatulshakil94@gmail.com",
-    MAIL_PORT = 587,
-    MAIL_SERVER = "smtp.gmail.com",
-    MAIL_STARTTLS = True,
-    MAIL_SSL_TLS = False,
-    USE_CREDENTIALS = True
-)
+# SMTP settings live in core/mailer.py; mail goes out through the outbox
 
 @router.post("/admin/contact/send-mail")
-async def send_contact_mail(request: Request):
+async def send_contact_mail(request: Request, db: Session = Depends(get_db)):
     try:
         # 1. Get the dynamic JSON data from the Contact Page
         data = await request.json()
@@ -52,20 +43,14 @@ async def send_contact_mail(request: Request):
         </div>
         """
 
-        # 3. Create the message
-        message = MessageSchema(
-            subject="New Website Inquiry - ARP Motors",
-            recipients=["arperves@gmail.com"], # Your receiving email
-            body=html,
-            subtype="html"
-        )
-
-        # 4. Send the mail
-        fm = FastMail(contact_conf)
-        await fm.send_message(message)
+        # 3. Queue the message; the outbox worker sends (and retries) it in the background
+        await run_in_threadpool(enqueue_email, db, "contact", "New Website Inquiry - ARP Motors", html)
+        outbox.wake()
         
         return {"status": "success", "message": "Inquiry sent successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"MAIL ERROR: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
\ No newline at end of file
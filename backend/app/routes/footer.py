@@ -1,32 +1,29 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
 from sqlalchemy.orm import Session
 from app.database import get_db
-from ..utils import upload_image_to_cloud
+from ..core.uploads import upload_to_cloud
 from ..models.FooterModel import Footer
+from ..core.events import notify_write
+from ..core.settings_store import settings_store
+from ..core.upsert import upsert
+from ..core.conditional import conditional_get
 from ..schemas.AdminSchemas import FooterSettingsUpdate, FooterSettingsRead
 import os
 import shutil 
 
 router = APIRouter(prefix="/admin", tags=["Footer Settings"])
 
-@router.get("/footer", response_model=FooterSettingsRead)
-def get_footer_settings(db: Session = Depends(get_db)):
-    settings = db.query(Footer).first()
-    if not settings:
-        # Create default entry if none exists
-        new_settings = Footer(site_title="ARP MOTORS")
-        db.add(new_settings)
-        db.commit()
-        db.refresh(new_settings)
-        return new_settings
-    return settings
+@router.get("/footer", response_model=FooterSettingsRead, dependencies=[Depends(conditional_get("footer"))])
+def get_footer_settings():
+    # Served from the settings store (default entry is seeded at startup)
+    return settings_store.get("footer")
 
 @router.put("/footer/upload-logo")
 async def upload_footer_logo(file: UploadFile = File(...)):
     try:
         # 1. Use your utility function (ensure it's imported)
-        # Assuming upload_image_to_cloud is in your utils
-        cloud_url = upload_image_to_cloud(file.file)
+        # upload_to_cloud wraps utils.upload_image_to_cloud
+        cloud_url = await upload_to_cloud(file.file)  # runs on the upload pool, not the event loop
         
         # 2. Check if the upload was successful
         if not cloud_url:
@@ -42,15 +39,11 @@ async def upload_footer_logo(file: UploadFile = File(...)):
 
 @router.put("/footer", response_model=FooterSettingsRead)
 def update_footer_settings(obj_in: FooterSettingsUpdate, db: Session = Depends(get_db)):
-    settings = db.query(Footer).first()
-    if not settings:
-        raise HTTPException(status_code=404, detail="Settings not found")
-    
-    update_data = obj_in.dict(exclude_unset=True)
-    for field in update_data:
-        setattr(settings, field, update_data[field])
-    
-    db.add(settings)
+    update_data = obj_in.model_dump(exclude_unset=True)
+    row = upsert(db, Footer, {"id": settings_store.singleton_id("footer"), **update_data}, ["id"])
     db.commit()
-    db.refresh(settings)
-    return settings
\ No newline at end of file
+
+    settings = FooterSettingsRead.model_validate(row).model_dump()
+    settings_store.put("footer", settings)
+    notify_write("footer")
+    return settings
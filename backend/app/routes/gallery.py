@@ -1,16 +1,31 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..models.GalleryModel import Gallery
-from ..schemas.AdminSchemas import GalleryOut 
-from ..utils import get_current_admin, upload_image_to_cloud # 🛡️ Use your cloud helper
+from ..schemas.AdminSchemas import GalleryOut, GalleryBatchOut
+from ..utils import get_current_admin # 🛡️
+from ..core.cache import read_cache
+from ..core.compression import json_bodies
+from ..core.conditional import conditional_get
+from ..core.events import notify_write
+from ..core.uploads import upload_to_cloud, upload_many, UPLOAD_BATCH_MAX_FILES
 
 router = APIRouter(prefix="/admin/gallery", tags=["Gallery"])
 
-@router.get("/", response_model=List[GalleryOut])
-def get_gallery(db: Session = Depends(get_db)):
-    return db.query(Gallery).all()
+@router.get("/", response_model=List[GalleryOut], dependencies=[Depends(conditional_get("gallery"))])
+async def get_gallery(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        rows = (await db.execute(select(Gallery))).scalars().all()
+        return [GalleryOut.model_validate(g).model_dump() for g in rows]
+
+    # Serialized (and gzip/br) bytes are kept per gallery version and replayed
+    return await json_bodies.aresponse(
+        request, response, "gallery", None, lambda: read_cache.aget_or_load("gallery", None, load)
+    )
 
 @router.post("/upload", response_model=GalleryOut, status_code=status.HTTP_201_CREATED)
 async def upload_gallery_image(
@@ -19,23 +34,64 @@ async def upload_gallery_image(
     db: Session = Depends(get_db),
     admin: dict = Depends(get_current_admin) # 🔒 Protected
 ):
+    # 1. Upload to Cloudinary on the upload pool (keeps the event loop free)
+    image_url = await upload_to_cloud(file.file)
+    if not image_url:
+        raise HTTPException(status_code=500, detail="Gallery upload failed: Cloudinary upload failed")
+
+    # 2. Save the Cloudinary URL to the database
     try:
-        # 1. Upload to Cloudinary instead of local folder
-        image_url = upload_image_to_cloud(file.file)
-        
-        if not image_url:
-            raise HTTPException(status_code=500, detail="Cloudinary upload failed")
-        
-        # 2. Save the Cloudinary URL to the database
-        new_item = Gallery(image=image_url, description=description)
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-        
-        return new_item
+        [new_item] = await run_in_threadpool(_save_items, db, [image_url], description)
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Gallery upload failed: {str(e)}")
+    return new_item
+
+@router.post("/upload/batch", response_model=GalleryBatchOut)
+async def upload_gallery_batch(
+    description: str = None,
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_current_admin) # 🔒 Protected
+):
+    if len(files) > UPLOAD_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {UPLOAD_BATCH_MAX_FILES} files per batch")
+
+    # 1. Upload concurrently (bounded); one failed file doesn't sink the rest
+    urls = await upload_many([f.file for f in files])
+
+    # 2. One transaction for every file that made it
+    save_error = None
+    try:
+        items = iter(await run_in_threadpool(_save_items, db, [u for u in urls if u], description))
+    except Exception as e:
+        # The files are on Cloudinary already: report their URLs so nothing has to be re-uploaded blind
+        save_error = f"Saving to the gallery failed: {str(e)}"
+
+    results = []
+    for f, url in zip(files, urls):
+        if not url:
+            results.append({"filename": f.filename, "ok": False, "error": "Cloudinary upload failed"})
+        elif save_error:
+            results.append({"filename": f.filename, "ok": False, "url": url, "error": save_error})
+        else:
+            results.append({"filename": f.filename, "ok": True, "item": next(items)})
+    uploaded = sum(1 for r in results if r["ok"])
+    return {"uploaded": uploaded, "failed": len(results) - uploaded, "results": results}
+
+def _save_items(db: Session, urls: List[str], description: str = None):
+    if not urls:
+        return []
+    items = [Gallery(image=url, description=description) for url in urls]
+    try:
+        db.add_all(items)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    for item in items:
+        db.refresh(item)
+    notify_write("gallery")
+    return [GalleryOut.model_validate(item) for item in items]
 
 @router.delete("/{image_id}")
 def delete_gallery_image(
@@ -50,4 +106,5 @@ def delete_gallery_image(
     # We delete from DB. (Optional: You could also call cloudinary.uploader.destroy here)
     db.delete(item)
     db.commit()
+    notify_write("gallery")
     return {"message": "Gallery item removed"}
\ No newline at end of file
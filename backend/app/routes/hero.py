@@ -1,17 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..models.HeroModel import HeroSlide
 from ..schemas.AdminSchemas import HeroSlideBase, HeroSlideOut
 from ..utils import get_current_admin
+from ..core.cache import read_cache
+from ..core.conditional import conditional_get
+from ..core.events import notify_write
 
 router = APIRouter(prefix="/admin/hero", tags=["Hero Slider"])
 
 # Public/Admin GET: Anyone can view the slides (usually needed for the homepage)
-@router.get("/slides", response_model=List[HeroSlideOut])
-def get_slides(db: Session = Depends(get_db)):
-    return db.query(HeroSlide).order_by(HeroSlide.order.asc()).all()
+@router.get("/slides", response_model=List[HeroSlideOut], dependencies=[Depends(conditional_get("hero"))])
+async def get_slides(db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        rows = (await db.execute(_slides_statement())).scalars().all()
+        return [HeroSlideOut.model_validate(s).model_dump() for s in rows]
+
+    return await read_cache.aget_or_load("hero", None, load)
+
+def _slides_statement():
+    return select(HeroSlide).order_by(HeroSlide.order.asc())
+
+# Sync twin of get_slides (used by the site snapshot)
+def load_slides(db: Session):
+    return read_cache.get_or_load("hero", None, lambda: [
+        HeroSlideOut.model_validate(s).model_dump() for s in db.execute(_slides_statement()).scalars().all()
+    ])
 
 # PROTECTED: Add Slide
 @router.post("/slides", response_model=HeroSlideOut, status_code=status.HTTP_201_CREATED)
@@ -25,6 +43,7 @@ def add_slide(
         db.add(new_slide)
         db.commit()
         db.refresh(new_slide)
+        notify_write("hero")
         return new_slide
     except Exception as e:
         db.rollback()
@@ -50,6 +69,7 @@ def update_slide(
     try:
         db.commit()
         db.refresh(slide)
+        notify_write("hero")
         return slide
     except Exception as e:
         db.rollback()
@@ -69,6 +89,7 @@ def delete_slide(
     try:
         db.delete(slide)
         db.commit()
+        notify_write("hero")
         return {"message": f"Slide {slide_id} successfully deleted"}
     except Exception as e:
         db.rollback()
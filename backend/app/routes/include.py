@@ -1,16 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..models.IncludeModel import Feature, Policy
 from ..schemas.AdminSchemas import FeatureCreate, FeatureOut, PolicyCreate, PolicyOut
 from ..utils import get_current_admin 
+from ..core.cache import read_cache
+from ..core.conditional import conditional_get
+from ..core.events import notify_write
 
 router = APIRouter(prefix="/admin/include", tags=["Include"])
 
 # --- FEATURES API ---
-@router.get("/features", response_model=list[FeatureOut])
-def get_features(db: Session = Depends(get_db)):
-    return db.query(Feature).all()
+@router.get("/features", response_model=list[FeatureOut], dependencies=[Depends(conditional_get("features"))])
+async def get_features(db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        rows = (await db.execute(select(Feature))).scalars().all()
+        return [FeatureOut.model_validate(f).model_dump() for f in rows]
+
+    return await read_cache.aget_or_load("features", None, load)
+
+# Sync twin of get_features (used by the site snapshot)
+def load_features(db: Session):
+    return read_cache.get_or_load("features", None, lambda: [
+        FeatureOut.model_validate(f).model_dump() for f in db.query(Feature).all()
+    ])
 
 @router.post("/features", response_model=FeatureOut, status_code=status.HTTP_201_CREATED)
 def add_feature(data: FeatureCreate, db: Session = Depends(get_db), admin: dict = Depends(get_current_admin)):
@@ -18,6 +33,7 @@ def add_feature(data: FeatureCreate, db: Session = Depends(get_db), admin: dict
     db.add(new_feat)
     db.commit()
     db.refresh(new_feat)
+    notify_write("features")
     return new_feat
 
 @router.put("/features/{id}", response_model=FeatureOut)
@@ -29,6 +45,7 @@ def update_feature(id: int, data: FeatureCreate, db: Session = Depends(get_db),
         setattr(feature, key, value)
     db.commit()
     db.refresh(feature)
+    notify_write("features")
     return feature
 
 @router.delete("/features/{id}")
@@ -38,12 +55,23 @@ def delete_feature(id: int, db: Session = Depends(get_db), admin: dict = Depends
         raise HTTPException(status_code=404, detail="Feature not found")
     db.delete(feature)
     db.commit()
+    notify_write("features")
     return {"message": "Feature removed"}
 
 # --- POLICIES API ---
-@router.get("/policies", response_model=list[PolicyOut])
-def get_policies(db: Session = Depends(get_db)):
-    return db.query(Policy).all()
+@router.get("/policies", response_model=list[PolicyOut], dependencies=[Depends(conditional_get("policies"))])
+async def get_policies(db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        rows = (await db.execute(select(Policy))).scalars().all()
+        return [PolicyOut.model_validate(p).model_dump() for p in rows]
+
+    return await read_cache.aget_or_load("policies", None, load)
+
+# Sync twin of get_policies (used by the site snapshot)
+def load_policies(db: Session):
+    return read_cache.get_or_load("policies", None, lambda: [
+        PolicyOut.model_validate(p).model_dump() for p in db.query(Policy).all()
+    ])
 
 @router.post("/policies", response_model=PolicyOut, status_code=status.HTTP_201_CREATED)
 def add_policy(data: PolicyCreate, db: Session = Depends(get_db), admin: dict = Depends(get_current_admin)):
@@ -51,6 +79,7 @@ def add_policy(data: PolicyCreate, db: Session = Depends(get_db), admin: dict =
     db.add(new_policy)
     db.commit()
     db.refresh(new_policy)
+    notify_write("policies")
     return new_policy
 
 @router.put("/policies/{id}", response_model=PolicyOut)
@@ -62,6 +91,7 @@ def update_policy(id: int, data: PolicyCreate, db: Session = Depends(get_db), ad
         setattr(policy, key, value)
     db.commit()
     db.refresh(policy)
+    notify_write("policies")
     return policy
 
 @router.delete("/policies/{id}")
@@ -71,4 +101,5 @@ def delete_policy(id: int, db: Session = Depends(get_db), admin: dict = Depends(
         raise HTTPException(status_code=404, detail="Policy not found")
     db.delete(policy)
     db.commit()
+    notify_write("policies")
     return {"message": "Policy card removed"}
\ No newline at end of file
@@ -1,46 +1,28 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from ..database import get_db, engine
+from ..database import get_db
 from ..models.ContentModel import PageMeta
 from ..schemas import AdminSchemas as schemas
+from ..core.conditional import conditional_get
+from ..core.events import notify_write
+from ..core.settings_store import settings_store
+from ..core.upsert import upsert
 
 router = APIRouter(prefix="/admin/meta", tags=["Universal Meta"])
 
-PageMeta.metadata.create_all(bind=engine)
-
-@router.get("/{page_key}", response_model=schemas.PageMetaOut)
-def get_meta(page_key: str, db: Session = Depends(get_db)):
-    meta = db.query(PageMeta).filter(PageMeta.page_key == page_key).first()
-    
-    if not meta:
-        # Create it in the DB immediately so it has a permanent record
-        meta = PageMeta(
-            page_key=page_key,
-            header_title=f"{page_key.capitalize()} Title",
-            header_image="",
-            header_description="",
-            page_title="",
-            page_subtitle=""
-        )
-        db.add(meta)
-        db.commit()
-        db.refresh(meta)
-        
-    return meta
+@router.get("/{page_key}", response_model=schemas.PageMetaOut, dependencies=[Depends(conditional_get("meta"))])
+def get_meta(page_key: str):
+    # Saved pages come from the settings store; unsaved ones get the default
+    # header without writing a row on a GET
+    return settings_store.get_meta(page_key)
 
 @router.put("/{page_key}")
 def update_meta(page_key: str, data: schemas.PageMetaBase, db: Session = Depends(get_db)):
-    meta = db.query(PageMeta).filter(PageMeta.page_key == page_key).first()
-    
     # model_dump() is correct for Pydantic V2
-    update_data = data.model_dump()
-    
-    if not meta:
-        meta = PageMeta(page_key=page_key, **update_data)
-        db.add(meta)
-    else:
-        for key, value in update_data.items():
-            setattr(meta, key, value)
-            
+    # INSERT ... ON CONFLICT (page_key) DO UPDATE: no read-then-write race on the first save
+    row = upsert(db, PageMeta, {"page_key": page_key, **data.model_dump()}, ["page_key"])
     db.commit()
-    return {"message": f"Updated {page_key} meta successfully"}
\ No newline at end of file
+
+    settings_store.put_meta(page_key, schemas.PageMetaOut.model_validate(row).model_dump())
+    notify_write("meta", page_key)
+    return {"message": f"Updated {page_key} meta successfully"}
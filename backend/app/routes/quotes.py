@@ -0,0 +1,36 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..core.conditional import conditional_get
+from ..core.quotes import get_fleet, quote_fleet
+
+router = APIRouter(prefix="/admin/quotes", tags=["Quotes"])
+
+# Longest rental we price in one go (keeps the per-request work bounded)
+MAX_RENTAL_DAYS = 366
+
+@router.get("/", dependencies=[Depends(conditional_get("bikes"))])
+def get_quotes(
+    start_date: date,
+    end_date: date,
+    km: Optional[float] = Query(None, ge=0),
+    slugs: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db),
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+
+    # Same-day return still counts as one rental day
+    rental_days = max(1, (end_date - start_date).days)
+    if rental_days > MAX_RENTAL_DAYS:
+        raise HTTPException(status_code=400, detail=f"Rentals longer than {MAX_RENTAL_DAYS} days need a custom quote")
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "days": rental_days,
+        "km": km,
+        "quotes": quote_fleet(get_fleet(db), rental_days, km, slugs),
+    }
@@ -0,0 +1,83 @@
+import threading
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from ..core.events import subscribe
+from ..core.conditional import conditional_get
+from ..schemas import AdminSchemas as schemas
+from ..core.settings_store import settings_store
+from . import hero, include
+
+router = APIRouter(prefix="/site", tags=["Site Snapshot"])
+
+# Everything the public layout needs on every page
+SHARED_RESOURCES = {"hero", "footer", "about", "features", "policies", "contact_info", "chatbot"}
+
+_lock = threading.Lock()
+_generation = 0      # bumped on every relevant write so an in-flight build can't store stale data
+_shared = None       # cached dict for SHARED_RESOURCES
+_pages = {}          # page_key -> cached PageMeta dict
+
+@subscribe
+def _on_write(resource: str, key: Optional[str] = None):
+    global _generation, _shared
+    if resource not in SHARED_RESOURCES and resource != "meta":
+        return
+    with _lock:
+        _generation += 1
+        if resource == "meta":
+            if key is None:
+                _pages.clear()
+            else:
+                _pages.pop(key, None)
+        else:
+            _shared = None
+
+def _dump(schema, rows):
+    return [schema.model_validate(r).model_dump() for r in rows]
+
+def _build_shared(db: Session):
+    # Settings records come from the settings store; lists reuse the router loaders
+    return {
+        "hero_slides": _dump(schemas.HeroSlideOut, hero.load_slides(db)),
+        "footer": settings_store.get("footer"),
+        "about": settings_store.get("about"),
+        "features": _dump(schemas.FeatureOut, include.load_features(db)),
+        "policies": _dump(schemas.PolicyOut, include.load_policies(db)),
+        "contact_info": settings_store.get("contact_info"),
+        "chat_options": settings_store.get("chatbot"),
+    }
+
+def _get_shared(db: Session):
+    global _shared
+    with _lock:
+        cached, generation = _shared, _generation
+    if cached is not None:
+        return cached
+
+    built = _build_shared(db)
+    with _lock:
+        if generation == _generation:
+            _shared = built
+    return built
+
+def _get_page(page_key: str):
+    with _lock:
+        cached, generation = _pages.get(page_key), _generation
+    if cached is not None:
+        return cached
+
+    built = settings_store.get_meta(page_key)
+    with _lock:
+        if generation == _generation:
+            _pages[page_key] = built
+    return built
+
+@router.get("/snapshot", dependencies=[Depends(conditional_get(*SHARED_RESOURCES, "meta"))])
+def get_site_snapshot(page: Optional[str] = None, db: Session = Depends(get_db)):
+    # The session only connects if one of the parts actually needs rebuilding
+    snapshot = dict(_get_shared(db))
+    if page:
+        snapshot["meta"] = _get_page(page)
+    return snapshot
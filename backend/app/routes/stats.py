@@ -1,18 +1,39 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from typing import List
 from app.database import get_db
-from app.models.BikeModel import Bike
-from app.models.GalleryModel import Gallery
-from app.models.HeroModel import HeroSlide
-from app.models.AdminUser import AdminUser
+from app.core import activity
+from app.core.cache import read_cache
+from app.core.compression import json_bodies
+from app.core.pool_metrics import pool_stats
 
 router = APIRouter(prefix="/admin/stats", tags=["Dashboard"])
 
 @router.get("/")
 def get_dashboard_stats(db: Session = Depends(get_db)):
-    return {
-        "total_bikes": db.query(Bike).count(),
-        "gallery_images": db.query(Gallery).count(),
-        "hero_slides": db.query(HeroSlide).count(),
-        "total_admins": db.query(AdminUser).count(),
-    }
\ No newline at end of file
+    # Write-maintained counters (one primary-key read) plus a COUNT(*) of the tiny admin table
+    return activity.counters(db)
+
+@router.get("/activity")
+def get_activity(
+    metric: List[str] = Query(list(activity.METRICS)),
+    bucket: str = Query("day", pattern="^(day|week)$"),
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+):
+    # Bookings / inquiries / uploads over time, from the activity_rollup table
+    unknown = set(metric) - set(activity.METRICS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown metric(s): {', '.join(sorted(unknown))}")
+    return {"bucket": bucket, "days": days, "series": activity.series(db, metric, days, bucket)}
+
+@router.get("/cache")
+def get_cache_stats():
+    # Hit/miss/eviction counters for sizing READ_CACHE_* settings,
+    # plus the ready-made JSON bodies kept for the big list endpoints
+    return {**read_cache.stats(), "json_bodies": json_bodies.stats()}
+
+@router.get("/db-pool")
+def get_db_pool_stats():
+    # Checked-out / idle / overflow connections and checkout wait, per engine
+    return pool_stats()
\ No newline at end of file
@@ -1,3 +1,4 @@
+from datetime import date, datetime
 from pydantic import BaseModel
 from typing import List, Optional
 
@@ -47,6 +48,11 @@ class BikeCreate(BikeBase):
 
 class BikeOut(BikeBase):
     id: int
+    # Numeric copies of price / cc / topSpeed / year_mf (read-only)
+    price_value: Optional[float] = None
+    cc_value: Optional[int] = None
+    top_speed_value: Optional[float] = None
+    year_value: Optional[int] = None
     class Config:
         from_attributes = True # Allows Pydantic to read SQLAlchemy models
     id: int
@@ -64,6 +70,18 @@ class GalleryOut(GalleryBase):
     id: int
     class Config:
         from_attributes = True      
+
+class GalleryUploadResult(BaseModel):
+    filename: Optional[str] = None
+    ok: bool
+    item: Optional[GalleryOut] = None
+    url: Optional[str] = None  # set when the file was uploaded but not saved to the gallery
+    error: Optional[str] = None
+
+class GalleryBatchOut(BaseModel):
+    uploaded: int
+    failed: int
+    results: List[GalleryUploadResult]
         
 # --- ABOUT SCHEMAS ---
 class AboutBase(BaseModel):
@@ -185,10 +203,51 @@ class ChatOptionBase(BaseModel):
     reply_text: str
 
 class ChatOptionCreate(ChatOptionBase):
-    pass
+    id: Optional[int] = None    # existing option to keep/update; without it the label is used to match
 
 class ChatOptionOut(ChatOptionBase):
     id: int
+    position: int = 0
+
+    class Config:
+        from_attributes = True
+
+class ChatMatchOut(BaseModel):
+    kind: str       # options, bikes, policies, features
+    ref: str        # option/policy/feature id or bike slug
+    title: str
+    answer: str
+    score: float
+
+class ChatAnswerOut(BaseModel):
+    answer: Optional[str] = None    # None: nothing relevant, fall back to the contact form
+    match: Optional[ChatMatchOut] = None
+    alternatives: List[ChatMatchOut] = []
+# --- BOOKING SCHEMAS ---
+class BookingCreate(BaseModel):
+    bike_slug: str
+    start_date: date
+    end_date: date
+    customer_name: str
+    email: str
+    phone: Optional[str] = None
+    license_type: Optional[str] = None
+    has_cbt: Optional[str] = None
+    notes: Optional[str] = None
+
+class BookingOut(BaseModel):
+    id: int
+    bike_id: int
+    start_date: date
+    end_date: date
+    status: str
+    customer_name: str
+    email: str
+    phone: Optional[str] = None
+    license_type: Optional[str] = None
+    has_cbt: Optional[str] = None
+    notes: Optional[str] = None
+    created_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
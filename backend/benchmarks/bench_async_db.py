@@ -0,0 +1,125 @@
+"""
+Sync vs async database path under concurrency.
+
+Serves the same uncached query two ways from one FastAPI app:
+  /sync   def handler + get_db()             (runs on Starlette's threadpool, 40 threads)
+  /async  async def handler + get_async_db() (runs on the event loop)
+and fires a fixed number of requests at each, at several concurrency levels.
+
+    cd backend
+    python benchmarks/bench_async_db.py                      # throwaway SQLite file
+    DATABASE_URL=postgresql://... python benchmarks/bench_async_db.py --db-latency-ms 5
+
+--db-latency-ms adds pg_sleep() to each query (Postgres only) to mimic a remote
+database like Neon, which is where the threadpool limit actually shows.
+Needs httpx (pip install -r requirements-dev.txt).
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per run")
+    parser.add_argument("--concurrency", default="10,50,100,200", help="comma separated levels")
+    parser.add_argument("--bikes", type=int, default=50, help="rows to seed when the bikes table is empty")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="extra per-query latency (Postgres only)")
+    return parser.parse_args()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(client, path, total, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": total / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "mean": statistics.mean(latencies) * 1000,
+    }
+
+
+async def main():
+    args = parse_args()
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+    import httpx
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select, text
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+    from app.database import SessionLocal, engine, get_db, get_async_db, get_async_engine
+    from app.migrations import upgrade
+    from app.models.BikeModel import Bike
+    import app.models.BookingModel, app.models.OutboxModel  # noqa: F401 (register tables)
+
+    upgrade(engine)
+    with SessionLocal() as db:
+        if not db.query(Bike.id).first():
+            db.add_all([
+                Bike(slug=f"bench-{i}", name=f"Bench {i}", price="40", image="", cc="125",
+                     fuel="10L", topSpeed="100 km/h", description="Benchmark row " * 20)
+                for i in range(args.bikes)
+            ])
+            db.commit()
+
+    use_sleep = args.db_latency_ms > 0 and engine.dialect.name == "postgresql"
+    if args.db_latency_ms > 0 and not use_sleep:
+        print("note: --db-latency-ms is ignored on", engine.dialect.name)
+    sleep_sql = text(f"SELECT pg_sleep({args.db_latency_ms / 1000.0})")
+
+    bench = FastAPI()
+
+    @bench.get("/sync")
+    def sync_route(db: Session = Depends(get_db)):
+        if use_sleep:
+            db.execute(sleep_sql)
+        return [b.slug for b in db.execute(select(Bike)).scalars().all()]
+
+    @bench.get("/async")
+    async def async_route(db: AsyncSession = Depends(get_async_db)):
+        if use_sleep:
+            await db.execute(sleep_sql)
+        return [b.slug for b in (await db.execute(select(Bike))).scalars().all()]
+
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm both pools
+        await run(client, "/sync", 50, 10)
+        await run(client, "/async", 50, 10)
+
+        print(f"{'path':<8}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for level in [int(c) for c in args.concurrency.split(",")]:
+            for path in ("/sync", "/async"):
+                r = await run(client, path, args.requests, level)
+                print(f"{path:<8}{level:>6}{r['rps']:>10.0f}{r['p50']:>10.1f}{r['p95']:>10.1f}{r['p99']:>10.1f}")
+
+    await get_async_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,571 @@
+"""
+Route benchmark: every endpoint in app/routes at fixed concurrency levels,
+compared against a stored baseline.
+
+    cd backend
+    python benchmarks/bench_routes.py --save-baseline         # record benchmarks/baseline_routes.json
+    python benchmarks/bench_routes.py                          # run again, exit 1 on a regression
+    python benchmarks/bench_routes.py --only bike --concurrency 1,10
+    DATABASE_URL=postgresql://... python benchmarks/bench_routes.py
+
+Boots the real app.main.app in-process (lifespan included) over httpx's
+ASGITransport, against a throwaway SQLite file unless DATABASE_URL is set, and
+seeds it with a small fixed catalogue. Nothing leaves the machine:
+  Cloudinary  app.core.uploads.upload_image_to_cloud is replaced by a stub
+              that sleeps --upload-latency-ms and returns a fake URL
+  SMTP        OUTBOX_WORKER_ENABLED=false, so mail is queued but never sent
+
+Per route and concurrency level it records p50/p95/p99 latency, throughput
+and SQL statements per request (X-DB-Queries, see core/query_stats.py). A
+run fails when a route's p95 is more than --tolerance slower than the
+baseline (and by at least --min-delta-ms), when its median statements per
+request exceed the baseline's by more than --query-tolerance, or when any request gets an unexpected status.
+Timings only compare on the same machine: record the baseline where the
+comparison runs. Every route in app/routes must have a scenario below; an
+uncovered route fails the run too.
+Needs httpx (pip install -r requirements-dev.txt).
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+import itertools
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_async_db import percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline_routes.json")
+ADMIN_PASSWORD = "bench-password"
+BRANDS = ["Honda", "Yamaha", "Suzuki", "Kawasaki", "Vespa", "Piaggio", "Lexmoto", "Royal Enfield"]
+TYPES = ["Scooter", "Commuter", "Adventure", "Sport"]
+TIERS = [("1 Day", 45), ("3 Days", 120), ("1 Week", 250), ("2 Weeks", 450), ("1 Month", 800)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route per concurrency level")
+    parser.add_argument("--concurrency", default="1,10,50", help="comma separated levels")
+    parser.add_argument("--only", default=None, help="comma separated substrings of scenario names")
+    parser.add_argument("--bikes", type=int, default=50, help="bikes to seed")
+    parser.add_argument("--upload-latency-ms", type=float, default=20.0, help="stubbed Cloudinary round trip")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore p95 slowdowns smaller than this")
+    parser.add_argument("--query-tolerance", type=int, default=0, help="extra statements per request allowed over the baseline median")
+    parser.add_argument("--output", default=None, help="also write this run's results here")
+    return parser.parse_args()
+
+
+# --- Scenarios: fn(fx, n) -> n request dicts (method/url plus httpx kwargs) ---
+class Scenario:
+    def __init__(self, name, method, route, status, max_requests, build):
+        self.name = name
+        self.method = method
+        self.route = route
+        self.status = status
+        self.max_requests = max_requests
+        self.build = build
+
+SCENARIOS = []
+
+def scenario(method, route, status=200, max_requests=None):
+    """Registers a request builder for `route` (the path template as declared in app/routes)."""
+    def register(build):
+        SCENARIOS.append(Scenario(build.__name__, method, route, status, max_requests, build))
+        return build
+    return register
+
+def same(n, url, **kwargs):
+    return [dict(url=url, **kwargs) for _ in range(n)]
+
+def bike_payload(slug, i=0):
+    return {
+        "name": f"{BRANDS[i % len(BRANDS)]} Bench {i}", "slug": slug, "price": f"£{40 + i % 60}/day",
+        "image": "https://res.cloudinary.com/bench/bike.png", "cc": f"{125 + (i % 8) * 25}cc", "fuel": "10L",
+        "topSpeed": f"{90 + i % 60} km/h", "description": "Benchmark bike. " * 10, "year_mf": str(2015 + i % 10),
+        "fuel_use": "Petrol", "color": "Red", "transmission": "Manual", "type": TYPES[i % len(TYPES)],
+        "rental_charges": [
+            {"duration": d, "charge": f"£{c + i % 20}", "max_km": "-" if d == "1 Month" else str(150 * (k + 1)), "extra_charge": "£0.25"}
+            for k, (d, c) in enumerate(TIERS)
+        ],
+    }
+
+def png(i):
+    # Unique bytes per request so the upload ledger doesn't short-circuit the stub
+    return (f"upload-{i}.png", b"\x89PNG\r\n\x1a\n" + uuid.uuid4().bytes * 64, "image/png")
+
+
+# Reads (run first, against the seeded state)
+@scenario("GET", "/admin/bikes")
+def get_bikes(fx, n):
+    return same(n, "/admin/bikes")
+
+@scenario("GET", "/admin/bikes")
+def get_bikes_page(fx, n):
+    return same(n, "/admin/bikes", params={"limit": 20, "sort": "price", "order": "desc"})
+
+@scenario("GET", "/admin/fleet/search")
+def search_fleet(fx, n):
+    return same(n, "/admin/fleet/search", params={"limit": 20, "sort": "cc", "type": "Scooter"})
+
+@scenario("GET", "/admin/bikes/search")
+def search_bikes_text(fx, n):
+    return [dict(url="/admin/bikes/search", params={"q": BRANDS[i % len(BRANDS)][:3].lower(), "mode": "prefix"}) for i in range(n)]
+
+@scenario("GET", "/admin/bikes/{slug}")
+def get_bike_by_slug(fx, n):
+    return [dict(url=f"/admin/bikes/{fx.bike_slugs[i % len(fx.bike_slugs)]}") for i in range(n)]
+
+@scenario("GET", "/admin/quotes/")
+def get_quotes(fx, n):
+    return same(n, "/admin/quotes/", params={"start_date": "2031-06-01", "end_date": "2031-06-20", "km": 900})
+
+@scenario("GET", "/admin/bookings/availability")
+def get_available_bikes(fx, n):
+    return same(n, "/admin/bookings/availability", params={"start_date": "2027-03-01", "end_date": "2027-03-10"})
+
+@scenario("GET", "/admin/bookings")
+def get_bookings(fx, n):
+    return same(n, "/admin/bookings")
+
+@scenario("GET", "/admin/include/features")
+def get_features(fx, n):
+    return same(n, "/admin/include/features")
+
+@scenario("GET", "/admin/include/policies")
+def get_policies(fx, n):
+    return same(n, "/admin/include/policies")
+
+@scenario("GET", "/admin/meta/{page_key}")
+def get_meta(fx, n):
+    return same(n, "/admin/meta/home")
+
+@scenario("GET", "/admin/gallery/")
+def get_gallery(fx, n):
+    return same(n, "/admin/gallery/")
+
+@scenario("GET", "/admin/contact/info")
+def get_contact_info(fx, n):
+    return same(n, "/admin/contact/info")
+
+@scenario("GET", "/admin/contact/fields")
+def get_fields(fx, n):
+    return same(n, "/admin/contact/fields")
+
+@scenario("GET", "/admin/hero/slides")
+def get_slides(fx, n):
+    return same(n, "/admin/hero/slides")
+
+@scenario("GET", "/admin/about")
+def get_about(fx, n):
+    return same(n, "/admin/about")
+
+@scenario("GET", "/admin/footer")
+def get_footer_settings(fx, n):
+    return same(n, "/admin/footer")
+
+@scenario("GET", "/admin/chatbot/options")
+def get_chat_options(fx, n):
+    return same(n, "/admin/chatbot/options")
+
+@scenario("GET", "/admin/chatbot/answer")
+def answer_question(fx, n):
+    questions = ["how much is a scooter for a week", "do you need a deposit", "honda 125 price", "opening hours"]
+    return [dict(url="/admin/chatbot/answer", params={"q": questions[i % len(questions)]}) for i in range(n)]
+
+@scenario("GET", "/site/snapshot")
+def get_site_snapshot(fx, n):
+    return same(n, "/site/snapshot", params={"page": "home"})
+
+@scenario("GET", "/admin/stats/")
+def get_dashboard_stats(fx, n):
+    return same(n, "/admin/stats/")
+
+@scenario("GET", "/admin/stats/activity")
+def get_activity(fx, n):
+    return same(n, "/admin/stats/activity", params={"bucket": "week", "days": 90})
+
+@scenario("GET", "/admin/stats/cache")
+def get_cache_stats(fx, n):
+    return same(n, "/admin/stats/cache")
+
+@scenario("GET", "/admin/stats/db-pool")
+def get_db_pool_stats(fx, n):
+    return same(n, "/admin/stats/db-pool")
+
+@scenario("GET", "/admin/me")
+def get_admin_me(fx, n):
+    return same(n, "/admin/me")
+
+# Writes
+@scenario("POST", "/admin/login", max_requests=50)   # bcrypt on purpose; keep the sample small
+def login(fx, n):
+    return same(n, "/admin/login", data={"username": "bench", "password": ADMIN_PASSWORD})
+
+@scenario("POST", "/admin/bikes", status=201)
+def add_bike(fx, n):
+    return [dict(url="/admin/bikes", json=bike_payload(f"bench-new-{i}", i)) for i in fx.take(n)]
+
+@scenario("PUT", "/admin/bikes/{slug}")
+def update_bike(fx, n):
+    slugs = fx.bike_slugs
+    return [dict(url=f"/admin/bikes/{slugs[i % len(slugs)]}", json=bike_payload(slugs[i % len(slugs)], i)) for i in range(n)]
+
+@scenario("DELETE", "/admin/bikes/{slug}")
+def delete_bike(fx, n):
+    return [dict(url=f"/admin/bikes/{slug}") for slug in fx.spare_bikes(n)]
+
+@scenario("POST", "/admin/include/features", status=201)
+def add_feature(fx, n):
+    return same(n, "/admin/include/features", json={"icon_name": "FaHelmetSafety", "title": "Helmet", "subtitle": "Included"})
+
+@scenario("PUT", "/admin/include/features/{id}")
+def update_feature(fx, n):
+    return [dict(url=f"/admin/include/features/{fx.feature_ids[i % len(fx.feature_ids)]}",
+                 json={"icon_name": "FaLock", "title": f"Lock {i}", "subtitle": "Chain lock included"}) for i in range(n)]
+
+@scenario("DELETE", "/admin/include/features/{id}")
+def delete_feature(fx, n):
+    return [dict(url=f"/admin/include/features/{i}") for i in fx.spare("Feature", n)]
+
+@scenario("POST", "/admin/include/policies", status=201)
+def add_policy(fx, n):
+    return same(n, "/admin/include/policies", json={"title": "Deposit", "points": "£200, refundable", "color_type": "dark"})
+
+@scenario("PUT", "/admin/include/policies/{id}")
+def update_policy(fx, n):
+    return [dict(url=f"/admin/include/policies/{fx.policy_ids[i % len(fx.policy_ids)]}",
+                 json={"title": f"Policy {i}", "points": "One, Two, Three", "color_type": "orange"}) for i in range(n)]
+
+@scenario("DELETE", "/admin/include/policies/{id}")
+def delete_policy(fx, n):
+    return [dict(url=f"/admin/include/policies/{i}") for i in fx.spare("Policy", n)]
+
+@scenario("PUT", "/admin/meta/{page_key}")
+def update_meta(fx, n):
+    return [dict(url="/admin/meta/home", json={
+        "header_image": "https://res.cloudinary.com/bench/header.png", "header_title": f"Ride {i}",
+        "header_description": "Bikes for every trip", "page_title": "Home", "page_subtitle": "ARP Motors",
+    }) for i in range(n)]
+
+@scenario("POST", "/admin/gallery/upload", status=201)
+def upload_gallery_image(fx, n):
+    return [dict(url="/admin/gallery/upload", files={"file": png(i)}) for i in range(n)]
+
+@scenario("POST", "/admin/gallery/upload/batch")
+def upload_gallery_batch(fx, n):
+    return [dict(url="/admin/gallery/upload/batch", files=[("files", png(i * 4 + k)) for k in range(4)]) for i in range(n)]
+
+@scenario("DELETE", "/admin/gallery/{image_id}")
+def delete_gallery_image(fx, n):
+    return [dict(url=f"/admin/gallery/{i}") for i in fx.spare("Gallery", n)]
+
+@scenario("PUT", "/admin/contact/info")
+def update_contact_info(fx, n):
+    return same(n, "/admin/contact/info", json={
+        "address": "1 Bench Street, London", "phone": "+44 20 0000 0000", "email": "hello@example.com",
+        "latitude": 51.5, "longitude": -0.12,
+    })
+
+@scenario("POST", "/admin/contact/fields", status=201)
+def add_field(fx, n):
+    return same(n, "/admin/contact/fields", json={"label": "Your Name", "field_type": "text", "is_required": True})
+
+@scenario("PUT", "/admin/contact/fields/{field_id}")
+def update_field(fx, n):
+    return [dict(url=f"/admin/contact/fields/{fx.field_ids[i % len(fx.field_ids)]}",
+                 json={"label": f"Field {i}", "field_type": "text", "is_required": False}) for i in range(n)]
+
+@scenario("DELETE", "/admin/contact/fields/{field_id}")
+def delete_field(fx, n):
+    return [dict(url=f"/admin/contact/fields/{i}") for i in fx.spare("ContactField", n)]
+
+@scenario("POST", "/admin/hero/slides", status=201)
+def add_slide(fx, n):
+    return same(n, "/admin/hero/slides", json={"title": "Summer", "subtitle": "Ride more", "image_url": "https://res.cloudinary.com/bench/h.png", "order": 9})
+
+@scenario("PUT", "/admin/hero/slides/{slide_id}")
+def update_slide(fx, n):
+    return [dict(url=f"/admin/hero/slides/{fx.slide_ids[i % len(fx.slide_ids)]}",
+                 json={"title": f"Slide {i}", "image_url": "https://res.cloudinary.com/bench/h.png", "order": i % 5}) for i in range(n)]
+
+@scenario("DELETE", "/admin/hero/slides/{slide_id}")
+def delete_slide(fx, n):
+    return [dict(url=f"/admin/hero/slides/{i}") for i in fx.spare("HeroSlide", n)]
+
+@scenario("PUT", "/admin/about")
+def update_about(fx, n):
+    return same(n, "/admin/about", json={"description": "Family-run rentals since 2010. " * 5, "hero_image": "https://res.cloudinary.com/bench/a.png"})
+
+@scenario("POST", "/admin/about/upload-image")
+def upload_image(fx, n):
+    return [dict(url="/admin/about/upload-image", files={"file": png(i)}) for i in range(n)]
+
+@scenario("PUT", "/admin/footer")
+def update_footer_settings(fx, n):
+    return same(n, "/admin/footer", json={"site_title": "ARP Motors", "slogan": "Ride with us", "instagram": "https://instagram.com/example"})
+
+@scenario("PUT", "/admin/footer/upload-logo")
+def upload_footer_logo(fx, n):
+    return [dict(url="/admin/footer/upload-logo", files={"file": png(i)}) for i in range(n)]
+
+@scenario("PUT", "/admin/chatbot/options/bulk")
+def update_chatbot_options(fx, n):
+    options = [{"label": f"Option {k}", "icon_name": "FaQuestion", "reply_text": f"Answer number {k}"} for k in range(8)]
+    # Alternate two lists so every save has something to update
+    return [dict(url="/admin/chatbot/options/bulk", json=options[i % 2:]) for i in range(n)]
+
+@scenario("POST", "/admin/bookings", status=201)
+def create_booking(fx, n):
+    return [dict(url="/admin/bookings", json={"bike_slug": slug, "customer_name": "Bench", "email": "bench@example.com", **dates})
+            for slug, dates in fx.free_slots(n)]
+
+@scenario("PUT", "/admin/bookings/{booking_id}/status")
+def update_booking_status(fx, n):
+    ids = fx.booking_ids
+    return [dict(url=f"/admin/bookings/{ids[i % len(ids)]}/status", params={"status": ("confirmed", "pending")[i % 2]}) for i in range(n)]
+
+@scenario("POST", "/admin/bookings/send-mail")
+def send_booking_mail(fx, n):
+    return [dict(url="/admin/bookings/send-mail", data={
+        "name": "Bench", "email": "bench@example.com", "phone": "07000000000", "motorcycle": slug,
+        "startDate": dates["start_date"], "endDate": dates["end_date"], "licenseType": "Full", "hasCBT": "Yes",
+    }) for slug, dates in fx.free_slots(n)]
+
+@scenario("POST", "/admin/contact/send-mail")
+def send_contact_mail(fx, n):
+    return same(n, "/admin/contact/send-mail", json={"name": "Bench", "email": "bench@example.com", "message": "Hello " * 40})
+
+
+# --- Fixture: seeded rows and fresh ids for the write scenarios ---
+class Fixture:
+    def __init__(self, session_factory, models):
+        self.session_factory = session_factory
+        self.models = models
+        self._seq = itertools.count()
+
+    def take(self, n):
+        return [next(self._seq) for _ in range(n)]
+
+    def _ids(self, model):
+        with self.session_factory() as db:
+            return [i for (i,) in db.query(model.id).order_by(model.id)]
+
+    def seed(self, bikes: int):
+        m = self.models
+        with self.session_factory() as db:
+            db.add(m.AdminUser(username="bench", email="bench@example.com",
+                               hashed_password=m.hash_password(ADMIN_PASSWORD), is_superuser=True))
+            db.add_all(m.Bike(**bike_payload(f"bench-{i}", i)) for i in range(bikes))
+            db.add_all(m.Gallery(image=f"https://res.cloudinary.com/bench/g{i}.png", description=f"Photo {i}") for i in range(30))
+            db.add_all(m.HeroSlide(title=f"Slide {i}", image_url="https://res.cloudinary.com/bench/h.png", order=i) for i in range(5))
+            db.add_all(m.Feature(icon_name="FaCheck", title=f"Feature {i}", subtitle="Included with every rental") for i in range(6))
+            db.add_all(m.Policy(title=f"Policy {i}", points="Deposit, Licence, Insurance", color_type="dark") for i in range(6))
+            db.add_all(m.ContactField(label=f"Field {i}", field_type="text") for i in range(5))
+            db.commit()
+            bike_ids = [i for (i,) in db.query(m.Bike.id).order_by(m.Bike.id)]
+            first = date(2027, 1, 1)
+            db.add_all(
+                m.Booking(bike_id=bike_ids[i % len(bike_ids)], start_date=first + timedelta(days=4 * (i // len(bike_ids))),
+                          end_date=first + timedelta(days=4 * (i // len(bike_ids)) + 2), customer_name=f"Customer {i}",
+                          email="customer@example.com", status="confirmed")
+                for i in range(200)
+            )
+            db.commit()
+        self.bike_slugs = [f"bench-{i}" for i in range(bikes)]
+        self.feature_ids = self._ids(m.Feature)
+        self.policy_ids = self._ids(m.Policy)
+        self.field_ids = self._ids(m.ContactField)
+        self.slide_ids = self._ids(m.HeroSlide)
+        self.booking_ids = self._ids(m.Booking)
+
+    def spare(self, model_name: str, n: int):
+        """n throwaway rows for a DELETE scenario (through the ORM, so the stat counters stay right)."""
+        model = getattr(self.models, model_name)
+        defaults = {
+            "Feature": {"icon_name": "FaTrash", "title": "Spare", "subtitle": "-"},
+            "Policy": {"title": "Spare", "points": "-", "color_type": "dark"},
+            "Gallery": {"image": "https://res.cloudinary.com/bench/spare.png"},
+            "ContactField": {"label": "Spare", "field_type": "text"},
+            "HeroSlide": {"title": "Spare", "image_url": "https://res.cloudinary.com/bench/spare.png"},
+        }[model_name]
+        with self.session_factory() as db:
+            rows = [model(**defaults) for _ in range(n)]
+            db.add_all(rows)
+            db.commit()
+            return [r.id for r in rows]
+
+    def spare_bikes(self, n: int):
+        with self.session_factory() as db:
+            slugs = [f"bench-spare-{i}" for i in self.take(n)]
+            db.add_all(self.models.Bike(**bike_payload(slug, k)) for k, slug in enumerate(slugs))
+            db.commit()
+        return slugs
+
+    def free_slots(self, n: int):
+        """(bike slug, dates) pairs that overlap nothing: each sequence number gets its own 3-day window."""
+        slots = []
+        for i in self.take(n):
+            start = date(2032, 1, 1) + timedelta(days=3 * (i // len(self.bike_slugs)))
+            dates = {"start_date": start.isoformat(), "end_date": (start + timedelta(days=1)).isoformat()}
+            slots.append((self.bike_slugs[i % len(self.bike_slugs)], dates))
+        return slots
+
+
+# --- Runner ---
+async def run(client, sc: Scenario, specs, concurrency, headers):
+    latencies, queries, failures = [], [], []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(spec):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(sc.method, headers=headers, **spec)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != sc.status:
+                failures.append(f"{response.status_code} {response.text[:200]}")
+            queries.append(int(response.headers.get("x-db-queries", 0)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(spec) for spec in specs))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(specs),
+        "rps": round(len(specs) / elapsed, 1),
+        "p50": round(percentile(latencies, 50) * 1000, 3),
+        "p95": round(percentile(latencies, 95) * 1000, 3),
+        "p99": round(percentile(latencies, 99) * 1000, 3),
+        # Median, not mean: cache misses and lock retries make the average drift between runs
+        "queries": percentile(queries, 50),
+        "queries_max": max(queries),
+    }, failures
+
+
+def uncovered_routes(app):
+    from fastapi.routing import APIRoute
+    declared = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.endpoint.__module__.startswith("app.routes.")
+        for method in route.methods
+    }
+    return sorted(declared - {(sc.method, sc.route) for sc in SCENARIOS})
+
+
+def compare(results, baseline, tolerance, min_delta_ms, query_tolerance):
+    problems = []
+    for key, current in sorted(results.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+        slower = current["p95"] - before["p95"]
+        if current["p95"] > before["p95"] * (1 + tolerance) and slower >= min_delta_ms:
+            problems.append(f"{key}: p95 {before['p95']:.1f} -> {current['p95']:.1f} ms (+{slower / before['p95']:.0%})")
+        if current["queries"] > round(before["queries"]) + query_tolerance:
+            problems.append(f"{key}: {before['queries']:g} -> {current['queries']:g} statements per request (median)")
+    return problems
+
+
+async def main():
+    args = parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_routes.db")
+    os.environ["OUTBOX_WORKER_ENABLED"] = "false"   # SMTP: mail is queued, never sent
+    os.environ["SQL_DEBUG"] = "true"                # X-DB-Queries on every response
+    logging.getLogger("app.sql").setLevel(logging.ERROR)   # SQLite write-lock waits would flood the table; sql/req covers N+1
+
+    import httpx
+    from types import SimpleNamespace
+    from app.main import app
+    from app.database import SessionLocal, get_async_engine
+    from app.core import uploads
+    from app.models.AdminUser import AdminUser
+    from app.models.BikeModel import Bike
+    from app.models.BookingModel import Booking
+    from app.models.ContactModel import ContactField
+    from app.models.GalleryModel import Gallery
+    from app.models.HeroModel import HeroSlide
+    from app.models.IncludeModel import Feature, Policy
+    from app.utils import create_access_token, hash_password
+
+    missing = uncovered_routes(app)
+    if missing:
+        print("FAIL: routes without a benchmark scenario:")
+        for method, path in missing:
+            print(f"  {method} {path}")
+        sys.exit(1)
+
+    def fake_upload(file):
+        # Cloudinary stand-in: called on the upload pool, like the real one
+        time.sleep(args.upload_latency_ms / 1000)
+        return f"https://res.cloudinary.com/bench/image/upload/{uuid.uuid4().hex}.png"
+    uploads.upload_image_to_cloud = fake_upload
+
+    only = [s.strip() for s in args.only.split(",")] if args.only else None
+    scenarios = [sc for sc in SCENARIOS if not only or any(o in sc.name for o in only)]
+    levels = [int(c) for c in args.concurrency.split(",")]
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "bench"})}
+    models = SimpleNamespace(
+        AdminUser=AdminUser, Bike=Bike, Booking=Booking, ContactField=ContactField, Gallery=Gallery,
+        HeroSlide=HeroSlide, Feature=Feature, Policy=Policy, hash_password=hash_password,
+    )
+
+    results, failed = {}, []
+    async with app.router.lifespan_context(app):
+        fx = Fixture(SessionLocal, models)
+        fx.seed(args.bikes)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            print(f"{'scenario':<26}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'sql/req':>9}")
+            for sc in scenarios:
+                n = min(args.requests, sc.max_requests or args.requests)
+                await run(client, sc, sc.build(fx, min(n, 10)), 1, headers)   # warm-up (caches, pools)
+                for level in levels:
+                    r, failures = await run(client, sc, sc.build(fx, n), level, headers)
+                    results[f"{sc.name}@{level}"] = r
+                    print(f"{sc.name:<26}{level:>6}{r['rps']:>10.0f}{r['p50']:>10.1f}{r['p95']:>10.1f}{r['p99']:>10.1f}{r['queries']:>9g}")
+                    if failures:
+                        failed.append(f"{sc.name}@{level}: {len(failures)} unexpected responses, e.g. {failures[0]}")
+    await get_async_engine().dispose()
+
+    report = {
+        "created": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+        "requests": args.requests,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    problems = list(failed)
+    if args.save_baseline:
+        if not failed:
+            with open(args.baseline, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            problems += compare(results, json.load(f)["results"], args.tolerance, args.min_delta_ms, args.query_tolerance)
+    else:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+
+    if problems:
+        print("FAIL:")
+        for p in problems:
+            print(f"  {p}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Cold-start benchmark: how long a fresh worker takes to import the app and
+answer its first request. Each sample runs in a new Python process.
+
+    cd backend
+    python benchmarks/bench_startup.py                        # throwaway SQLite file
+    python benchmarks/bench_startup.py --max-import-ms 1500   # exit 1 if the median regresses past this
+
+Reported per run:
+  import   `import app.main` (should do no database work at all)
+  startup  lifespan (schema upgrade when DB_AUTO_MIGRATE is on, outbox start)
+  first    first GET /admin/bikes after startup (pool connect + query)
+Needs httpx (pip install -r requirements-dev.txt).
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child process
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(app.main.app)
+t2 = time.perf_counter()
+client.__enter__()
+t3 = time.perf_counter()
+client.get("/admin/bikes").raise_for_status()
+t4 = time.perf_counter()
+client.__exit__(None, None, None)
+print(json.dumps({"import": t1 - t0, "startup": t3 - t2, "first": t4 - t3}))
+"""
+
+
+def sample(env):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def report(label, samples):
+    print(label)
+    for key in ("import", "startup", "first"):
+        values = [s[key] * 1000 for s in samples]
+        print(f"  {key:<8} median {statistics.median(values):8.1f} ms   min {min(values):8.1f} ms   max {max(values):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail if median import time exceeds this")
+    args = parser.parse_args()
+
+    env = dict(os.environ, OUTBOX_WORKER_ENABLED="false")
+    env.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/startup.db")
+
+    # First run creates the schema so both modes below see an existing database
+    sample(env)
+
+    with_migrate = [sample(dict(env, DB_AUTO_MIGRATE="true")) for _ in range(args.runs)]
+    without_migrate = [sample(dict(env, DB_AUTO_MIGRATE="false")) for _ in range(args.runs)]
+    report("DB_AUTO_MIGRATE=true", with_migrate)
+    report("DB_AUTO_MIGRATE=false", without_migrate)
+
+    if args.max_import_ms is not None:
+        median_import = statistics.median(s["import"] for s in with_migrate + without_migrate) * 1000
+        if median_import > args.max_import_ms:
+            print(f"FAIL: median import {median_import:.1f} ms > {args.max_import_ms} ms")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
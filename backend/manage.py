@@ -0,0 +1,92 @@
+import sys
+import os
+import argparse
+
+# This ensures the script can find your 'app' folder
+sys.path.append(os.getcwd())
+
+from app.database import engine
+from app.migrations import upgrade
+
+def migrate(args):
+    print("Upgrading database schema...")
+    upgrade(engine)
+    print("Schema is up to date.")
+
+def recount(args):
+    from app.core.activity import recount as rebuild
+    print("Rebuilding dashboard counters and activity rollups...")
+    rebuild(engine)
+    print("Done.")
+
+def generate(args):
+    from app.core.synthetic import generate as fill
+    upgrade(engine)
+    fill(
+        engine, bikes=args.bikes, gallery=args.gallery, hero=args.hero, features=args.features,
+        policies=args.policies, bookings=args.bookings, batch_size=args.batch_size, seed=args.seed,
+        image_base=args.image_base,
+    )
+    print("Done.")
+
+def images(args):
+    from app.core import images as img
+    source_dir = os.path.join("static", img.SOURCE_PREFIX)
+    formats = [None] + img.supported_formats()
+    widths = [int(w) for w in args.widths.split(",")] if args.widths else img.IMAGE_WIDTHS
+    sources = [os.path.join(root, f) for root, _, files in os.walk(source_dir) for f in files]
+    for source in sorted(sources):
+        name = os.path.relpath(source, source_dir)
+        try:
+            for width in widths:
+                for fmt in formats:
+                    img.derivative(source, img.snap_width(width), fmt)
+        except OSError as e:
+            print(f"{name}: skipped ({e})")
+            continue
+        print(f"{name}: done")
+
+def compress_static(args):
+    from app.core.static import precompress, COMPRESSIBLE
+    for root, _, files in os.walk("static"):
+        for name in files:
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE:
+                for written in precompress(os.path.join(root, name)):
+                    print(written)
+
+def main():
+    parser = argparse.ArgumentParser(description="ARP Motors backend tasks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Run this as a release/deploy step, then start the API with DB_AUTO_MIGRATE=false
+    commands.add_parser("migrate", help="create missing tables/columns/indexes and backfill data").set_defaults(func=migrate)
+
+    # Repairs stat_counters/activity_rollup after rows were changed outside the app (e.g. by hand in SQL)
+    commands.add_parser("recount", help="rebuild dashboard counters and activity rollups from the tables").set_defaults(func=recount)
+
+    # Scale testing: bulk-load a synthetic catalogue (appends; point DATABASE_URL at a scratch database)
+    gen = commands.add_parser("generate", help="bulk-insert synthetic bikes, gallery, hero slides, features, policies and bookings")
+    gen.add_argument("--bikes", type=int, default=1000)
+    gen.add_argument("--gallery", type=int, default=200)
+    gen.add_argument("--hero", type=int, default=5)
+    gen.add_argument("--features", type=int, default=8)
+    gen.add_argument("--policies", type=int, default=5)
+    gen.add_argument("--bookings", type=int, default=10000)
+    gen.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT batch/transaction")
+    gen.add_argument("--seed", type=int, default=None, help="random seed, for a repeatable catalogue")
+    gen.add_argument("--image-base", default="http://localhost:8000", help="prefix for the static/uploads image URLs")
+    gen.set_defaults(func=generate)
+
+    # Optional: pre-build responsive variants so the first visitor doesn't pay for the resize
+    warm = commands.add_parser("images", help="generate resized WebP/AVIF variants of static/uploads")
+    warm.add_argument("--widths", help="comma-separated widths (default: IMAGE_WIDTHS)")
+    warm.set_defaults(func=images)
+
+    # .gz/.br siblings that /static sends to clients that accept them
+    commands.add_parser("compress-static", help="write gzip/brotli copies of compressible files under static/").set_defaults(func=compress_static)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+# Must be set before app.database is imported (it builds the engine at import time)
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["OUTBOX_WORKER_ENABLED"] = "false"
+os.environ.setdefault("VERSION_POLL_SECONDS", "3600")   # tests call version_sync.sync() themselves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def admin_headers():
+    from app.utils import create_access_token
+    return {"Authorization": "Bearer " + create_access_token({"sub": "admin"})}
+
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+    with SessionLocal() as session:
+        yield session
@@ -0,0 +1,20 @@
+def _bike(slug, **extra):
+    return {"name": "Honda PCX 125", "price": "£40", "image": "https://cdn.example.com/pcx.jpg", "cc": "125cc",
+            "fuel": "8L", "topSpeed": "105 km/h", "description": "Easy scooter for town.", "slug": slug, **extra}
+
+
+def test_search_slug_is_reserved(client, admin_headers):
+    response = client.post("/admin/bikes", json=_bike("search"), headers=admin_headers)
+    assert response.status_code == 400
+
+    assert client.post("/admin/bikes", json=_bike("pcx-125"), headers=admin_headers).status_code == 201
+    response = client.put("/admin/bikes/pcx-125", json=_bike("search"), headers=admin_headers)
+    assert response.status_code == 400
+    assert client.get("/admin/bikes/pcx-125").status_code == 200
+
+
+def test_text_search_finds_the_bike(client, admin_headers):
+    client.post("/admin/bikes", json=_bike("vespa-gts", name="Vespa GTS 300", description="Classic Italian scooter"),
+                headers=admin_headers)
+    found = client.get("/admin/bikes/search", params={"q": "italian vesp", "mode": "prefix"}).json()
+    assert [item["slug"] for item in found["items"]] == ["vespa-gts"]
@@ -0,0 +1,97 @@
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from app.models.BikeModel import Bike
+from app.models.BookingModel import Booking
+from app.models.OutboxModel import OutboxMessage
+from app.routes.booking import reserve_bike
+
+
+def _add_bike(client, admin_headers, slug, name):
+    bike = {"name": name, "price": "£40", "image": "https://cdn.example.com/b.jpg", "cc": "125cc",
+            "fuel": "8L", "topSpeed": "100 km/h", "description": "Test bike.", "slug": slug}
+    assert client.post("/admin/bikes", json=bike, headers=admin_headers).status_code == 201
+
+
+def _book(client, slug, start, end, name="Sam Smith"):
+    return client.post("/admin/bookings", json={
+        "bike_slug": slug, "start_date": start, "end_date": end, "customer_name": name, "email": "sam@example.com",
+    })
+
+
+def _dates(start, end):
+    return {"start_date": date.fromisoformat(start), "end_date": date.fromisoformat(end),
+            "customer_name": "Ann", "email": "ann@example.com"}
+
+
+def test_reserve_bike_rejects_overlaps(client, admin_headers, db):
+    _add_bike(client, admin_headers, "reserve-1", "Reserve One")
+    bike = db.execute(select(Bike).where(Bike.slug == "reserve-1")).scalar_one()
+
+    booking = reserve_bike(db, bike, _dates("2030-01-10", "2030-01-12"))
+    assert booking.id and booking.status == "pending"
+    with pytest.raises(HTTPException) as clash:
+        reserve_bike(db, bike, _dates("2030-01-12", "2030-01-14"))   # ranges are inclusive
+    assert clash.value.status_code == 409
+    assert reserve_bike(db, bike, _dates("2030-01-13", "2030-01-14")).id
+
+
+def test_booking_route_409_and_reactivation(client, admin_headers):
+    _add_bike(client, admin_headers, "route-1", "Route One")
+    first = _book(client, "route-1", "2030-02-01", "2030-02-05")
+    assert first.status_code == 201
+    assert _book(client, "route-1", "2030-02-03", "2030-02-08").status_code == 409
+    assert _book(client, "route-1", "2030-02-01", "2030-01-30").status_code == 400
+
+    # Cancelling frees the dates...
+    first_id = first.json()["id"]
+    client.put(f"/admin/bookings/{first_id}/status", params={"status": "cancelled"}, headers=admin_headers)
+    second = _book(client, "route-1", "2030-02-03", "2030-02-08")
+    assert second.status_code == 201
+    # ...and re-activating the cancelled one now clashes
+    response = client.put(f"/admin/bookings/{first_id}/status", params={"status": "confirmed"}, headers=admin_headers)
+    assert response.status_code == 409
+    client.put(f"/admin/bookings/{second.json()['id']}/status", params={"status": "cancelled"}, headers=admin_headers)
+    response = client.put(f"/admin/bookings/{first_id}/status", params={"status": "confirmed"}, headers=admin_headers)
+    assert response.status_code == 200 and response.json()["status"] == "confirmed"
+
+
+def test_availability(client, admin_headers):
+    _add_bike(client, admin_headers, "avail-1", "Avail One")
+    _add_bike(client, admin_headers, "avail-2", "Avail Two")
+    _book(client, "avail-1", "2030-03-10", "2030-03-12")
+
+    def available(start, end):
+        response = client.get("/admin/bookings/availability", params={"start_date": start, "end_date": end})
+        return {b["slug"] for b in response.json()} & {"avail-1", "avail-2"}
+
+    assert available("2030-03-11", "2030-03-11") == {"avail-2"}
+    assert available("2030-03-13", "2030-03-20") == {"avail-1", "avail-2"}
+    assert client.get("/admin/bookings/availability", params={"start_date": "2030-03-13", "end_date": "2030-03-01"}).status_code == 400
+
+
+def _send_mail(client, motorcycle, start, end, name):
+    return client.post("/admin/bookings/send-mail", data={
+        "name": name, "email": "lead@example.com", "phone": "0700", "motorcycle": motorcycle,
+        "startDate": start, "endDate": end, "licenseType": "Full", "hasCBT": "Yes",
+    })
+
+
+def test_send_mail_books_any_free_bike_with_that_name(client, admin_headers, db):
+    _add_bike(client, admin_headers, "twin-1", "Twin Scooter")
+    _add_bike(client, admin_headers, "twin-2", "Twin Scooter")
+
+    first = _send_mail(client, "Twin Scooter", "2030-04-01", "2030-04-03", "Lead One").json()
+    second = _send_mail(client, "Twin Scooter", "2030-04-02", "2030-04-04", "Lead Two").json()
+    assert not first["clash"] and not second["clash"]
+    bikes = {db.get(Booking, r["booking_id"]).bike_id for r in (first, second)}
+    assert len(bikes) == 2
+
+    # Both taken: no booking, but the lead is still queued, flagged
+    third = _send_mail(client, "Twin Scooter", "2030-04-03", "2030-04-03", "Lead Three")
+    assert third.status_code == 200
+    assert third.json() == {"status": "Email Queued", "booking_id": None, "clash": True}
+    queued = db.execute(select(OutboxMessage).where(OutboxMessage.subject.like("%Lead Three"))).scalar_one()
+    assert queued.subject.startswith("CLASH - ")
+    assert "Already booked" in queued.html
@@ -0,0 +1,35 @@
+import asyncio
+from app.core.compression import CompressionMiddleware
+
+
+def _run(app, headers=()):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": list(headers)}
+    asyncio.run(CompressionMiddleware(app, minimum_size=10)(scope, receive, send))
+    return sent
+
+
+def test_pathsend_gets_its_start_first():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"image/png")]})
+        await send({"type": "http.response.pathsend", "path": "/tmp/x.png"})
+
+    sent = _run(app, [(b"accept-encoding", b"gzip")])
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.pathsend"]
+
+
+def test_json_body_is_compressed():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"a": "' + b"x" * 100 + b'"}'})
+
+    start, body = _run(app, [(b"accept-encoding", b"gzip")])
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert body["body"].startswith(b"\x1f\x8b")
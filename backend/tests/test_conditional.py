@@ -0,0 +1,32 @@
+from sqlalchemy import text
+from app.core.versions import VersionSync, version_sync
+from app.database import engine
+
+
+def test_etag_changes_after_write(client, admin_headers):
+    first = client.get("/admin/include/features")
+    etag = first.headers["etag"]
+    assert client.get("/admin/include/features", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/admin/include/features", json={"icon_name": "FaA", "title": "A", "subtitle": "a"}, headers=admin_headers)
+    again = client.get("/admin/include/features", headers={"If-None-Match": etag})
+    assert again.status_code == 200
+    assert again.headers["etag"] != etag
+
+
+def test_write_from_another_process_invalidates_etag_and_cache(client):
+    before = client.get("/admin/include/policies")
+    etag = before.headers["etag"]
+
+    # Another worker/script: commits straight to the DB and bumps the shared version with its own VersionSync
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO policies (title, points, color_type) VALUES ('Remote', 'x', 'dark')"))
+    VersionSync().record_write("policies")
+
+    # Until this process polls, its cache (and ETag) are still the old ones...
+    assert client.get("/admin/include/policies", headers={"If-None-Match": etag}).status_code == 304
+    # ...and after one poll both follow the write
+    assert version_sync.sync() == ["policies"]
+    after = client.get("/admin/include/policies", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert "Remote" in [p["title"] for p in after.json()]
@@ -0,0 +1,90 @@
+from app.core import uploads
+from app.routes import gallery
+
+
+def _fake_upload(monkeypatch, fail_on=()):
+    calls = []
+
+    def upload(file):
+        data = file.read()
+        calls.append(data)
+        return None if data in fail_on else f"https://cdn.example.com/{len(calls)}.jpg"
+
+    monkeypatch.setattr(uploads, "upload_image_to_cloud", upload)
+    return calls
+
+
+def _files(*contents):
+    return [("files", (f"photo{i}.jpg", data, "image/jpeg")) for i, data in enumerate(contents)]
+
+
+def test_batch_upload_reports_each_file(client, admin_headers, monkeypatch):
+    calls = _fake_upload(monkeypatch, fail_on=(b"broken",))
+
+    response = client.post("/admin/gallery/upload/batch", files=_files(b"one", b"broken", b"two"), headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["uploaded"], body["failed"]) == (2, 1)
+    assert [r["ok"] for r in body["results"]] == [True, False, True]
+    assert body["results"][1]["error"] == "Cloudinary upload failed"
+    assert len(calls) == 3
+
+    listed = {g["image"] for g in client.get("/admin/gallery/").json()}
+    assert {r["item"]["image"] for r in body["results"] if r["ok"]} <= listed
+
+
+def test_batch_save_failure_reports_uploaded_urls(client, admin_headers, monkeypatch):
+    _fake_upload(monkeypatch)
+
+    def broken_save(db, urls, description=None):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(gallery, "_save_items", broken_save)
+    response = client.post("/admin/gallery/upload/batch", files=_files(b"three", b"four"), headers=admin_headers)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["ok"] for r in results] == [False, False]
+    assert all(r["url"].startswith("https://cdn.example.com/") for r in results)
+    assert "database is down" in results[0]["error"]
+
+
+def test_reupload_is_not_counted_twice(client, admin_headers, db, monkeypatch):
+    from datetime import datetime
+    from sqlalchemy import select
+    from app.core.activity import recount
+    from app.database import engine
+    from app.models.StatsModel import ActivityRollup
+
+    calls = _fake_upload(monkeypatch)
+
+    def uploads_today():
+        db.expire_all()
+        return db.execute(select(ActivityRollup.count).where(
+            ActivityRollup.metric == "uploads", ActivityRollup.day == datetime.utcnow().date()
+        )).scalar() or 0
+
+    before = uploads_today()
+    for _ in range(2):
+        client.post("/admin/gallery/upload", files={"file": ("same.jpg", b"same bytes", "image/jpeg")}, headers=admin_headers)
+    assert len(calls) == 1                 # second one answered from the ledger
+    assert uploads_today() == before + 1
+
+    recount(engine)
+    assert uploads_today() == before + 1   # rebuilding agrees with what was counted live
+
+
+def test_upload_ledger_queries_are_counted_for_the_request(client, admin_headers, monkeypatch):
+    from app.core import query_stats
+    _fake_upload(monkeypatch)
+    seen = []
+    real_record = query_stats.RequestQueries.record
+
+    def record(self, statement, seconds):
+        if "upload_ledger" in statement:
+            seen.append(statement)
+        real_record(self, statement, seconds)
+
+    monkeypatch.setattr(query_stats.RequestQueries, "record", record)
+    client.post("/admin/gallery/upload", files={"file": ("counted.jpg", b"counted bytes", "image/jpeg")}, headers=admin_headers)
+    assert any(s.lstrip().upper().startswith("SELECT") for s in seen)
+    assert any(s.lstrip().upper().startswith("INSERT") for s in seen)
@@ -0,0 +1,34 @@
+import asyncio
+from app.core.http_metrics import HttpMetrics, MetricsMiddleware
+
+
+def _run(app):
+    metrics = HttpMetrics()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/static/x.png", "headers": []}
+    asyncio.run(MetricsMiddleware(app, metrics)(scope, receive, send))
+    (histogram,) = metrics.size.values()
+    return histogram
+
+
+def test_pathsend_size_comes_from_content_length():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"1234")]})
+        await send({"type": "http.response.pathsend", "path": "/tmp/x.png"})
+
+    assert _run(app).sum == 1234
+
+
+def test_body_size_is_what_was_sent():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"10")]})
+        await send({"type": "http.response.body", "body": b"12345", "more_body": True})
+        await send({"type": "http.response.body", "body": b"67890"})
+
+    assert _run(app).sum == 10
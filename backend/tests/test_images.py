@@ -0,0 +1,18 @@
+import argparse
+import os
+from PIL import Image
+import manage
+
+
+def test_manage_images_walks_subfolders(tmp_path, monkeypatch):
+    gallery = tmp_path / "static" / "uploads" / "gallery"
+    gallery.mkdir(parents=True)
+    Image.new("RGB", (400, 200), "red").save(tmp_path / "static" / "uploads" / "top.png")
+    Image.new("RGB", (400, 200), "blue").save(gallery / "nested.png")
+    monkeypatch.chdir(tmp_path)
+
+    manage.images(argparse.Namespace(widths="160"))
+
+    derived = os.listdir(tmp_path / "static" / "derived")
+    assert any(name.startswith("top-") for name in derived)
+    assert any(name.startswith("nested-") for name in derived)
@@ -0,0 +1,86 @@
+import asyncio
+import socket
+import pytest
+from aiosmtpd.controller import Controller
+from app.core import mailer
+from app.models.OutboxModel import OutboxMessage
+
+
+class _Inbox:
+    def __init__(self):
+        self.envelopes = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    inbox = _Inbox()
+    controller = Controller(inbox, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    for name, value in {
+        "MAIL_SERVER": "127.0.0.1", "MAIL_PORT": controller.port, "MAIL_STARTTLS": False,
+        "MAIL_USE_CREDENTIALS": False, "MAIL_FROM": "shop@example.com", "MAIL_TO": ["owner@example.com"],
+    }.items():
+        monkeypatch.setattr(mailer, name, value)
+    yield inbox
+    controller.stop()
+
+
+def test_outbox_delivers_through_smtp(smtp, db):
+    message_id = mailer.enqueue_email(
+        db, "contact", "Hello", "<p>Hi</p>", attachments=[("licence.txt", "text/plain", b"A2")]
+    )
+    worker = mailer.OutboxWorker()
+
+    async def drain():
+        try:
+            return await worker.drain_once()
+        finally:
+            await worker.sender.close()
+
+    assert asyncio.run(drain()) >= 1
+    [envelope] = [e for e in smtp.envelopes if b"Subject: Hello" in e.content]
+    assert envelope.mail_from == "shop@example.com"
+    assert envelope.rcpt_tos == ["owner@example.com"]
+    assert b"licence.txt" in envelope.content
+
+    db.expire_all()
+    assert db.get(OutboxMessage, message_id).status == "sent"
+
+
+def test_worker_stays_off_without_settings(monkeypatch):
+    monkeypatch.setattr(mailer, "MAIL_USE_CREDENTIALS", True)
+    monkeypatch.setattr(mailer, "MAIL_PASSWORD", "")
+    assert "MAIL_PASSWORD" in mailer.missing_settings()
+    assert mailer.OutboxWorker().start() is False
+
+
+def test_mail_queued_before_mail_to_is_set_goes_to_it_later(smtp, client, db, monkeypatch):
+    monkeypatch.setattr(mailer, "MAIL_TO", [])
+    response = client.post("/admin/contact/send-mail", json={"Name": "Early", "Msg": "queued while unconfigured"})
+    assert response.status_code == 200
+    queued = db.query(OutboxMessage).order_by(OutboxMessage.id.desc()).first()
+    assert queued.recipients is None
+
+    monkeypatch.setattr(mailer, "MAIL_TO", ["owner@example.com"])
+    worker = mailer.OutboxWorker()
+
+    async def drain():
+        try:
+            return await worker.drain_once()
+        finally:
+            await worker.sender.close()
+
+    asyncio.run(drain())
+    assert any(e.rcpt_tos == ["owner@example.com"] and b"queued while unconfigured" in e.content for e in smtp.envelopes)
+    db.expire_all()
+    assert db.get(OutboxMessage, queued.id).status == "sent"
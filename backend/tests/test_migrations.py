@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+from app.migrations import upgrade
+
+# bikes / chat_options as they were before the numeric columns and `position`
+OLD_SCHEMA = [
+    """CREATE TABLE bikes (id INTEGER PRIMARY KEY, slug VARCHAR UNIQUE, name VARCHAR, price VARCHAR, image VARCHAR,
+       cc VARCHAR, fuel VARCHAR, "topSpeed" VARCHAR, description TEXT, year_mf VARCHAR, fuel_use VARCHAR,
+       color VARCHAR, max_passengers INTEGER, transmission VARCHAR, type VARCHAR, rental_charges JSON)""",
+    "CREATE TABLE chat_options (id INTEGER PRIMARY KEY, label VARCHAR, icon_name VARCHAR, reply_text VARCHAR)",
+    """INSERT INTO bikes (id, slug, name, price, cc, "topSpeed", year_mf) VALUES
+       (1, 'pcx', 'PCX', '£40', '125cc', '105 km/h', '2021'), (2, 'odd', 'Odd', 'call us', 'n/a', '', '')""",
+    "INSERT INTO chat_options (id, label) VALUES (3, 'Hours'), (5, 'Pricing')",
+]
+
+
+def _old_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/old.db")
+    with engine.begin() as conn:
+        for statement in OLD_SCHEMA:
+            conn.execute(text(statement))
+    return engine
+
+
+def test_upgrade_adds_columns_and_backfills_once(tmp_path):
+    engine = _old_database(tmp_path)
+    upgrade(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, price_value, cc_value, year_value FROM bikes ORDER BY id")).all()
+        positions = conn.execute(text("SELECT id, position FROM chat_options ORDER BY id")).all()
+    assert rows == [(1, 40.0, 125, 2021), (2, None, None, None)]
+    assert positions == [(3, 3), (5, 5)]   # old id order kept
+    # Starter option is only added to a brand-new chat_options table
+    assert len(positions) == 2
+
+    updates = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *a: updates.append(statement)
+                 if statement.startswith("UPDATE bikes") else None)
+    upgrade(engine)
+    assert updates == []   # the unparseable row isn't re-scanned on the next boot
+
+
+def test_added_column_keeps_not_null_default(tmp_path):
+    engine = _old_database(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE resource_versions (resource VARCHAR PRIMARY KEY, updated_at DATETIME NOT NULL)"))
+    upgrade(engine)
+
+    version = next(c for c in inspect(engine).get_columns("resource_versions") if c["name"] == "version")
+    assert version["nullable"] is False
+    assert version["default"] == "'0'"
+
+
+def test_chat_position_matches_a_new_schema(tmp_path):
+    engine = _old_database(tmp_path)
+    upgrade(engine)
+    fresh = create_engine(f"sqlite:///{tmp_path}/new.db")
+    upgrade(fresh)
+
+    def position(bind):
+        column = next(c for c in inspect(bind).get_columns("chat_options") if c["name"] == "position")
+        return column["nullable"], column["default"]
+
+    assert position(engine) == position(fresh) == (False, "'0'")
+
+
+def test_unsupported_database_is_refused():
+    with pytest.raises(RuntimeError, match="mysql"):
+        upgrade(SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
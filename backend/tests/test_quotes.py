@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+from app.core.quotes import FleetTiers, quote_fleet
+from app.models.BikeModel import parse_rental_tiers
+
+
+def _fleet(*charges):
+    rows = [
+        SimpleNamespace(id=i, slug=f"bike-{i}", name=f"Bike {i}", rental_tiers=parse_rental_tiers(c))
+        for i, c in enumerate(charges, 1)
+    ]
+    return FleetTiers(rows)
+
+
+def _tier(duration, charge, max_km, extra):
+    return {"duration": duration, "charge": charge, "max_km": max_km, "extra_charge": extra}
+
+
+def test_cheapest_tier_combination():
+    fleet = _fleet([_tier("1 Day", "£40", "150", "£0.20"), _tier("1 Week", "£200", "1000", "£0.20")])
+    [quote] = quote_fleet(fleet, 8, None, None)
+    assert quote["total"] == 240
+    assert [(b["tier"], b["count"]) for b in quote["breakdown"]] == [("1 Week", 1), ("1 Day", 1)]
+
+
+def test_overage_can_make_a_dearer_tier_cheaper():
+    # Two 1-day tiers: cheap with 100 km, or unlimited. For 500 km the cheap
+    # tier costs 10 + 400 * £1 = £410, the unlimited one £30
+    fleet = _fleet([_tier("1 Day", "£10", "100", "£1"), _tier("1 Day", "£30", "-", "£0")])
+    [quote] = quote_fleet(fleet, 1, 500, None)
+    assert quote["total"] == 30
+    assert quote["extra_km"] == 0
+    assert quote["included_km"] is None
+
+    [quote] = quote_fleet(fleet, 1, 50, None)
+    assert quote["total"] == 10
+
+
+def test_overage_favours_more_allowance_over_several_days():
+    # 3 days, 900 km: one 3-day block (300 km) = 60 + 600 * 0.5 = 360,
+    # three 1-day blocks (3 x 300 km) = 90 with no overage
+    fleet = _fleet([_tier("1 Day", "£30", "300", "£0.50"), _tier("3 Days", "£60", "300", "£0.50")])
+    [quote] = quote_fleet(fleet, 3, 900, None)
+    assert quote["total"] == 90
+    assert quote["rental_total"] == 90
@@ -0,0 +1,28 @@
+from sqlalchemy import func, select, update
+from app.core.settings_store import settings_store
+from app.core.versions import version_sync
+from app.models.AboutModel import About
+
+
+def test_ttl_reload_picks_up_unannounced_edit_and_bumps_version(client, db, monkeypatch):
+    etag = client.get("/admin/about").headers["etag"]
+    before = version_sync.version("about")
+
+    # Edited straight in the DB: no notify_write, so only the TTL reload can notice
+    db.execute(update(About).values(description="Edited by hand"))
+    db.commit()
+    monkeypatch.setattr(settings_store, "ttl", 0)
+
+    response = client.get("/admin/about", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["description"] == "Edited by hand"
+    assert version_sync.version("about") > before
+
+
+def test_reload_does_not_write(client, db, monkeypatch):
+    monkeypatch.setattr(settings_store, "ttl", 0)
+    db.execute(About.__table__.delete())
+    db.commit()
+
+    assert client.get("/admin/about").json()["id"] == 1   # defaults, served from memory
+    assert db.execute(select(func.count()).select_from(About)).scalar_one() == 0
@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_admin_created_by_script_is_counted(client):
+    before = client.get("/admin/stats/").json()["total_admins"]
+    env = {**os.environ, "ADMIN_PASSWORD": "s3cret-pass", "ADMIN_EMAIL": "script-admin@example.com",
+           "ADMIN_USERNAME": "script-admin"}
+    # A separate process that never imports app.core.activity, like a real deploy step
+    subprocess.run([sys.executable, "create_superuser.py"], cwd=BACKEND, env=env, check=True, capture_output=True)
+    assert client.get("/admin/stats/").json()["total_admins"] == before + 1
+
+
+def test_counters_follow_writes(client, admin_headers):
+    before = client.get("/admin/stats/").json()
+    slide = {"image_url": "https://cdn.example.com/s.jpg", "title": "Stats slide", "subtitle": "", "order": 0}
+    client.post("/admin/hero/slides", json=slide, headers=admin_headers)
+    after = client.get("/admin/stats/").json()
+    assert after["hero_slides"] == before["hero_slides"] + 1
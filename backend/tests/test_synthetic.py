@@ -0,0 +1,21 @@
+from collections import defaultdict
+from sqlalchemy import create_engine, select
+from app.core.synthetic import generate
+from app.migrations import upgrade
+from app.models.BookingModel import Booking
+
+
+def test_second_run_appends_bookings_without_overlap(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/synthetic.db")
+    upgrade(engine)
+    generate(engine, bikes=3, bookings=30, seed=1)
+    generate(engine, bookings=30, seed=1)   # into the existing bikes
+
+    windows = defaultdict(list)
+    with engine.connect() as conn:
+        for bike_id, start, end in conn.execute(select(Booking.bike_id, Booking.start_date, Booking.end_date)):
+            windows[bike_id].append((start, end))
+    assert sum(len(w) for w in windows.values()) == 60
+    for bookings in windows.values():
+        bookings.sort()
+        assert all(prev_end < start for (_, prev_end), (start, _) in zip(bookings, bookings[1:]))